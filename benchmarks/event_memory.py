@@ -0,0 +1,76 @@
+"""
+Per-event memory footprint: the original dict-backed Event vs the slotted,
+interned models.Event created inside one event_batch().
+
+Usage: python benchmarks/event_memory.py [N]
+"""
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models import Event, Source, event_batch  # noqa: E402
+
+VENUES = ["Paradiso", "Melkweg", "AFAS Live", "Ziggo Dome", "Ticketmaster NL", "Bitterzoet"]
+SOURCES = list(Source)
+
+
+@dataclass
+class LegacyEvent:
+    """models.Event as it was before slots/freezing/interning."""
+    source: Source
+    title: str
+    venue: str
+    date_raw: str
+    date_normalized: str
+    url: str
+    status: Optional[str] = None
+    fetched_at: Optional[datetime] = None
+
+    def __post_init__(self) -> None:
+        if self.fetched_at is None:
+            self.fetched_at = datetime.utcnow()
+
+
+def _fields(i: int) -> dict:
+    # Build strings at runtime, as parsing does, so nothing is shared by accident
+    venue = "".join(list(VENUES[i % len(VENUES)]))
+    day = 1 + i % 28
+    return {
+        "source": SOURCES[i % len(SOURCES)],
+        "title": f"Artist number {i} live",
+        "venue": venue,
+        "date_raw": f"Fr {day} Mar",
+        "date_normalized": f"2026-03-{day:02d}",
+        "url": f"https://example.nl/en/program/event-{i}",
+    }
+
+
+def measure(factory, n: int) -> float:
+    """Bytes retained per event once the parse-time field values are released."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    events = [factory(**_fields(i)) for i in range(n)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del events
+    return (after - before) / n
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    legacy = measure(LegacyEvent, n)
+    with event_batch():
+        compact = measure(Event, n)
+    print(f"events: {n}")
+    print(f"legacy Event : {legacy:7.1f} bytes/event")
+    print(f"compact Event: {compact:7.1f} bytes/event")
+    print(f"saved        : {legacy - compact:7.1f} bytes/event ({(1 - compact / legacy) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
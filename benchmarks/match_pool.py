@@ -0,0 +1,85 @@
+"""
+Matching a large artists list: in-process vs the sharded process pool
+(matcher/pool.py) at 1, 2, 4, ... processes up to the CPU count.
+
+"cold" includes compiling the list (and, for the pool, shipping the shards to
+fresh processes); "warm" is a later run with the same list, which reuses the
+compiled automaton and only sends event titles. Every pool result is checked
+against the in-process result, order included.
+
+Usage: python benchmarks/match_pool.py [ARTISTS] [EVENTS] [MAX_PROCESSES]
+"""
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from matcher import pool  # noqa: E402
+from matcher.match import match_events_to_artists  # noqa: E402
+from models import Event, Source  # noqa: E402
+
+
+def _artists(n: int) -> list:
+    return [f"Artist {i:05d} Band" for i in range(n)]
+
+
+def _events(n: int, artists_count: int) -> list:
+    # About one in ten titles names a listed artist
+    return [
+        Event(
+            Source.PARADISO,
+            f"Artist {i * 7 % artists_count:05d} Band live" if i % 10 == 0 else f"Club night {i}",
+            "Paradiso",
+            "",
+            "2026-03-01",
+            f"https://example.nl/event-{i}",
+        )
+        for i in range(n)
+    ]
+
+
+async def _pool_run(events: list, artists: list) -> tuple:
+    titles = [e.title_normalized for e in events]
+    t0 = time.perf_counter()
+    pairs = await pool.match_pairs(titles, artists)
+    cold = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    pairs = await pool.match_pairs(titles, artists)
+    warm = time.perf_counter() - t0
+    return [(artists[ai], events[ei]) for ei, ai in pairs], cold, warm
+
+
+def main() -> None:
+    artists_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    events_count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    logging.disable(logging.INFO)  # per-artist logging would dominate the timings
+    artists, events = _artists(artists_count), _events(events_count, artists_count)
+
+    t0 = time.perf_counter()
+    expected = match_events_to_artists(events, artists)
+    inline_cold = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    match_events_to_artists(events, artists)
+    inline = time.perf_counter() - t0
+    print(f"artists: {artists_count}, events: {events_count}, matches: {len(expected)}")
+    print(f"in-process cold/warm: {inline_cold * 1000:6.0f} / {inline * 1000:6.0f} ms")
+
+    cpus = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count() or 1
+    counts = sorted({1, *(2 ** k for k in range(1, cpus.bit_length()) if 2 ** k <= cpus), cpus})
+    for n in counts:
+        os.environ["MATCH_PROCESSES"] = str(n)
+        got, cold, warm = asyncio.run(_pool_run(events, artists))
+        pool.shutdown()
+        same = "ok" if got == expected else "MISMATCH"
+        print(
+            f"pool x{n:<2}     cold/warm: {cold * 1000:6.0f} / {warm * 1000:6.0f} ms"
+            f"  speedup {inline / warm:4.1f}x  {same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
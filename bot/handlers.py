@@ -1,10 +1,13 @@
 """
 Telegram command handlers: /start, /help, /settings, /set_*, etc.
 """
+import asyncio
 import json
 import re
 import os
 import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
 
 from telegram import Update
 from telegram.ext import ContextTypes, CommandHandler, MessageHandler, filters
@@ -12,7 +15,15 @@ import httpx
 
 from storage import settings
 from storage import notification_history as notif_hist
-from bot.middleware import is_authorized, get_authorized_user_id, REJECT_MESSAGE
+from storage import runs as run_history
+from storage import outbox
+from storage import events as event_store
+from storage import maintenance
+from storage import users
+from models import Source
+from bot.progress import ProgressMessage
+from bot.sender import get_sender
+from bot.middleware import get_authorized_user_id, set_authorized_user_id, register_auth_guard, user_scope
 from bot.onboarding import needs_onboarding, start_onboarding, handle_onboarding_message, get_step
 
 logger = logging.getLogger(__name__)
@@ -22,27 +33,61 @@ RESET_CONFIRM_CMD = "reset_history_confirm"
 
 TIME_REGEX = re.compile(r"^([0-1]?[0-9]|2[0-3]):([0-5][0-9])$")
 
+# /run_now fresh, /dry_run fresh: bypass the event cache and scrape every source
+FRESH_ARG = "fresh"
 
-async def _require_auth(update: Update) -> bool:
-    if not await is_authorized(update):
-        if update.message:
-            await update.message.reply_text(REJECT_MESSAGE)
-        return False
-    return True
+STATS_DEFAULT_RUNS = 20
+STATS_MAX_RUNS = 500
+
+SEARCH_PAGE_SIZE = 10
+HISTORY_PAGE_SIZE = 10
+HISTORY_USAGE = (
+    "Usage: /history [artist words] [venue:<text>] [from:YYYY-MM-DD] [to:YYYY-MM-DD]\n"
+    "Example: /history arctic venue:ziggo from:2026-01-01"
+)
+SEARCH_USAGE = (
+    "Usage: /search <words> [from:YYYY-MM-DD] [to:YYYY-MM-DD] [source:<id>] [page:N]\n"
+    "Example: /search radiohead from:2026-06-01 source:ziggodome"
+)
+
+
+OWNER_ONLY_MESSAGE = "Only the bot owner can change the shared schedule."
+OWNER_ONLY_CANCEL_MESSAGE = "Runs are shared by all users; only the bot owner can cancel them."
+
+
+def _cancel_hint(user_id: int) -> str:
+    return " (/cancel to stop)" if user_id == users.OWNER else ""
+
+
+async def _start_member(update: Update, user_id: int) -> None:
+    """/start for a member: remember their chat; setup is just their artists list."""
+    if update.effective_chat:
+        await users.set_user_setting(user_id, users.CHAT_ID_KEY, str(update.effective_chat.id))
+    url = await users.get_user_setting(user_id, users.ARTISTS_URL_KEY)
+    if not url:
+        await update.message.reply_text(
+            "Welcome! Send /set_artists_url <url> with your GitHub-hosted .txt list (one artist per line). "
+            "Checks run on the shared schedule; see /settings."
+        )
+        return
+    await update.message.reply_text(f"Your artists list: {url}\n\nUse /settings, /history, or /help.")
 
 
 async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await is_authorized(update):
-        if update.message:
-            await update.message.reply_text(REJECT_MESSAGE)
+    user_id = await user_scope(update)
+    if user_id != users.OWNER:
+        await _start_member(update, user_id)
         return
     # Set authorized user on first /start if not set
-    auth_id = await get_authorized_user_id()
-    if auth_id is None and update.effective_user:
-        await settings.set_setting("authorized_user_id", str(update.effective_user.id))
-    # Remember chat for notifications
+    if await get_authorized_user_id() is None and update.effective_user:
+        await set_authorized_user_id(update.effective_user.id)
+    # Remember chat for notifications (and schedule runs for it if this is a new chat)
     if update.effective_chat:
-        await settings.set_setting("notification_chat_id", str(update.effective_chat.id))
+        chat_id = str(update.effective_chat.id)
+        if await settings.get_setting("notification_chat_id") != chat_id:
+            await settings.set_setting("notification_chat_id", chat_id)
+            from scheduler.jobs import reschedule
+            await reschedule()
 
     if await needs_onboarding():
         await start_onboarding(update)
@@ -63,29 +108,30 @@ async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
 
 
 async def cmd_help(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _require_auth(update):
-        return
     await update.message.reply_text(
         "Commands:\n"
         "/start — Show settings or start setup\n"
         "/help — This message\n"
         "/settings — Show current settings\n"
         "/set_artists_url <url> — Set your artists list URL (GitHub raw .txt)\n"
-        "/set_time <HH:MM> — Daily check time (Europe/Amsterdam)\n"
-        "/set_location NL — Location (MVP: NL only)\n"
-        "/run_now — Run a full check now\n"
+        "/set_time <HH:MM> — Daily check time (Europe/Amsterdam; owner only)\n"
+        "/set_location NL — Location (MVP: NL only; owner only)\n"
+        "/run_now [fresh] — Run a full check now (fresh: ignore cached source results)\n"
+        "/cancel — Stop the run in progress (owner only)\n"
         "/status — Last run time and counts\n"
+        "/stats [N] — p50/p95 latency per stage and source over the last N runs\n"
+        "/history [artist] [venue:<text>] [from:YYYY-MM-DD] [to:YYYY-MM-DD] — Past notifications, newest first\n"
         "/reset_history — Clear notification history (you'll get confirmations again)\n"
+        "/search <words> [from:YYYY-MM-DD] [to:YYYY-MM-DD] [source:<id>] [page:N] — Search all events seen so far (no scraping)\n"
         "/sources — List monitored sources\n"
-        "/dry_run — Run check and report matches without sending notifications\n\n"
-        "Matching: case-insensitive substring. If an artist name appears in the event title, you get notified once per (artist, venue, date)."
+        "/dry_run [fresh] — Run check and report matches without sending notifications\n\n"
+        "Matching: case- and accent-insensitive whole words (\"&\" = \"and\", punctuation ignored). If an artist name appears in the event title, you get notified once per (artist, venue, date).\n"
+        "Aliases: put alternate names on the artist's line, e.g. \"Kanye West | Ye\"; matches are reported under the first name."
     )
 
 
 async def cmd_settings(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _require_auth(update):
-        return
-    url = await settings.get_setting_or_default("artists_list_url")
+    url = await users.get_user_setting(await user_scope(update), users.ARTISTS_URL_KEY)
     loc = await settings.get_setting_or_default("location")
     t = await settings.get_setting_or_default("check_time_local") or "09:00"
     tz = await settings.get_setting_or_default("timezone") or "Europe/Amsterdam"
@@ -97,8 +143,6 @@ async def cmd_settings(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 
 
 async def cmd_set_artists_url(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _require_auth(update):
-        return
     if not context.args or len(context.args) < 1:
         await update.message.reply_text("Usage: /set_artists_url <url>")
         return
@@ -118,14 +162,16 @@ async def cmd_set_artists_url(update: Update, context: ContextTypes.DEFAULT_TYPE
     if not lines:
         await update.message.reply_text("URL returned no lines. Use a .txt with one artist per line.")
         return
-    await settings.set_setting("artists_list_url", url)
+    user_id = await user_scope(update)
+    await users.set_user_setting(user_id, users.ARTISTS_URL_KEY, url)
     from matcher.artists import CACHE_KEY
-    await settings.set_setting(CACHE_KEY, "\n".join(lines))
+    await users.set_user_setting(user_id, CACHE_KEY, "\n".join(lines))
     await update.message.reply_text("Artists list URL updated and verified.")
 
 
 async def cmd_set_time(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _require_auth(update):
+    if await user_scope(update) != users.OWNER:
+        await update.message.reply_text(OWNER_ONLY_MESSAGE)
         return
     if not context.args or len(context.args) < 1:
         await update.message.reply_text("Usage: /set_time <HH:MM> (e.g. 09:00)")
@@ -136,11 +182,14 @@ async def cmd_set_time(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         return
     await settings.set_setting("check_time_local", raw)
     await settings.set_setting("timezone", "Europe/Amsterdam")
+    from scheduler.jobs import reschedule
+    await reschedule()
     await update.message.reply_text(f"Daily check time set to {raw} (Europe/Amsterdam).")
 
 
 async def cmd_set_location(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _require_auth(update):
+    if await user_scope(update) != users.OWNER:
+        await update.message.reply_text(OWNER_ONLY_MESSAGE)
         return
     if not context.args or len(context.args) < 1:
         await update.message.reply_text("Usage: /set_location NL (MVP: NL only)")
@@ -153,34 +202,72 @@ async def cmd_set_location(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     await update.message.reply_text("Location set to NL.")
 
 
-async def cmd_run_now(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _require_auth(update):
-        return
-    chat_id = await settings.get_setting("notification_chat_id")
-    if not chat_id:
-        await update.message.reply_text("Send /start first so I know where to send notifications.")
-        return
-    await update.message.reply_text("Running check…")
-    bot = context.application.bot
+def _wants_fresh(context: ContextTypes.DEFAULT_TYPE) -> bool:
+    return bool(context.args) and context.args[0].strip().lower() == FRESH_ARG
+
+
+def _cached_note(result: dict) -> str:
+    cached = result.get("cached_sources") or []
+    if not cached:
+        return ""
+    return f"\nFrom cache: {', '.join(cached)} (use '{FRESH_ARG}' to re-scrape)"
 
-    async def send_message(text: str) -> None:
-        await bot.send_message(chat_id=int(chat_id), text=text, parse_mode="Markdown")
 
-    from pipeline import run as pipeline_run
-    result = await pipeline_run(send_message)
+async def _run_in_background(message, send_message, *, dry_run: bool, use_cache: bool) -> None:
+    """Run the pipeline and keep `message` updated; started as a task so the bot stays responsive."""
+    from pipeline import trigger_run
+    label = "Dry run" if dry_run else "Run"
+    progress = ProgressMessage(message, message.text)  # keeps the "/cancel to stop" hint (owner) while running
+    try:
+        result = await trigger_run(
+            send_message, dry_run=dry_run, use_cache=use_cache, on_progress=progress.on_progress
+        )
+    except asyncio.CancelledError:
+        await progress.finish(f"{label} cancelled.")
+        return
+    except Exception as e:
+        logger.exception("%s failed: %s", label, e)
+        await progress.finish(f"{label} failed: {e}")
+        return
     status = result.get("status", "?")
     scanned = result.get("events_scanned_total", 0)
     matches = result.get("matches_total", 0)
-    sent = result.get("notifications_sent", 0)
-    await update.message.reply_text(
-        f"Run finished. Status: {status}\n"
-        f"Events scanned: {scanned}, Matches: {matches}, Notifications sent: {sent}"
+    joined = " (joined the run already in progress)" if result.get("coalesced") else ""
+    if dry_run:
+        counts = f"Events scanned: {scanned}, Matches found: {matches} (no notifications sent)."
+    else:
+        queued = result.get("notifications_queued", 0)
+        counts = f"Events scanned: {scanned}, Matches: {matches}, New notifications: {queued}"
+    await progress.finish(f"{label} finished{joined}. Status: {status}\n{counts}" + _cached_note(result))
+
+
+async def cmd_run_now(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    user_id = await user_scope(update)
+    chat_id = await users.get_user_setting(user_id, users.CHAT_ID_KEY)
+    if not chat_id:
+        await update.message.reply_text("Send /start first so I know where to send notifications.")
+        return
+    message = await update.message.reply_text("Running check…" + _cancel_hint(user_id))
+    send_message = get_sender(context.application.bot, int(chat_id)).send
+    context.application.create_task(
+        _run_in_background(message, send_message, dry_run=False, use_cache=not _wants_fresh(context)),
+        update=update,
     )
 
 
-async def cmd_status(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _require_auth(update):
+async def cmd_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    # One run serves every user, so a member cancelling it would cancel everyone's
+    if await user_scope(update) != users.OWNER:
+        await update.message.reply_text(OWNER_ONLY_CANCEL_MESSAGE)
         return
+    from pipeline import cancel_runs
+    if await cancel_runs():
+        await update.message.reply_text("Cancelling the run in progress…")
+    else:
+        await update.message.reply_text("No run in progress.")
+
+
+async def cmd_status(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     last_at = await settings.get_setting("last_run_at")
     last_status = await settings.get_setting("last_run_status")
     summary_raw = await settings.get_setting("last_run_summary_json")
@@ -193,20 +280,188 @@ async def cmd_status(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
         summary = {}
     scanned = summary.get("events_scanned_total", "?")
     matches = summary.get("matches_total", "?")
-    sent = summary.get("notifications_sent", "?")
+    queued = summary.get("notifications_queued", summary.get("notifications_sent", "?"))
     errors = summary.get("errors", [])
     err_text = "; ".join(errors[:3]) if errors else "none"
+    undelivered = await outbox.count_by_status()
     await update.message.reply_text(
         f"Last run: {last_at}\n"
         f"Outcome: {last_status}\n"
-        f"Events scanned: {scanned}, Matches: {matches}, Notifications sent: {sent}\n"
+        f"Events scanned: {scanned}, Matches: {matches}, New notifications: {queued}\n"
+        f"Outbox: {undelivered.get(outbox.STATUS_PENDING, 0)} pending, "
+        f"{undelivered.get(outbox.STATUS_FAILED, 0)} undeliverable\n"
         f"Errors: {err_text}"
+        + await _maintenance_note()
     )
 
 
-async def cmd_reset_history(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _require_auth(update):
+async def _maintenance_note() -> str:
+    raw = await settings.get_setting(maintenance.REPORT_KEY)
+    if not raw:
+        return ""
+    try:
+        report = json.loads(raw)
+    except ValueError:
+        return ""
+    # Archived rows are also counted under "history"
+    deleted = sum(n for k, n in report.get("deleted", {}).items() if k != "history_archived")
+    return (
+        f"\nMaintenance: {report['at'][:16].replace('T', ' ')} UTC, {deleted} rows removed, "
+        f"{report['reclaimed_bytes'] // 1024} KB reclaimed in {_fmt_ms(report['duration_ms'])}"
+        + (f" (VACUUM failed: {report['vacuum_error']})" if report.get("vacuum_error") else "")
+    )
+
+
+def _fmt_ms(ms) -> str:
+    if ms is None:
+        return "?"
+    return f"{ms / 1000:.1f}s" if ms >= 1000 else f"{int(ms)}ms"
+
+
+def _fmt_trend(p50, prev_p50) -> str:
+    if not p50 or not prev_p50:
+        return ""
+    change = (p50 - prev_p50) / prev_p50 * 100
+    arrow = "▲" if change > 0 else "▼" if change < 0 else "="
+    return f" {arrow}{change:+.0f}%"
+
+
+async def cmd_stats(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    last_n = STATS_DEFAULT_RUNS
+    if context.args:
+        try:
+            last_n = max(1, min(STATS_MAX_RUNS, int(context.args[0])))
+        except ValueError:
+            await update.message.reply_text("Usage: /stats [N] (number of recent runs, default 20)")
+            return
+    total_runs = await run_history.count_runs()
+    if total_runs == 0:
+        await update.message.reply_text("No runs recorded yet. Use /run_now to run a check.")
+        return
+    current = await run_history.latency_stats(last_n)
+    previous = {
+        (r["scope"], r["name"]): r["p50_ms"]
+        for r in await run_history.latency_stats(last_n, offset=last_n)
+    }
+    lines = [f"Latency over the last {min(last_n, total_runs)} of {total_runs} runs (p50 / p95, trend vs previous {last_n}):"]
+    scope_titles = {run_history.SCOPE_STAGE: "Stages", run_history.SCOPE_SOURCE: "Sources"}
+    scope = None
+    for r in current:
+        if r["scope"] != scope:
+            scope = r["scope"]
+            lines.append(f"\n{scope_titles.get(scope, scope)}:")
+        line = f"• {r['name']}: {_fmt_ms(r['p50_ms'])} / {_fmt_ms(r['p95_ms'])}"
+        line += _fmt_trend(r["p50_ms"], previous.get((r["scope"], r["name"])))
+        if scope == run_history.SCOPE_SOURCE:
+            line += f", ~{r['avg_events'] or 0:.0f} events, {r['errors'] or 0} errors"
+        lines.append(line)
+    await update.message.reply_text("\n".join(lines))
+
+
+def _parse_filters(args: Iterable[str], keys: Iterable[str]) -> Tuple[List[str], Dict[str, str]]:
+    """Split command args into free-text words and key:value filters for the given keys."""
+    keys = set(keys)
+    words: List[str] = []
+    found: Dict[str, str] = {}
+    for arg in args:
+        key, sep, value = arg.partition(":")
+        if sep and value and key.lower() in keys:
+            found[key.lower()] = value
+        else:
+            words.append(arg)
+    return words, found
+
+
+def _parse_date(value: str) -> str:
+    """YYYY-MM-DD or ValueError."""
+    return datetime.strptime(value, "%Y-%m-%d").strftime("%Y-%m-%d")
+
+
+def _parse_page(value: str) -> int:
+    page = int(value)
+    if page < 1:
+        raise ValueError("page must be 1 or more")
+    return page
+
+
+async def cmd_search(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Search every event seen so far (local index; never scrapes)."""
+    words, opts = _parse_filters(context.args or [], ("from", "to", "source", "page"))
+    query = " ".join(words).strip()
+    if not query:
+        await update.message.reply_text(SEARCH_USAGE)
+        return
+    try:
+        date_from = _parse_date(opts["from"]) if "from" in opts else None
+        date_to = _parse_date(opts["to"]) if "to" in opts else None
+        page = _parse_page(opts.get("page", "1"))
+    except ValueError:
+        await update.message.reply_text(SEARCH_USAGE)
+        return
+    source = opts.get("source", "").lower() or None
+    if source and source not in {s.value for s in Source}:
+        await update.message.reply_text("Unknown source. Use one of: " + ", ".join(s.value for s in Source))
+        return
+
+    result = await event_store.search(
+        query,
+        date_from=date_from,
+        date_to=date_to,
+        source=source,
+        limit=SEARCH_PAGE_SIZE,
+        offset=(page - 1) * SEARCH_PAGE_SIZE,
+    )
+    if not result.rows:
+        more = f" on page {page}" if page > 1 and result.total else ""
+        await update.message.reply_text(f"No events found for \"{query}\"{more}.")
         return
+    first = (page - 1) * SEARCH_PAGE_SIZE + 1
+    lines = [f"Events for \"{query}\" ({first}–{first + len(result.rows) - 1} of {result.total}):"]
+    for r in result.rows:
+        status = f" [{r['status']}]" if r["status"] else ""
+        lines.append(f"• {r['date_normalized']} — {r['title']} @ {r['venue'] or '?'} ({r['source']}){status}")
+        if r["url"]:
+            lines.append(f"  {r['url']}")
+    if first + len(result.rows) - 1 < result.total:
+        rest = " ".join(a for a in (context.args or []) if not a.lower().startswith("page:"))
+        lines.append(f"\nMore: /search {rest} page:{page + 1}")
+    await update.message.reply_text("\n".join(lines))
+
+
+async def cmd_history(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Notified matches, newest first; before:<id> continues after a page."""
+    words, opts = _parse_filters(context.args or [], ("venue", "from", "to", "before"))
+    try:
+        date_from = _parse_date(opts["from"]) if "from" in opts else None
+        date_to = _parse_date(opts["to"]) if "to" in opts else None
+        before_id = int(opts["before"]) if "before" in opts else None
+    except ValueError:
+        await update.message.reply_text(HISTORY_USAGE)
+        return
+    rows, has_more = await notif_hist.page(
+        user_id=await user_scope(update),
+        artist=" ".join(words).strip() or None,
+        venue=opts.get("venue"),
+        date_from=date_from,
+        date_to=date_to,
+        before_id=before_id,
+        limit=HISTORY_PAGE_SIZE,
+    )
+    if not rows:
+        await update.message.reply_text("No more notifications." if before_id else "No notifications found.")
+        return
+    lines = ["Notified (newest first):"]
+    for r in rows:
+        lines.append(f"• {r['notified_at'][:10]}: {r['artist']} — {r['venue']}, {r['date_normalized']}")
+        if r["event_url"]:
+            lines.append(f"  {r['event_url']}")
+    if has_more:
+        kept = [a for a in (context.args or []) if not a.lower().startswith("before:")]
+        lines.append("\nMore: " + " ".join(["/history", *kept, f"before:{rows[-1]['id']}"]))
+    await update.message.reply_text("\n".join(lines))
+
+
+async def cmd_reset_history(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     await update.message.reply_text(
         "This will clear all notification history so you can receive the same matches again. "
         f"Reply /{RESET_CONFIRM_CMD} to confirm."
@@ -214,15 +469,11 @@ async def cmd_reset_history(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
 
 async def cmd_reset_history_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _require_auth(update):
-        return
-    n = await notif_hist.clear_all()
+    n = await notif_hist.clear_all(await user_scope(update))
     await update.message.reply_text(f"Notification history cleared ({n} entries).")
 
 
 async def cmd_sources(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _require_auth(update):
-        return
     await update.message.reply_text(
         "Monitored sources:\n"
         "• Ticketmaster NL\n"
@@ -235,42 +486,34 @@ async def cmd_sources(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
 
 
 async def cmd_dry_run(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    if not await _require_auth(update):
-        return
-    chat_id = await settings.get_setting("notification_chat_id")
+    user_id = await user_scope(update)
+    chat_id = await users.get_user_setting(user_id, users.CHAT_ID_KEY)
     if not chat_id:
         await update.message.reply_text("Send /start first.")
         return
-    await update.message.reply_text("Running dry run (no notifications will be sent)…")
-    bot = context.application.bot
+    message = await update.message.reply_text(
+        "Running dry run (no notifications will be sent)…" + _cancel_hint(user_id)
+    )
 
     async def noop_send(_text: str) -> None:
         pass
 
-    from pipeline import run as pipeline_run
-    result = await pipeline_run(noop_send, dry_run=True)
-    status = result.get("status", "?")
-    scanned = result.get("events_scanned_total", 0)
-    matches = result.get("matches_total", 0)
-    await update.message.reply_text(
-        f"Dry run finished. Status: {status}\n"
-        f"Events scanned: {scanned}, Matches found: {matches} (no notifications sent)."
+    context.application.create_task(
+        _run_in_background(message, noop_send, dry_run=True, use_cache=not _wants_fresh(context)),
+        update=update,
     )
 
 
 async def on_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Route messages: onboarding step or unknown."""
-    if not await is_authorized(update):
-        if update.message:
-            await update.message.reply_text(REJECT_MESSAGE)
-        return
-    if await handle_onboarding_message(update, context):
+    """Route messages: onboarding step (owner only) or unknown."""
+    if await user_scope(update) == users.OWNER and await handle_onboarding_message(update, context):
         return
     if update.message:
         await update.message.reply_text("Send /help for commands.")
 
 
 def register_handlers(application) -> None:
+    register_auth_guard(application)
     application.add_handler(CommandHandler("start", cmd_start))
     application.add_handler(CommandHandler("help", cmd_help))
     application.add_handler(CommandHandler("settings", cmd_settings))
@@ -278,9 +521,13 @@ def register_handlers(application) -> None:
     application.add_handler(CommandHandler("set_time", cmd_set_time))
     application.add_handler(CommandHandler("set_location", cmd_set_location))
     application.add_handler(CommandHandler("run_now", cmd_run_now))
+    application.add_handler(CommandHandler("cancel", cmd_cancel))
     application.add_handler(CommandHandler("status", cmd_status))
+    application.add_handler(CommandHandler("stats", cmd_stats))
+    application.add_handler(CommandHandler("history", cmd_history))
     application.add_handler(CommandHandler("reset_history", cmd_reset_history))
     application.add_handler(CommandHandler(RESET_CONFIRM_CMD, cmd_reset_history_confirm))
+    application.add_handler(CommandHandler("search", cmd_search))
     application.add_handler(CommandHandler("sources", cmd_sources))
     application.add_handler(CommandHandler("dry_run", cmd_dry_run))
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, on_message))
@@ -0,0 +1,117 @@
+"""
+Minimal local HTTP server (asyncio streams, no extra dependencies).
+
+Serves the Telegram webhook (POST <path>, only with the right secret token)
+and health endpoints for a reverse proxy or container orchestrator:
+  GET /healthz  — process is up
+  GET /readyz   — bot application is running and the database answers
+"""
+import asyncio
+import hmac
+import json
+import logging
+from typing import Optional, Tuple
+
+from telegram import Update
+
+from storage.db import ping as db_ping
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 1024 * 1024
+HEADER_TIMEOUT = 10.0
+SECRET_HEADER = "x-telegram-bot-api-secret-token"
+
+_REASONS = {200: "OK", 400: "Bad Request", 403: "Forbidden", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 503: "Service Unavailable"}
+
+
+def parse_listen(value: str, default_port: int = 8080) -> Tuple[str, int]:
+    """'0.0.0.0:8080', '[::1]:8080', ':8080' or '8080' -> (host, port)."""
+    host, _, port = value.strip().rpartition(":")
+    if not port.isdigit():
+        raise ValueError(f"Invalid listen address {value!r} (expected host:port)")
+    if host.startswith("[") and host.endswith("]"):
+        host = host[1:-1]  # IPv6 literal
+    elif ":" in host:
+        raise ValueError(f"Invalid listen address {value!r} (put IPv6 addresses in brackets: [::1]:8080)")
+    return (host or "0.0.0.0", int(port or default_port))
+
+
+class HttpServer:
+    def __init__(
+        self,
+        application,
+        *,
+        webhook_path: Optional[str] = None,
+        secret_token: Optional[str] = None,
+    ) -> None:
+        self._application = application
+        self._webhook_path = webhook_path
+        self._secret_token = secret_token
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str, port: int) -> None:
+        self._server = await asyncio.start_server(self._handle, host, port)
+        routes = "/healthz, /readyz" + (f", {self._webhook_path} (webhook)" if self._webhook_path else "")
+        logger.info("HTTP server listening on %s:%d (%s)", host, port, routes)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            status, body = await asyncio.wait_for(self._dispatch(reader), HEADER_TIMEOUT)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            status, body = 400, b"bad request"
+        except Exception as e:
+            logger.warning("HTTP handler error: %s", e)
+            status, body = 503, b"error"
+        try:
+            writer.write(
+                f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                f"Content-Type: text/plain; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        method, path, _ = request_line.split(" ", 2)
+        path = path.split("?", 1)[0]
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if path == "/healthz":
+            return 200, b"ok"
+        if path == "/readyz":
+            ready = self._application.running and await db_ping()
+            return (200, b"ready") if ready else (503, b"not ready")
+        if self._webhook_path is None or path != self._webhook_path:
+            return 404, b"not found"
+        if method != "POST":
+            return 405, b"method not allowed"
+        if not self._secret_token or not hmac.compare_digest(
+            headers.get(SECRET_HEADER, ""), self._secret_token
+        ):
+            return 403, b"forbidden"
+        length = int(headers.get("content-length", "0"))
+        if length > MAX_BODY_BYTES:
+            return 413, b"too large"
+        data = json.loads(await reader.readexactly(length))
+        update = Update.de_json(data, self._application.bot)
+        await self._application.update_queue.put(update)
+        return 200, b"ok"
@@ -1,26 +1,34 @@
 """
-Single-user auth: only authorized_user_id can use the bot.
+Auth: the owner (authorized_user_id) plus members listed in ALLOWED_USER_IDS
+(storage/users.py) can use the bot. user_scope() maps an update to the user
+whose settings and history it acts on.
+
+The authorized id is resolved once (env, then settings) and kept in memory;
+set_authorized_user_id() is the only writer and updates the cache with the
+setting. auth_guard runs before every handler (group -1), so handlers don't
+check auth themselves.
 """
+import logging
 import os
-from typing import Callable, Awaitable
 
 from telegram import Update
-from telegram.ext import ContextTypes
+from telegram.ext import ApplicationHandlerStop, ContextTypes, TypeHandler
 
 from storage import settings
+from storage.users import OWNER, allowed_user_ids
+
+logger = logging.getLogger(__name__)
 
 REJECT_MESSAGE = "This bot is private."
 
+# Handler group for the guard: lower groups run first
+AUTH_GROUP = -1
 
-async def get_authorized_user_id() -> int | None:
-    """Return stored authorized_user_id, or from env, or None (not set yet)."""
-    env_id = os.environ.get("AUTHORIZED_USER_ID")
-    if env_id is not None:
-        try:
-            return int(env_id)
-        except ValueError:
-            pass
-    raw = await settings.get_setting("authorized_user_id")
+_UNSET = object()
+_cached_user_id: "int | None | object" = _UNSET
+
+
+def _parse_user_id(raw: str | None) -> int | None:
     if raw is None or raw == "":
         return None
     try:
@@ -29,25 +37,53 @@ async def get_authorized_user_id() -> int | None:
         return None
 
 
+async def get_authorized_user_id() -> int | None:
+    """Return authorized user id from env, else stored setting, else None (not set yet). Cached."""
+    global _cached_user_id
+    if _cached_user_id is _UNSET:
+        user_id = _parse_user_id(os.environ.get("AUTHORIZED_USER_ID"))
+        if user_id is None:
+            user_id = _parse_user_id(await settings.get_setting("authorized_user_id"))
+        _cached_user_id = user_id
+    return _cached_user_id
+
+
+async def set_authorized_user_id(user_id: int) -> None:
+    """Persist the authorized user and refresh the in-memory cache."""
+    global _cached_user_id
+    await settings.set_setting("authorized_user_id", str(user_id))
+    _cached_user_id = _UNSET
+    await get_authorized_user_id()
+    logger.info("Authorized user set to %s", user_id)
+
+
 async def is_authorized(update: Update) -> bool:
-    """True if update is from the authorized user or we're still in onboarding (no auth set)."""
+    """True if update is from the owner, a member, or we're still in onboarding (no owner set)."""
     user_id = update.effective_user.id if update.effective_user else None
     if user_id is None:
         return False
     auth_id = await get_authorized_user_id()
     if auth_id is None:
         return True  # First user to interact becomes authorized
-    return user_id == auth_id
-
-
-async def auth_middleware(
-    update: Update,
-    context: ContextTypes.DEFAULT_TYPE,
-    next_handler: Callable[[Update, ContextTypes.DEFAULT_TYPE], Awaitable[None]],
-) -> None:
-    """Call next_handler only if user is authorized; else reply and return."""
-    if not await is_authorized(update):
-        if update.message:
-            await update.message.reply_text(REJECT_MESSAGE)
+    return user_id == auth_id or user_id in allowed_user_ids()
+
+
+async def user_scope(update: Update) -> int:
+    """The member's Telegram user id for members, else OWNER (the owner, or whoever sets the bot up)."""
+    user_id = update.effective_user.id if update.effective_user else None
+    if user_id is not None and user_id in allowed_user_ids() and user_id != await get_authorized_user_id():
+        return user_id
+    return OWNER
+
+
+async def auth_guard(update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Stop handling updates from anyone but the authorized user (replying once to messages)."""
+    if not isinstance(update, Update) or await is_authorized(update):
         return
-    await next_handler(update, context)
+    if update.message:
+        await update.message.reply_text(REJECT_MESSAGE)
+    raise ApplicationHandlerStop
+
+
+def register_auth_guard(application) -> None:
+    application.add_handler(TypeHandler(Update, auth_guard), group=AUTH_GROUP)
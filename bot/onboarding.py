@@ -108,6 +108,8 @@ async def _handle_time_step(update: Update, text: str) -> bool:
     await settings.set_setting("check_time_local", text.strip())
     await settings.set_setting("timezone", "Europe/Amsterdam")
     await set_step("")
+    from scheduler.jobs import reschedule
+    await reschedule()
     await update.message.reply_text(
         "Setup complete. I'll check for concerts daily at " + text.strip() + " (Europe/Amsterdam). "
         "Use /settings to see your config and /run_now to run a check now."
@@ -0,0 +1,112 @@
+"""
+Background delivery of the notification outbox.
+
+Pending rows are packed into as few messages as fit Telegram's limit and sent
+through the paced ChatSender; rows are marked delivered only after Telegram
+acknowledges the message. The sender wakes when a run queues rows in this
+process and otherwise polls, so rows written by another process are picked up too.
+"""
+import asyncio
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+from bot.sender import get_sender
+from pipeline import pack_messages
+from storage import outbox
+from storage import settings
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 30.0  # seconds between drains when nothing wakes the sender
+BATCH_SIZE = 50  # outbox rows read per query
+DIGEST_THRESHOLD = 10  # more pending rows than this: lead with a summary line
+
+
+class OutboxSender:
+    def __init__(self, bot) -> None:
+        self._bot = bot
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        outbox.add_listener(self.wake)
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    async def _loop(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                await self.drain()
+            except Exception as e:
+                logger.exception("Outbox drain failed: %s", e)
+            try:
+                await asyncio.wait_for(self._wake.wait(), POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def drain(self) -> int:
+        """
+        Send all pending rows, grouped per chat. Returns number of rows delivered.
+        A failed send stops that drain after the current batch; other chats in the
+        batch are still served and the failed rows are retried on the next drain.
+        """
+        owner_chat_raw = await settings.get_setting("notification_chat_id")
+        owner_chat = int(owner_chat_raw) if owner_chat_raw else None
+        delivered = 0
+        digested: Set[Optional[int]] = set()
+        while True:
+            # No owner chat yet: leave those rows pending, out of the batch so they
+            # cannot fill it and starve members' rows behind them
+            rows = await outbox.fetch_pending(BATCH_SIZE, include_owner=owner_chat is not None)
+            groups: Dict[Optional[int], List[dict]] = {}
+            for r in rows:
+                groups.setdefault(r["chat_id"], []).append(r)
+            if not groups:
+                if delivered:
+                    logger.info("Outbox: delivered %d notification(s)", delivered)
+                return delivered
+            failed = False
+            for chat_key, group in groups.items():
+                sent, ok = await self._send_group(chat_key, owner_chat if chat_key is None else chat_key, group, digested)
+                delivered += sent
+                failed = failed or not ok
+            if failed:
+                return delivered
+
+    async def _send_group(
+        self, chat_key: Optional[int], chat_id: int, rows: List[dict], digested: Set[Optional[int]]
+    ) -> Tuple[int, bool]:
+        """Pack and send one chat's rows. Returns (rows delivered, no send failed)."""
+        sender = get_sender(self._bot, chat_id)
+        texts = [r["text"] for r in rows]
+        if chat_key not in digested:
+            digested.add(chat_key)
+            if len(rows) > DIGEST_THRESHOLD:
+                pending = await outbox.count_pending(chat_key)
+                texts[0] = f"You have {pending} new matches. Details below.\n\n" + texts[0]
+        delivered = 0
+        start = 0
+        for message, count in pack_messages(texts):
+            ids = [r["id"] for r in rows[start:start + count]]
+            start += count
+            try:
+                await sender.send(message)
+            except Exception as e:
+                logger.warning("Outbox delivery to chat %s failed for %d row(s): %s", chat_id, len(ids), e)
+                await outbox.mark_failed(ids, str(e))
+                return delivered, False
+            await outbox.mark_delivered(ids)
+            delivered += len(ids)
+        return delivered, True
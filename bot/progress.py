@@ -0,0 +1,66 @@
+"""
+Live run progress: one Telegram message edited as each source finishes.
+"""
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from models import SOURCE_NAMES
+
+logger = logging.getLogger(__name__)
+
+EDIT_INTERVAL = 1.0  # seconds; coalesces bursts of finished sources into one edit
+
+
+class ProgressMessage:
+    """
+    Wraps the bot's "Running check…" reply. on_progress() is the pipeline
+    progress callback (sync); edits are batched and sent from a background task.
+    """
+
+    def __init__(self, message, header: str) -> None:
+        self._message = message
+        self._header = header
+        self._lines: Dict[str, str] = {}
+        self._edit_task: Optional[asyncio.Task] = None
+        self._finished = False
+
+    def on_progress(self, progress: Dict) -> None:
+        sid = progress["name"]
+        name = SOURCE_NAMES.get(sid, sid)
+        n = progress.get("events_count", 0)
+        if progress.get("cached"):
+            line = f"{name} ✓ {n} events (cached)"
+        elif progress.get("error_count"):
+            line = f"{name} ✗ failed, {progress['duration_ms'] / 1000:.1f}s"
+        else:
+            line = f"{name} ✓ {n} events, {progress['duration_ms'] / 1000:.1f}s"
+        self._lines[sid] = line
+        if self._edit_task is None or self._edit_task.done():
+            self._edit_task = asyncio.create_task(self._edit_later())
+
+    def _text(self, footer: str = "") -> str:
+        if not footer:
+            return "\n".join([self._header, *self._lines.values()])
+        # Finished: the header ("Running…") no longer applies
+        lines = list(self._lines.values())
+        return "\n".join([*lines, "", footer] if lines else [footer])
+
+    async def _edit_later(self) -> None:
+        await asyncio.sleep(EDIT_INTERVAL)
+        if not self._finished:
+            await self._edit(self._text())
+
+    async def _edit(self, text: str) -> None:
+        try:
+            await self._message.edit_text(text)
+        except Exception as e:
+            # "message is not modified" and similar are harmless
+            logger.debug("Progress edit failed: %s", e)
+
+    async def finish(self, footer: str) -> None:
+        """Final edit: progress lines plus footer; later progress events are ignored."""
+        self._finished = True
+        if self._edit_task is not None and not self._edit_task.done():
+            self._edit_task.cancel()
+        await self._edit(self._text(footer))
@@ -0,0 +1,98 @@
+"""
+Outbound Telegram sends paced to the Bot API limits, with retries.
+
+Telegram allows roughly one message per second per chat and ~30 per second
+overall; beyond that it answers 429 (RetryAfter). Every send for a chat goes
+through one ChatSender, which spaces messages out, sleeps for the server's
+RetryAfter hint, and retries transient network errors instead of dropping the
+message.
+"""
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Dict
+
+from telegram.error import BadRequest, NetworkError, RetryAfter
+
+logger = logging.getLogger(__name__)
+
+PER_CHAT_INTERVAL = 1.0  # seconds between messages to the same chat
+GLOBAL_INTERVAL = 1.0 / 30  # seconds between any two messages
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 1.0  # 1s, 2s, 4s, ... for network errors
+PARSE_MODE = "Markdown"
+
+_global_lock = asyncio.Lock()
+_global_next_at = 0.0
+
+
+async def _wait_global_slot() -> None:
+    global _global_next_at
+    async with _global_lock:
+        loop = asyncio.get_running_loop()
+        delay = _global_next_at - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        _global_next_at = loop.time() + GLOBAL_INTERVAL
+
+
+def _retry_after_seconds(e: RetryAfter) -> float:
+    value = e.retry_after
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    return float(value)
+
+
+class ChatSender:
+    """Serialized, rate-limited sends to one chat."""
+
+    def __init__(self, bot, chat_id: int) -> None:
+        self._bot = bot
+        self._chat_id = chat_id
+        self._lock = asyncio.Lock()
+        self._next_at = 0.0
+
+    async def send(self, text: str) -> None:
+        """Send text, waiting for pacing and retrying; raises after MAX_ATTEMPTS."""
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            parse_mode = PARSE_MODE
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                delay = self._next_at - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await _wait_global_slot()
+                try:
+                    await self._bot.send_message(chat_id=self._chat_id, text=text, parse_mode=parse_mode)
+                    self._next_at = loop.time() + PER_CHAT_INTERVAL
+                    return
+                except RetryAfter as e:
+                    wait = _retry_after_seconds(e)
+                    logger.warning("Telegram flood control for chat %s; retry in %.0fs", self._chat_id, wait)
+                    self._next_at = loop.time() + wait
+                    if attempt == MAX_ATTEMPTS:
+                        raise
+                except BadRequest as e:
+                    # Usually unbalanced Markdown in scraped titles: resend as plain text once
+                    if parse_mode is None or "parse entities" not in str(e).lower() or attempt == MAX_ATTEMPTS:
+                        raise
+                    logger.warning("Markdown rejected for chat %s; resending as plain text", self._chat_id)
+                    parse_mode = None
+                except NetworkError as e:
+                    if attempt == MAX_ATTEMPTS:
+                        raise
+                    wait = BACKOFF_BASE * (2 ** (attempt - 1))
+                    logger.warning("Send to chat %s failed (%s); retry in %.0fs", self._chat_id, e, wait)
+                    self._next_at = loop.time() + wait
+
+
+_senders: Dict[int, ChatSender] = {}
+
+
+def get_sender(bot, chat_id: int) -> ChatSender:
+    """Shared ChatSender per chat, so every caller is paced together."""
+    sender = _senders.get(chat_id)
+    if sender is None or sender._bot is not bot:
+        sender = ChatSender(bot, chat_id)
+        _senders[chat_id] = sender
+    return sender
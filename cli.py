@@ -0,0 +1,123 @@
+"""
+Headless batch run: python cli.py [--dry-run] [--sources a,b] [--artists-file F] [--replay DIR] [--json]
+
+Runs the same pipeline as /run_now without Telegram or APScheduler, so it can be
+used from cron, benchmarks and profilers. New notifications are printed to stdout;
+without --dry-run they are also queued in the outbox for the bot to deliver.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from typing import List, Optional
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the concert pipeline once, without the Telegram bot.")
+    parser.add_argument("--dry-run", action="store_true", help="match and report only; do not record notification history")
+    parser.add_argument("--sources", help="comma-separated source ids (default: all), e.g. paradiso,melkweg")
+    parser.add_argument("--artists-file", help="local artists list (one per line) instead of the configured URL")
+    parser.add_argument("--replay", metavar="DIR", help="serve source pages from DIR/<host>.html instead of the network")
+    parser.add_argument("--record", metavar="DIR", help="save fetched source pages to DIR/<host>.html (for --replay)")
+    parser.add_argument("--fresh", action="store_true", help="bypass the event cache")
+    parser.add_argument("--json", action="store_true", help="print one JSON object instead of text")
+    parser.add_argument("--db", help="SQLite database path (default: $DATABASE_PATH or data/bot.db)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log pipeline progress to stderr")
+    return parser.parse_args(argv)
+
+
+def _print_text(result: dict, messages: List[str], notifications_count: int) -> None:
+    for msg in messages:
+        print(msg)
+        print()
+    print(f"Status: {result.get('status')}")
+    print(
+        f"Events scanned: {result.get('events_scanned_total', 0)}, "
+        f"Matches: {result.get('matches_total', 0)}, "
+        f"New notifications: {notifications_count}"
+    )
+    print("Stages:")
+    for name, ms in (result.get("stage_ms") or {}).items():
+        print(f"  {name:<10} {ms:>7} ms")
+    print("Sources:")
+    for m in result.get("source_metrics") or []:
+        print(f"  {m['name']:<18} {m['duration_ms']:>7} ms  {m['events_count']:>4} events  {m['error_count']} errors")
+    for sid in result.get("cached_sources") or []:
+        print(f"  {sid:<18} (cached)")
+    attempts = result.get("http_attempts") or []
+    if attempts:
+        print("Requests:")
+        for a in attempts:
+            hedged = " (hedged)" if a.get("hedged") else ""
+            print(f"  #{a['attempt']} {a['ms']:>7} ms  {a['outcome']}{hedged}  {a['url']}")
+    errors = json.loads(result.get("errors_json") or "[]")
+    if errors:
+        print("Errors:")
+        for e in errors:
+            print(f"  {e}")
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    from storage.db import init_db
+    init_db(args.db or os.environ.get("DATABASE_PATH", "data/bot.db"))
+
+    from pipeline import register_connector, run
+    from sources.base import close_shared_client, set_record_dir, set_replay_dir
+    from sources.registry import default_connectors
+    from matcher.artists import load_artists_file
+    from matcher import pool as match_pool
+
+    for connector in default_connectors(args.sources.split(",") if args.sources else None):
+        register_connector(connector)
+    set_replay_dir(args.replay)
+    set_record_dir(args.record)
+
+    artists = load_artists_file(args.artists_file) if args.artists_file else None
+
+    messages: List[str] = []
+
+    async def collect(text: str) -> None:
+        messages.append(text)
+
+    try:
+        result = await run(
+            collect,
+            dry_run=args.dry_run,
+            use_cache=not (args.fresh or args.replay),
+            artists_override=artists,
+        )
+    finally:
+        await close_shared_client()
+        match_pool.shutdown()
+    result["messages"] = messages
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    logging.basicConfig(
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        level=logging.INFO if args.verbose else logging.WARNING,
+        stream=sys.stderr,
+    )
+    try:
+        result = asyncio.run(_run(args))
+    except (ValueError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    # Failed runs carry no notifications
+    notifications = result.pop("notifications", [])
+    messages = result.pop("messages") + notifications
+    if args.json:
+        result["errors"] = json.loads(result.pop("errors_json") or "[]")
+        result["messages"] = messages
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        _print_text(result, messages, len(notifications))
+    return 1 if result.get("status") == "failure" else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,18 @@
 """
 Amsterdam Concert Tracker — single-user Telegram bot entrypoint.
+
+BOT_MODE=polling (default) long-polls Telegram; BOT_MODE=webhook receives
+updates on the built-in HTTP server (see bot/http_server.py), which also serves
+/healthz and /readyz. HTTP_LISTEN enables that server in polling mode too.
+SCRAPE_MODE=worker leaves runs to worker.py processes (see pipeline.py).
 """
+import asyncio
 import os
+import re
+import signal
 import sys
 import logging
+from urllib.parse import urlparse
 
 logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
@@ -11,6 +20,48 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+DEFAULT_HTTP_LISTEN = "0.0.0.0:8080"
+# Characters Telegram accepts in a webhook secret token (1-256 of them)
+WEBHOOK_SECRET_RE = re.compile(r"[A-Za-z0-9_-]{1,256}")
+
+
+async def _run_webhook(application, *, webhook_url: str, listen: str, secret_token: str) -> None:
+    """Lifecycle equivalent of run_polling(), with updates pushed to our HTTP server."""
+    from telegram import Update
+    from bot.http_server import HttpServer, parse_listen
+
+    host, port = parse_listen(listen)
+    path = urlparse(webhook_url).path or "/"
+    server = HttpServer(application, webhook_path=os.environ.get("WEBHOOK_PATH") or path,
+                        secret_token=secret_token)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await application.initialize()
+    if application.post_init:
+        await application.post_init(application)
+    await application.start()
+    await server.start(host, port)
+    await application.bot.set_webhook(
+        url=webhook_url,
+        secret_token=secret_token,
+        allowed_updates=Update.ALL_TYPES,
+    )
+    logger.info("Webhook set to %s", webhook_url)
+    try:
+        await stop.wait()
+    finally:
+        await server.stop()
+        await application.stop()
+        if application.post_stop:
+            await application.post_stop(application)
+        await application.shutdown()
+        if application.post_shutdown:
+            await application.post_shutdown(application)
+
 
 def main() -> None:
     token = os.environ.get("TELEGRAM_BOT_TOKEN")
@@ -27,36 +78,80 @@ def main() -> None:
 
     # Register all source connectors for the pipeline
     from pipeline import register_connector
-    from sources.paradiso import ParadisoConnector
-    from sources.melkweg import MelkwegConnector
-    from sources.afas_live import AFASLiveConnector
-    from sources.ziggo_dome import ZiggoDomeConnector
-    from sources.ticketmaster_nl import TicketmasterNLConnector
-    from sources.johan_cruijff_arena import JohanCruijffArenaConnector
-    register_connector(ParadisoConnector())
-    register_connector(MelkwegConnector())
-    register_connector(AFASLiveConnector())
-    register_connector(ZiggoDomeConnector())
-    register_connector(TicketmasterNLConnector())
-    register_connector(JohanCruijffArenaConnector())
+    from sources.registry import default_connectors
+    for connector in default_connectors():
+        register_connector(connector)
 
     from telegram import Update
     from telegram.ext import Application
     from bot.handlers import register_handlers
+    from bot.outbox_sender import OutboxSender
     from scheduler.jobs import schedule_daily_run
 
+    mode = os.environ.get("BOT_MODE", "polling").strip().lower()
+    http_listen = os.environ.get("HTTP_LISTEN", "").strip()
+    webhook_url = os.environ.get("WEBHOOK_URL", "").strip()
+    if mode not in ("polling", "webhook"):
+        logger.error("BOT_MODE must be 'polling' or 'webhook', got %r", mode)
+        sys.exit(1)
+    if mode == "webhook" and not webhook_url:
+        logger.error("BOT_MODE=webhook requires WEBHOOK_URL (public https URL Telegram posts to)")
+        sys.exit(1)
+    secret_token = os.environ.get("WEBHOOK_SECRET_TOKEN", "").strip()
+    if mode == "webhook" and not WEBHOOK_SECRET_RE.fullmatch(secret_token):
+        # Without it anyone who finds the URL could post fake updates as the owner
+        logger.error("BOT_MODE=webhook requires WEBHOOK_SECRET_TOKEN (1-256 characters: A-Z, a-z, 0-9, _ and -)")
+        sys.exit(1)
+
     async def post_init(app):
         logger.info("Bot initialized")
+        from pipeline import SCRAPE_MODE_WORKER, get_scrape_mode
+        if get_scrape_mode() == SCRAPE_MODE_WORKER:
+            logger.info("SCRAPE_MODE=worker: runs are queued for worker.py")
+        sender = OutboxSender(app.bot)
+        sender.start()
+        app.bot_data["outbox_sender"] = sender
+        if mode == "polling" and http_listen:
+            # Health endpoints only; in webhook mode _run_webhook owns the server
+            from bot.http_server import HttpServer, parse_listen
+            server = HttpServer(app)
+            await server.start(*parse_listen(http_listen))
+            app.bot_data["http_server"] = server
         await schedule_daily_run(app)
 
+    async def post_shutdown(app):
+        from scheduler.jobs import shutdown_scheduler
+        shutdown_scheduler()
+        sender = app.bot_data.get("outbox_sender")
+        if sender is not None:
+            await sender.stop()
+        server = app.bot_data.get("http_server")
+        if server is not None:
+            await server.stop()
+        from sources.base import close_shared_client
+        await close_shared_client()
+        from matcher import pool
+        pool.shutdown()
+
     application = (
         Application.builder()
         .token(token)
         .post_init(post_init)
+        .post_shutdown(post_shutdown)
         .build()
     )
     register_handlers(application)
 
+    if mode == "webhook":
+        logger.info("Starting webhook mode")
+        asyncio.run(_run_webhook(
+            application,
+            webhook_url=webhook_url,
+            listen=http_listen or DEFAULT_HTTP_LISTEN,
+            secret_token=secret_token,
+        ))
+        return
+
     logger.info("Starting polling")
     application.run_polling(allowed_updates=Update.ALL_TYPES)
 
@@ -1,11 +1,16 @@
 """
 Fetch and parse artists list from URL; cache for fallback on failure.
+
+One artist per line; a line may add alternate names after "|", e.g.
+"Kanye West | Ye". Matches on any name are reported under the first one.
 """
 import logging
-from typing import List, Optional, Tuple
+import time
+from typing import Dict, List, Optional, Tuple
 
 import httpx
-from storage import settings
+from sources.governor import PRIORITY_ARTISTS, get_governor
+from storage.users import OWNER, get_user_setting, set_user_setting
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +19,12 @@ USER_AGENT = "AmsterdamConcertTracker/1.0 (NL concert notifications bot)"
 CONNECT_TIMEOUT = 10.0
 READ_TIMEOUT = 30.0
 
+ALIAS_SEPARATOR = "|"
+
+# Last successful fetch per url (time.monotonic(), artists): a run right after a
+# pre-warm or another run reuses it instead of downloading the list again
+_recent: Dict[str, Tuple[float, List[str]]] = {}
+
 
 def _parse_lines(text: str) -> List[str]:
     """Dedupe, strip, skip empty. Return list of artist strings."""
@@ -28,20 +39,40 @@ def _parse_lines(text: str) -> List[str]:
     return out
 
 
-async def fetch_artists(url: str) -> Tuple[List[str], Optional[str]]:
+def split_aliases(entry: str) -> List[str]:
+    """Names on one list line: the canonical name first, then its aliases."""
+    return [name.strip() for name in entry.split(ALIAS_SEPARATOR) if name.strip()]
+
+
+def load_artists_file(path: str) -> List[str]:
+    """Read and parse a local artists list (same format as the URL)."""
+    with open(path, encoding="utf-8") as f:
+        return _parse_lines(f.read())
+
+
+async def fetch_artists(
+    url: str, *, max_age: float = 0, user_id: int = OWNER
+) -> Tuple[List[str], Optional[str]]:
     """
     Fetch artists list from URL. Returns (artists, error_message).
     On success: updates cache and returns (list, None).
     On failure: returns ([], error_message); if cache exists, also return cached list in a second call
     pattern: caller should check error and then call get_cached_artists() if needed.
+    max_age > 0: reuse this process's last successful fetch of url if it is at most that many seconds old.
+    The fallback cache is per user (user_id).
     """
+    recent = _recent.get(url)
+    if max_age > 0 and recent is not None and time.monotonic() - recent[0] <= max_age:
+        return (list(recent[1]), None)
     try:
         async with httpx.AsyncClient(
             follow_redirects=True,
             timeout=httpx.Timeout(CONNECT_TIMEOUT, read=READ_TIMEOUT),
             headers={"User-Agent": USER_AGENT},
         ) as client:
-            resp = await client.get(url)
+            resp = await get_governor().run(
+                httpx.URL(url).host, PRIORITY_ARTISTS, url, lambda: client.get(url)
+            )
             resp.raise_for_status()
             text = resp.text
     except Exception as e:
@@ -52,13 +83,14 @@ async def fetch_artists(url: str) -> Tuple[List[str], Optional[str]]:
     if not artists:
         return ([], "Artists list is empty after parsing")
     # Cache as newline-joined
-    await settings.set_setting(CACHE_KEY, "\n".join(artists))
-    return (artists, None)
+    await set_user_setting(user_id, CACHE_KEY, "\n".join(artists))
+    _recent[url] = (time.monotonic(), artists)
+    return (list(artists), None)
 
 
-async def get_cached_artists() -> List[str]:
-    """Return last successfully fetched artists list from cache, or empty list."""
-    raw = await settings.get_setting(CACHE_KEY)
+async def get_cached_artists(user_id: int = OWNER) -> List[str]:
+    """Return the user's last successfully fetched artists list from cache, or empty list."""
+    raw = await get_user_setting(user_id, CACHE_KEY)
     if not raw:
         return []
     return _parse_lines(raw)
@@ -0,0 +1,59 @@
+"""
+Aho-Corasick automaton: finds every pattern contained in a text in one pass
+over the text, however many patterns there are. Built once per artists list
+(see matcher/match.py compile_artists), so artist aliases add states to the
+automaton rather than comparisons per event.
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class Automaton:
+    __slots__ = ("_goto", "_fail", "_out")
+
+    def __init__(self, patterns: Iterable[Tuple[str, int]]) -> None:
+        """patterns: (text, value) pairs; several patterns may share a value."""
+        goto: List[Dict[str, int]] = [{}]
+        out: List[Tuple[int, ...]] = [()]
+        for text, value in patterns:
+            if not text:
+                continue
+            node = 0
+            for ch in text:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    out.append(())
+                node = nxt
+            if value not in out[node]:
+                out[node] += (value,)
+
+        # Breadth-first, so a state's failure link is final before its children need it
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in goto[node].items():
+                queue.append(nxt)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                if out[fail[nxt]]:
+                    out[nxt] += tuple(v for v in out[fail[nxt]] if v not in out[nxt])
+        self._goto, self._fail, self._out = goto, fail, out
+
+    def find(self, text: str) -> Set[int]:
+        """Values of all patterns occurring in text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[int] = set()
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
@@ -1,7 +1,8 @@
 """
 Dedupe matches against notification_history; return only new (artist, event) to notify.
+All users' matches are checked and recorded in one batch (one transaction).
 """
-from typing import List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 from models import Event
 from storage import notification_history as hist
@@ -10,26 +11,49 @@ from storage import notification_history as hist
 Match = Tuple[str, Event]
 
 
-async def filter_new_matches(matches: List[Match], *, skip_insert: bool = False) -> List[Match]:
+def _key(user_id: int, artist: str, event: Event) -> hist.Key:
+    return (user_id, artist, event.venue or "", event.date_normalized or "TBA")
+
+
+async def filter_new_matches(
+    matches: Dict[int, List[Match]],
+    *,
+    skip_insert: bool = False,
+    notification_text: Optional[Callable[[str, Event], str]] = None,
+    chat_ids: Optional[Dict[int, int]] = None,
+) -> Dict[int, List[Match]]:
     """
-    For each (artist, event), if (artist, venue, date_normalized) is not in history,
-    optionally insert into history and add to result. Otherwise skip.
+    matches: user_id -> that user's (artist, event) pairs. For each pair, if
+    (user_id, artist, venue, date_normalized) is not in history, insert into history
+    and add to result. Otherwise skip.
+    With notification_text, each new match's message is queued in the outbox (for
+    chat_ids[user_id], default the owner's chat) in the same transaction as its history row.
     When skip_insert=True (e.g. dry_run), only return which would be new; do not insert.
     """
-    to_notify: List[Match] = []
-    for artist, event in matches:
-        key_venue = event.venue or ""
-        key_date = event.date_normalized or "TBA"
-        if await hist.exists(artist, key_venue, key_date):
-            continue
-        if not skip_insert:
-            await hist.insert(
-                artist=artist,
-                venue=key_venue,
-                date_normalized=key_date,
-                event_title=event.title,
-                event_url=event.url,
-                source=event.source.value if hasattr(event.source, "value") else str(event.source),
-            )
-        to_notify.append((artist, event))
-    return to_notify
+    flat = [(user_id, artist, event) for user_id, pairs in matches.items() for artist, event in pairs]
+    result: Dict[int, List[Match]] = {user_id: [] for user_id in matches}
+    if skip_insert:
+        existing = await hist.existing_keys(_key(*m) for m in flat)
+        for user_id, artist, event in flat:
+            key = _key(user_id, artist, event)
+            if key not in existing:
+                existing.add(key)  # same key twice in one run: report once
+                result[user_id].append((artist, event))
+        return result
+
+    chat_ids = chat_ids or {}
+    entries = [
+        (
+            _key(user_id, artist, event),
+            event.title,
+            event.url,
+            event.source.value,
+            notification_text(artist, event) if notification_text else None,
+            chat_ids.get(user_id),
+        )
+        for user_id, artist, event in flat
+    ]
+    for i in await hist.record_new(entries):
+        user_id, artist, event = flat[i]
+        result[user_id].append((artist, event))
+    return result
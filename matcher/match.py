@@ -1,9 +1,27 @@
 """
-Case-insensitive substring matching: events vs artists list.
+Whole-word matching on normalized text (matcher/normalize.py): events vs artists list.
+An artist matches when its words appear as consecutive whole words of the title:
+normalized text is single-space separated, so titles and names are padded with
+one space on each side and searched as substrings ("ye" matches "Kanye West feat.
+Ye" but not "Yeah Yeah Yeahs").
+
+A list line may carry aliases ("Kanye West | Ye", see matcher/artists.py). All
+names of all lines are compiled into one Aho-Corasick automaton per list
+version, cached by the list's hash, so each title is scanned once however many
+names and aliases there are. Matches are reported under the line's first name,
+which keeps the dedupe key stable whichever alias a source used.
 """
 import logging
-from typing import List, Tuple
+from collections import OrderedDict
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Tuple
 
+from matcher import pool
+from matcher.artists import split_aliases
+from matcher.automaton import Automaton
+from matcher.normalize import normalize
 from models import Event
 
 logger = logging.getLogger(__name__)
@@ -11,11 +29,89 @@ logger = logging.getLogger(__name__)
 # (artist_from_list, event)
 Match = Tuple[str, Event]
 
+# Compiled lists kept (one per distinct list in use, e.g. one per user)
+COMPILED_CACHE_SIZE = 8
+# Parsed list lines kept, so names are normalized once, not on every run
+ENTRY_CACHE_SIZE = 100_000
+
+
+@dataclass
+class CompiledArtists:
+    canonical: List[str]  # first name of each list entry, by entry index ("" for a blank entry)
+    automaton: Automaton  # normalized name or alias -> entry index
+
+    def match_title(self, title_normalized: str) -> List[int]:
+        """Indexes of entries with a name among the normalized title's words, in list order."""
+        return sorted(self.automaton.find(f" {title_normalized} "))
+
+
+_compiled: "OrderedDict[str, CompiledArtists]" = OrderedDict()
+
+
+@lru_cache(maxsize=ENTRY_CACHE_SIZE)
+def _parse_entry(entry: str) -> Tuple[str, Tuple[str, ...]]:
+    """(canonical name, normalized names) of one list line; ("", ()) for a blank line."""
+    names = split_aliases(entry)
+    return (names[0] if names else "", tuple(normalize(n) for n in names))
+
+
+def compile_artists(entries: List[str]) -> CompiledArtists:
+    """Automaton over every normalized name of every entry; built (and normalized) once per list version."""
+    digest = pool.list_hash(entries)
+    compiled = _compiled.get(digest)
+    if compiled is not None:
+        _compiled.move_to_end(digest)
+        return compiled
+    canonical: List[str] = []
+    patterns: List[Tuple[str, int]] = []
+    for i, entry in enumerate(entries):
+        name, normalized = _parse_entry(entry)
+        canonical.append(name)
+        # Padded: names match on word boundaries only (see match_title)
+        patterns.extend((f" {n} ", i) for n in normalized if n)
+    compiled = CompiledArtists(canonical=canonical, automaton=Automaton(patterns))
+    _compiled[digest] = compiled
+    while len(_compiled) > COMPILED_CACHE_SIZE:
+        _compiled.popitem(last=False)
+    return compiled
+
+
+def _match_pairs(events: List[Event], compiled: CompiledArtists) -> List[Tuple[int, int]]:
+    """(event index, entry index) for every match, event by event, in list order."""
+    return [
+        (ei, ai)
+        for ei, event in enumerate(events)
+        for ai in compiled.match_title(event.title_normalized)
+    ]
+
+
+def _log_matches(events: List[Event], canonical: List[str], pairs: List[Tuple[int, int]], *, per_artist: bool) -> None:
+    for ei, ai in pairs:
+        event = events[ei]
+        logger.info(
+            "Match: artist=%r title=%r source=%s",
+            canonical[ai],
+            (event.title or "")[:80],
+            getattr(event.source, "value", event.source),
+        )
+    if per_artist or logger.isEnabledFor(logging.DEBUG):
+        log = logger.info if per_artist else logger.debug
+        counts = [0] * len(canonical)
+        for _, ai in pairs:
+            counts[ai] += 1
+        for artist, n in zip(canonical, counts):
+            if n == 0:
+                log("Artist %r: 0 matches (mismatch)", artist)
+            else:
+                log("Artist %r: %d matches", artist, n)
+    logger.info("Matching done: %d matches", len(pairs))
+
 
 def match_events_to_artists(events: List[Event], artists: List[str]) -> List[Match]:
     """
-    For each event, if any artist (casefolded) is a substring of the event title (casefolded),
-    emit (artist_from_list, event). One event can match multiple artists.
+    For each event, if any name of an artist entry (normalized) appears as whole words
+    in the event title (normalized), emit (artist_from_list, event) under the entry's first
+    name. One event can match multiple artists; aliases of one entry match it once.
     """
     artists_clean = [a.strip() for a in artists if a and a.strip()]
     logger.info(
@@ -26,33 +122,57 @@ def match_events_to_artists(events: List[Event], artists: List[str]) -> List[Mat
     )
     if artists_clean:
         logger.debug("Artists list (first 20): %s", artists_clean[:20])
-    matches: List[Match] = []
-    match_count_per_artist: dict[str, int] = {a: 0 for a in artists_clean}
-    for event in events:
-        title_folded = (event.title or "").casefold()
-        event_matched = False
-        for artist in artists_clean:
-            if artist.casefold() in title_folded:
-                matches.append((artist, event))
-                match_count_per_artist[artist] = match_count_per_artist.get(artist, 0) + 1
-                event_matched = True
-                logger.info(
-                    "Match: artist=%r title=%r source=%s",
-                    artist,
-                    (event.title or "")[:80],
-                    getattr(event.source, "value", event.source),
-                )
-        if not event_matched:
-            logger.debug(
-                "No match for event: title=%r source=%s",
-                (event.title or "")[:80],
-                getattr(event.source, "value", event.source),
-            )
-    for artist in artists_clean:
-        n = match_count_per_artist.get(artist, 0)
-        if n == 0:
-            logger.info("Artist %r: 0 matches (mismatch)", artist)
-        else:
-            logger.info("Artist %r: %d matches", artist, n)
-    logger.info("Matching done: %d matches", len(matches))
-    return matches
+    compiled = compile_artists(artists_clean)
+    pairs = _match_pairs(events, compiled)
+    _log_matches(events, compiled.canonical, pairs, per_artist=True)
+    return [(compiled.canonical[ai], events[ei]) for ei, ai in pairs]
+
+
+async def _match_union(events: List[Event], entries: List[str]) -> List[Tuple[int, int]]:
+    """(event index, entry index) pairs, on the process pool for large lists; per-artist counts
+    are logged at DEBUG there (lists are huge)."""
+    compiled = compile_artists(entries)
+    if pool.enabled_for(len(entries)):
+        logger.info("Matching on %d process(es): %d artists vs %d events",
+                    pool.get_process_count(), len(entries), len(events))
+        titles = [e.title_normalized for e in events]
+        try:
+            pairs = await pool.match_pairs(titles, entries)
+            _log_matches(events, compiled.canonical, pairs, per_artist=False)
+            return pairs
+        except (BrokenProcessPool, pool.ShardNotLoaded) as e:
+            logger.warning("Match pool failed (%s); matching in-process", e)
+    logger.info("Matching: %d artists vs %d events", len(entries), len(events))
+    pairs = _match_pairs(events, compiled)
+    _log_matches(events, compiled.canonical, pairs, per_artist=True)
+    return pairs
+
+
+async def match_for_users(events: List[Event], lists: Dict[int, List[str]]) -> Dict[int, List[Match]]:
+    """
+    Match events once against the union of every user's artists, then fan the
+    matches out: cost follows events x distinct artists, not users x events.
+    Each user's matches carry the artist as spelled in their own list. Entries
+    are shared only when their names and aliases agree (normalized), so one
+    user's aliases never widen another user's matches. Large unions are matched
+    on the process pool (matcher/pool.py).
+    """
+    # entry key (normalized names) -> {user_id: that user's canonical spelling}
+    owners: Dict[Tuple[str, ...], Dict[int, str]] = {}
+    union: List[str] = []
+    keys: List[Tuple[str, ...]] = []
+    for user_id, artists in lists.items():
+        for artist in artists:
+            name, key = _parse_entry(artist)
+            if not key:
+                continue
+            if key not in owners:
+                owners[key] = {}
+                union.append(artist.strip())
+                keys.append(key)
+            owners[key].setdefault(user_id, name)
+    out: Dict[int, List[Match]] = {user_id: [] for user_id in lists}
+    for ei, ai in await _match_union(events, union):
+        for user_id, spelling in owners[keys[ai]].items():
+            out[user_id].append((spelling, events[ei]))
+    return out
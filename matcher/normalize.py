@@ -0,0 +1,29 @@
+"""
+Text normalization shared by artist names and event titles, so that
+"Róisín Murphy", "ROISIN MURPHY" and "Roisin  Murphy" compare equal:
+
+- casefold, then NFKD with combining marks dropped (ó -> o), plus the few
+  letters NFKD does not decompose (ø, æ, œ, ł, ...)
+- "&" becomes "and"; apostrophes are dropped ("Guns N' Roses" -> "guns n roses")
+- every other run of punctuation or whitespace becomes one space
+
+Titles are normalized once when an Event is created (Event.title_normalized)
+and artist names once per list version (matcher/match.py compile_artists).
+"""
+import re
+import unicodedata
+
+_LETTERS = str.maketrans({
+    "ø": "o", "æ": "ae", "œ": "oe", "ł": "l", "đ": "d", "ð": "d", "þ": "th", "ı": "i",
+})
+_APOSTROPHES = str.maketrans("", "", "'’‘`´")
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def normalize(text: str) -> str:
+    s = text.casefold().replace("&", " and ")
+    if not s.isascii():
+        s = unicodedata.normalize("NFKD", s.translate(_LETTERS))
+        s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    s = s.translate(_APOSTROPHES)
+    return _SEPARATORS.sub(" ", s).strip()
@@ -0,0 +1,152 @@
+"""
+Sharded matching on worker processes for very large artist lists.
+
+With MATCH_PROCESSES=N (0 disables), unions of at least POOL_MIN_ARTISTS
+artists are split into N contiguous shards. Each shard belongs to its own
+single-process executor, so its entries are shipped and compiled into the
+shard's automaton once per list version, keyed by the list's hash, and stay in
+that process across runs; a run only sends the normalized event titles. Shards
+return (event index, artist index) pairs in the order they were found, which
+heapq.merge turns into exactly the order match_events_to_artists produces.
+Matching then runs off the event loop and off the bot process's GIL.
+
+If a shard holds another list when the titles arrive (a concurrent run with a
+different list shipped its own in between), the shards are shipped again and
+matching is retried once; after that ShardNotLoaded reaches the caller.
+"""
+import asyncio
+import hashlib
+import heapq
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Below this many artists, pickling titles to other processes costs more than matching here
+POOL_MIN_ARTISTS = 2000
+
+# Parent side: one single-process executor per shard and the list hash each one holds
+_executors: List[ProcessPoolExecutor] = []
+_loaded: List[Optional[str]] = []
+
+# Worker side: this process's shard
+_shard_hash: Optional[str] = None
+_shard_offset = 0
+_shard_compiled: Any = None  # matcher.match.CompiledArtists
+
+
+class ShardNotLoaded(RuntimeError):
+    """A worker process holds a different artist list than the one being matched."""
+
+
+def get_process_count() -> int:
+    """MATCH_PROCESSES: worker processes for matching large lists (default 0: match in-process)."""
+    raw = os.environ.get("MATCH_PROCESSES", "").strip()
+    if not raw:
+        return 0
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        logger.warning("Invalid MATCH_PROCESSES=%r; matching in-process", raw)
+        return 0
+
+
+def enabled_for(artists_count: int) -> bool:
+    return get_process_count() > 0 and artists_count >= POOL_MIN_ARTISTS
+
+
+def list_hash(artists: Sequence[str]) -> str:
+    return hashlib.sha1("\n".join(artists).encode("utf-8")).hexdigest()
+
+
+def _load_shard(digest: str, offset: int, entries: List[str]) -> None:
+    global _shard_hash, _shard_offset, _shard_compiled
+    from matcher.match import compile_artists
+    _shard_hash, _shard_offset, _shard_compiled = digest, offset, compile_artists(entries)
+
+
+def _match_shard(digest: str, titles_normalized: List[str]) -> List[Tuple[int, int]]:
+    if digest != _shard_hash:
+        raise ShardNotLoaded("artist shard not loaded for this list")
+    offset, compiled = _shard_offset, _shard_compiled
+    return [
+        (ei, offset + ai)
+        for ei, title in enumerate(titles_normalized)
+        for ai in compiled.match_title(title)
+    ]
+
+
+def _ensure_executors(n: int) -> None:
+    global _executors, _loaded
+    if len(_executors) == n:
+        return
+    shutdown()
+    # spawn, not fork: the bot process runs threads (aiosqlite, APScheduler)
+    ctx = multiprocessing.get_context("spawn")
+    _executors = [ProcessPoolExecutor(max_workers=1, mp_context=ctx) for _ in range(n)]
+    _loaded = [None] * n
+
+
+def _shards(count: int, n: int) -> List[Tuple[int, int]]:
+    """n contiguous (start, end) slices of range(count), sizes differing by at most one."""
+    size, extra = divmod(count, n)
+    bounds, start = [], 0
+    for i in range(n):
+        end = start + size + (1 if i < extra else 0)
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+async def _match_once(titles_normalized: List[str], artists: List[str], digest: str, n: int) -> List[Tuple[int, int]]:
+    loop = asyncio.get_running_loop()
+    bounds = _shards(len(artists), n)
+    stale = [i for i in range(n) if _loaded[i] != digest]
+    try:
+        if stale:
+            await asyncio.gather(*(
+                loop.run_in_executor(
+                    _executors[i], _load_shard, digest, bounds[i][0],
+                    artists[bounds[i][0]:bounds[i][1]],
+                )
+                for i in stale
+            ))
+            for i in stale:
+                _loaded[i] = digest
+            logger.info("Match pool: shipped %d artists to %d process(es)", len(artists), len(stale))
+        parts = await asyncio.gather(*(
+            loop.run_in_executor(ex, _match_shard, digest, titles_normalized) for ex in _executors
+        ))
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed): start over with fresh processes next time
+        shutdown()
+        raise
+    except ShardNotLoaded:
+        # What each process holds is no longer known: ship every shard next time
+        _loaded[:] = [None] * len(_loaded)
+        raise
+    return list(heapq.merge(*parts))
+
+
+async def match_pairs(titles_normalized: List[str], artists: List[str]) -> List[Tuple[int, int]]:
+    """(event index, artist index) for every artist contained in a title, in event-then-list order."""
+    n = max(1, min(get_process_count(), len(artists)))
+    _ensure_executors(n)
+    digest = list_hash(artists)
+    try:
+        return await _match_once(titles_normalized, artists, digest, n)
+    except ShardNotLoaded:
+        logger.info("Match pool: shards hold another list; shipping again")
+        return await _match_once(titles_normalized, artists, digest, n)
+
+
+def shutdown() -> None:
+    """Stop the worker processes (at exit, or when MATCH_PROCESSES changes)."""
+    global _executors, _loaded
+    for ex in _executors:
+        ex.shutdown(wait=False, cancel_futures=True)
+    _executors, _loaded = [], []
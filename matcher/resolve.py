@@ -0,0 +1,142 @@
+"""
+Cross-source entity resolution: collapse matches that describe the same concert.
+
+The same show is often listed by Ticketmaster NL (venue "Ticketmaster NL") and by
+the venue's own site. Matches are grouped by a blocking key (artist, date), so
+only events inside one block are ever compared; within a block two events are
+the same entity when their venues agree (after alias resolution, with the
+aggregator venue treated as unknown) and their titles are similar enough.
+One canonical event is kept per entity, carrying the other links in extra_urls.
+It keeps the venue its source listed: the venue is part of the dedupe key
+(matcher/dedupe.py), so aliases only decide what merges and never change the
+key of a concert that was already notified.
+"""
+import dataclasses
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+from models import Event, Source
+
+logger = logging.getLogger(__name__)
+
+# (artist_from_list, event)
+Match = Tuple[str, Event]
+
+# Venue spellings seen across sources (casefolded) -> canonical venue name
+VENUE_ALIASES: Dict[str, str] = {
+    "paradiso": "Paradiso",
+    "paradiso noord": "Paradiso",
+    "melkweg": "Melkweg",
+    "de melkweg": "Melkweg",
+    "afas live": "AFAS Live",
+    "heineken music hall": "AFAS Live",
+    "ziggo dome": "Ziggo Dome",
+    "johan cruijff arena": "Johan Cruijff ArenA",
+    "johan cruijff arena amsterdam": "Johan Cruijff ArenA",
+    "amsterdam arena": "Johan Cruijff ArenA",
+    "bitterzoet": "Bitterzoet",
+    "tolhuistuin": "Tolhuistuin",
+    "cinetol": "Cinetol",
+    "zonnehuis": "Zonnehuis",
+    "vondelkerk": "Vondelkerk",
+    "de duif": "De Duif",
+}
+# Longest alias first so "johan cruijff arena amsterdam" wins over "johan cruijff arena"
+_VENUE_IN_TEXT = re.compile(
+    r"\b(" + "|".join(re.escape(a) for a in sorted(VENUE_ALIASES, key=len, reverse=True)) + r")\b"
+)
+
+# Sources that list events for many venues under a placeholder venue name
+AGGREGATOR_SOURCES = {Source.TICKETMASTER}
+
+# Words that say nothing about which show a title describes
+_TITLE_STOPWORDS = {
+    "mo", "tu", "we", "th", "fr", "sa", "su", "ma", "di", "wo", "do", "vr", "za", "zo",
+    "jan", "feb", "mar", "mrt", "apr", "may", "mei", "jun", "jul", "aug", "sep", "oct", "okt", "nov", "dec",
+    "tickets", "ticket", "live", "amsterdam", "sold", "out", "uitverkocht", "the", "de", "het", "en", "and",
+}
+_TOKEN = re.compile(r"[^\W_]+")
+
+# Overlap coefficient |A∩B| / min(|A|, |B|) at or above which two titles are the same show
+TITLE_SIMILARITY = 0.5
+
+
+def _canonical_venue(event: Event) -> Optional[str]:
+    """Canonical venue name, or None when the source does not know the venue."""
+    if event.source in AGGREGATOR_SOURCES:
+        m = _VENUE_IN_TEXT.search((event.title or "").casefold())
+        return VENUE_ALIASES[m.group(1)] if m else None
+    venue = (event.venue or "").strip()
+    return VENUE_ALIASES.get(venue.casefold(), venue)
+
+
+def _title_tokens(title: str) -> frozenset:
+    return frozenset(
+        t for t in _TOKEN.findall(title or "")
+        if not t.isdigit() and t not in _TITLE_STOPWORDS
+    )
+
+
+def _similar(a: frozenset, b: frozenset) -> bool:
+    if not a or not b:
+        return False
+    return len(a & b) / min(len(a), len(b)) >= TITLE_SIMILARITY
+
+
+class _Entity:
+    __slots__ = ("venue", "tokens", "members")
+
+    def __init__(self, venue: Optional[str], tokens: frozenset, member: Event) -> None:
+        self.venue = venue
+        self.tokens = tokens
+        self.members = [member]
+
+    def accepts(self, venue: Optional[str], tokens: frozenset) -> bool:
+        if self.venue is not None and venue is not None:
+            return self.venue == venue
+        return _similar(self.tokens, tokens)
+
+
+def _canonical(entity: _Entity) -> Event:
+    # Prefer the venue's own listing over an aggregator's, then the first seen
+    members = sorted(entity.members, key=lambda e: e.source in AGGREGATOR_SOURCES)
+    best = members[0]
+    extra = tuple(dict.fromkeys(
+        u for e in members for u in (e.url, *e.extra_urls) if u and u != best.url
+    ))
+    if extra == best.extra_urls:
+        return best
+    return dataclasses.replace(best, extra_urls=extra)
+
+
+def resolve_matches(matches: List[Match]) -> List[Match]:
+    """
+    Collapse matches for the same (artist, concert) reported by several sources.
+    Order of first appearance is preserved. TBA dates never merge across venues.
+    """
+    blocks: Dict[Tuple[str, str], List[_Entity]] = {}
+    order: List[Tuple[str, _Entity]] = []
+    for artist, event in matches:
+        date_key = event.date_normalized or "TBA"
+        venue = _canonical_venue(event)
+        tokens = _title_tokens(event.title_normalized)
+        entities = blocks.setdefault((artist.casefold(), date_key), [])
+        for entity in entities:
+            if date_key == "TBA" and (venue is None or entity.venue != venue):
+                continue
+            if entity.accepts(venue, tokens):
+                entity.members.append(event)
+                if entity.venue is None:
+                    entity.venue = venue
+                break
+        else:
+            entity = _Entity(venue, tokens, event)
+            entities.append(entity)
+            order.append((artist, entity))
+
+    resolved = [(artist, _canonical(entity)) for artist, entity in order]
+    merged = len(matches) - len(resolved)
+    if merged:
+        logger.info("Entity resolution: merged %d duplicate matches into %d events", merged, len(resolved))
+    return resolved
@@ -1,10 +1,15 @@
 """
 Shared data models: Event and Source.
 """
-from dataclasses import dataclass
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from matcher.normalize import normalize
 
 
 class Source(str, Enum):
@@ -16,8 +21,45 @@ class Source(str, Enum):
     JOHAN_CRUIJFF_ARENA = "johancruijffarena"
 
 
-@dataclass
+# Human-readable names for messages (/sources, run progress)
+SOURCE_NAMES = {
+    Source.TICKETMASTER: "Ticketmaster NL",
+    Source.PARADISO: "Paradiso",
+    Source.MELKWEG: "Melkweg",
+    Source.AFAS_LIVE: "AFAS Live",
+    Source.ZIGGO_DOME: "Ziggo Dome",
+    Source.JOHAN_CRUIJFF_ARENA: "Johan Cruijff ArenA",
+}
+
+
+# Timestamp shared by every Event created inside event_batch(); see Event.__post_init__
+_batch_fetched_at: ContextVar[Optional[datetime]] = ContextVar("event_batch_fetched_at", default=None)
+
+
+@contextmanager
+def event_batch(fetched_at: Optional[datetime] = None) -> Iterator[datetime]:
+    """
+    Stamp all events created in this context (including asyncio tasks started
+    inside it) with one fetched_at, instead of calling utcnow() per event.
+    """
+    ts = fetched_at or datetime.utcnow()
+    token = _batch_fetched_at.set(ts)
+    try:
+        yield ts
+    finally:
+        _batch_fetched_at.reset(token)
+
+
+@dataclass(frozen=True, slots=True)
 class Event:
+    """
+    Immutable, slotted and hashable (usable as a dict/set key). Venue and date
+    strings are interned since a run holds thousands of events sharing a handful
+    of values. fetched_at does not take part in equality or hashing.
+    title_normalized (matcher/normalize.py) is computed once here, at ingest,
+    so matching compares pre-normalized strings. It is not an __init__ argument:
+    it always follows title, also for copies made with dataclasses.replace().
+    """
     source: Source
     title: str
     venue: str
@@ -25,8 +67,48 @@ class Event:
     date_normalized: str  # YYYY-MM-DD or TBA
     url: str
     status: Optional[str] = None
-    fetched_at: Optional[datetime] = None
+    fetched_at: Optional[datetime] = field(default=None, compare=False)
+    # Links to the same concert on other sources (set by matcher.resolve)
+    extra_urls: Tuple[str, ...] = ()
+    title_normalized: str = field(init=False, compare=False, repr=False)
 
     def __post_init__(self) -> None:
+        # Frozen dataclass: normalize fields through object.__setattr__
+        if not isinstance(self.source, Source):
+            object.__setattr__(self, "source", Source(self.source))
+        if self.venue:
+            object.__setattr__(self, "venue", sys.intern(self.venue))
+        if self.date_normalized:
+            object.__setattr__(self, "date_normalized", sys.intern(self.date_normalized))
         if self.fetched_at is None:
-            self.fetched_at = datetime.utcnow()
+            object.__setattr__(self, "fetched_at", _batch_fetched_at.get() or datetime.utcnow())
+        object.__setattr__(self, "title_normalized", normalize(self.title) if self.title else "")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form (used by the event cache)."""
+        return {
+            "source": self.source.value,
+            "title": self.title,
+            "venue": self.venue,
+            "date_raw": self.date_raw,
+            "date_normalized": self.date_normalized,
+            "url": self.url,
+            "status": self.status,
+            "fetched_at": self.fetched_at.isoformat() if self.fetched_at else None,
+            "extra_urls": list(self.extra_urls),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Event":
+        fetched_at = data.get("fetched_at")
+        return cls(
+            source=Source(data["source"]),
+            title=data["title"],
+            venue=data["venue"],
+            date_raw=data["date_raw"],
+            date_normalized=data["date_normalized"],
+            url=data["url"],
+            status=data.get("status"),
+            fetched_at=datetime.fromisoformat(fetched_at) if fetched_at else None,
+            extra_urls=tuple(data.get("extra_urls") or ()),
+        )
@@ -1,20 +1,44 @@
 """
-Single run: fetch artists → fetch all sources → match → dedupe → notify.
+Single run: fetch artists → fetch all sources → index → match → dedupe → notify.
+
+With SCRAPE_MODE=worker, trigger_run() and prewarm() queue a job for worker.py
+(storage/job_queue.py) and wait for its result instead of running here.
 """
 import asyncio
 import json
 import logging
+import os
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Callable, Awaitable, List, Optional
+from typing import Callable, Awaitable, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
-from models import Event, Source
+from models import Event, Source, event_batch
 from storage import settings
+from storage import runs as run_history
+from storage import event_cache
+from storage import events as event_store
+from storage import source_state
+from storage import users
+from storage import job_queue
+from storage import outbox
+from sources import governor
+from sources import retry
 from matcher.artists import fetch_artists, get_cached_artists
-from matcher.match import match_events_to_artists
+from matcher.match import match_for_users
 from matcher.dedupe import filter_new_matches
+from matcher.resolve import resolve_matches
 
 logger = logging.getLogger(__name__)
 
+# Telegram's message limit, counted in UTF-16 code units
+MESSAGE_LIMIT = 4096
+MESSAGE_SEPARATOR = "\n\n"
+
+SCRAPE_MODE_INLINE = "inline"
+SCRAPE_MODE_WORKER = "worker"
+JOB_POLL_SECONDS = 1.0  # how often a queued job's progress and status are read
+
 # Connectors registered here (filled when sources are loaded)
 _CONNECTORS: List[object] = []
 
@@ -23,129 +47,661 @@ def register_connector(connector: object) -> None:
     _CONNECTORS.append(connector)
 
 
+def registered_sources() -> List[str]:
+    """source_id of every registered connector."""
+    return [getattr(c, "source_id", "unknown") for c in _CONNECTORS]
+
+
+@dataclass
+class FetchResult:
+    """Events from one pass over all connectors, with per-source metrics and errors."""
+    events: List[Event] = field(default_factory=list)
+    metrics: List[Dict] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    cached_sources: List[str] = field(default_factory=list)
+
+
+# Called once per source as it finishes: dict with name, events_count, and either
+# duration_ms/error_count (scraped) or cached=True
+ProgressCallback = Callable[[Dict], None]
+
+# In-flight connector scrape shared by concurrent runs (see fetch_all_events);
+# _fetch_inflight_sources is the source subset it covers (None: all connectors)
+_fetch_inflight: Optional["asyncio.Task[FetchResult]"] = None
+_fetch_inflight_sources: Optional[FrozenSet[str]] = None
+_fetch_listeners: List[ProgressCallback] = []
+
+
+def _elapsed_ms(t0: float) -> int:
+    return int((time.perf_counter() - t0) * 1000)
+
+
+async def _finish(
+    *,
+    started_at: datetime,
+    t_run: float,
+    status: str,
+    summary: dict,
+    errors: List[str],
+    metrics: List[Dict],
+) -> None:
+    """Persist last-run settings (for /status) and append the run to the runs table."""
+    finished_at = datetime.utcnow()
+    total_ms = _elapsed_ms(t_run)
+    metrics.append({"scope": run_history.SCOPE_STAGE, "name": "total", "duration_ms": total_ms})
+    await settings.set_setting("last_run_at", finished_at.isoformat() + "Z")
+    await settings.set_setting("last_run_status", status)
+    await settings.set_setting("last_run_summary_json", json.dumps(summary))
+    try:
+        await run_history.record_run(
+            started_at=started_at.isoformat() + "Z",
+            finished_at=finished_at.isoformat() + "Z",
+            status=status,
+            events_scanned_total=summary.get("events_scanned_total", 0),
+            matches_total=summary.get("matches_total", 0),
+            notifications_queued=summary.get("notifications_queued", 0),
+            errors=errors,
+            duration_ms=total_ms,
+            metrics=metrics,
+        )
+    except Exception as e:
+        logger.warning("Failed to record run history: %s", e)
+
+
+def _report_progress(listeners: List[ProgressCallback], progress: Dict) -> None:
+    for callback in list(listeners):
+        try:
+            callback(progress)
+        except Exception as e:
+            logger.debug("Progress callback failed: %s", e)
+
+
+def _covers(have: Optional[FrozenSet[str]], want: Optional[FrozenSet[str]]) -> bool:
+    """True if a fetch of source subset `have` includes everything in `want` (None = all)."""
+    return have is None or (want is not None and want <= have)
+
+
+async def _fetch_all(
+    use_cache: bool,
+    listeners: List[ProgressCallback],
+    sources: Optional[FrozenSet[str]] = None,
+) -> FetchResult:
+    result = FetchResult()
+
+    async def fetch_one(c):
+        sid = getattr(c, "source_id", "unknown")
+        if use_cache:
+            cached = await event_cache.get(sid)
+            if cached is not None:
+                # Cache hits are not timed: run_metrics tracks scrape latency only
+                result.cached_sources.append(sid)
+                _report_progress(listeners, {"name": sid, "events_count": len(cached), "cached": True})
+                return cached
+        t_src = time.perf_counter()
+        error_count = 0
+        try:
+            evs = await c.fetch_events()
+        except Exception as e:
+            logger.warning("Connector %s failed: %s", sid, e)
+            # httpx appends a "For more information" line to status errors
+            result.errors.append(f"{sid}: {(str(e) or type(e).__name__).splitlines()[0]}")
+            evs = []
+            error_count = 1
+        metric = {
+            "scope": run_history.SCOPE_SOURCE,
+            "name": sid,
+            "duration_ms": _elapsed_ms(t_src),
+            "events_count": len(evs),
+            "error_count": error_count,
+        }
+        result.metrics.append(metric)
+        _report_progress(listeners, metric)
+        await event_cache.put(sid, evs)
+        # Failed scrapes too ([]): they set when the source is next due
+        try:
+            await source_state.record_fetch(sid, evs)
+        except Exception as e:
+            logger.warning("Recording source state for %s failed: %s", sid, e)
+        return evs
+
+    connectors = [c for c in _CONNECTORS if sources is None or getattr(c, "source_id", None) in sources]
+    with event_batch():
+        # Tasks created here inherit the batch context, so all events share one fetched_at
+        results = await asyncio.gather(*[fetch_one(c) for c in connectors])
+    for c, evs in zip(connectors, results):
+        result.events.extend(evs)
+        logger.info("Source %s: %d events", getattr(c, "source_id", "?"), len(evs))
+    if result.cached_sources:
+        logger.info("Served from event cache: %s", ", ".join(result.cached_sources))
+    return result
+
+
+def _fetch_in_flight() -> bool:
+    return _fetch_inflight is not None and not _fetch_inflight.done()
+
+
+def _only_sources(result: FetchResult, sources: FrozenSet[str]) -> FetchResult:
+    """The part of a wider fetch that concerns `sources`."""
+    return FetchResult(
+        events=[e for e in result.events if e.source.value in sources],
+        metrics=[m for m in result.metrics if m["name"] in sources],
+        errors=[err for err in result.errors if err.split(":", 1)[0] in sources],
+        cached_sources=[sid for sid in result.cached_sources if sid in sources],
+    )
+
+
+async def fetch_all_events(
+    *,
+    use_cache: bool = True,
+    on_progress: Optional[ProgressCallback] = None,
+    sources: Optional[Iterable[str]] = None,
+) -> FetchResult:
+    """
+    Fetch events from all registered connectors, or only those whose source_id
+    is in `sources`. Sources fetched within EVENT_CACHE_TTL_SECONDS are served
+    from the event cache unless use_cache=False. If a fetch covering the wanted
+    sources is already in flight (e.g. a dry run started while a real run is
+    scraping), join it instead of scraping the sites again. Callers must not
+    mutate the returned lists. on_progress is called as each source finishes.
+    """
+    global _fetch_inflight, _fetch_inflight_sources, _fetch_listeners
+    wanted = frozenset(sources) if sources is not None else None
+    if _fetch_in_flight() and _covers(_fetch_inflight_sources, wanted):
+        logger.info("Joining in-flight fetch")
+    elif _fetch_in_flight():
+        # The in-flight fetch covers other sources: scrape ours separately
+        return await _fetch_all(use_cache, [on_progress] if on_progress else [], wanted)
+    else:
+        _fetch_listeners = []
+        _fetch_inflight_sources = wanted
+        _fetch_inflight = asyncio.create_task(_fetch_all(use_cache, _fetch_listeners, wanted))
+    if on_progress is not None:
+        _fetch_listeners.append(on_progress)
+    task, covered = _fetch_inflight, _fetch_inflight_sources
+    result = await asyncio.shield(task)
+    if wanted is not None and covered != wanted:
+        return _only_sources(result, wanted)
+    return result
+
+
+def cancel_fetch() -> bool:
+    """Cancel the in-flight connector fetch (in-flight HTTP requests are aborted)."""
+    if not _fetch_in_flight():
+        return False
+    _fetch_inflight.cancel()
+    return True
+
+
 async def run(
     send_message: Callable[[str], Awaitable[None]],
     *,
     dry_run: bool = False,
+    use_cache: bool = True,
+    artists_override: Optional[List[str]] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    sources: Optional[Iterable[str]] = None,
 ) -> dict:
     """
-    Execute one full run. send_message(text) is called for each notification (or for digest).
-    Returns dict: status, events_scanned_total, matches_total, notifications_sent, errors_json, artists_fetch_error.
+    Execute one run over all sources, or only `sources` (source ids). New matches are queued in the outbox for delivery,
+    and so are warnings about the owner's artists list (to the owner's chat, whoever triggered the run);
+    the run itself sends nothing through send_message(text).
+    use_cache=False forces a fresh scrape of every source (bypasses the event cache).
+    artists_override skips the artists list URL (e.g. a local file from the CLI) and
+    runs for the owner only; otherwise every user with a list (storage/users.py) is
+    matched against the same scrape.
+    on_progress(dict) is called as each source finishes fetching.
+    Returns dict: status, events_scanned_total, matches_total, notifications_queued, errors_json,
+    artists_fetch_error, stage_ms, source_metrics, cached_sources, http_attempts, notifications (message texts).
+    Outbound requests share the HTTP governor (sources/governor.py); past RUN_DEADLINE_SECONDS
+    detail requests are shed and the run completes with what it has (partial_failure).
+    Every request attempt (sources/retry.py) is listed in http_attempts and the run summary.
     """
+    with governor.run_budget(governor.get_run_deadline()) as budget, retry.attempt_log() as attempts:
+        return await _run(
+            budget=budget,
+            attempts=attempts,
+            dry_run=dry_run,
+            use_cache=use_cache,
+            artists_override=artists_override,
+            on_progress=on_progress,
+            sources=sources,
+        )
+
+
+async def _run(
+    *,
+    budget: governor.RunBudget,
+    attempts: List[Dict],
+    dry_run: bool,
+    use_cache: bool,
+    artists_override: Optional[List[str]],
+    on_progress: Optional[ProgressCallback],
+    sources: Optional[Iterable[str]],
+) -> dict:
     started_at = datetime.utcnow()
+    t_run = time.perf_counter()
     errors: List[str] = []
     events_all: List[Event] = []
-    artists: List[str] = []
+    # user_id -> artists; chat_ids: user_id -> chat for their notifications
+    lists: Dict[int, List[str]] = {}
+    chat_ids: Dict[int, int] = {}
     artists_fetch_error: Optional[str] = None
+    # Rows for the run_metrics table; stage_ms mirrors the stage rows for callers
+    metrics: List[Dict] = []
+    stage_ms: Dict[str, int] = {}
 
-    # 1) Artists list
-    url = await settings.get_setting("artists_list_url")
-    if not url or not url.strip():
-        await settings.set_setting("last_run_at", started_at.isoformat() + "Z")
-        await settings.set_setting("last_run_status", "failure")
-        await settings.set_setting("last_run_summary_json", json.dumps({"error": "artists_list_url not set"}))
+    def stage_done(name: str, t0: float) -> None:
+        stage_ms[name] = _elapsed_ms(t0)
+        metrics.append({"scope": run_history.SCOPE_STAGE, "name": name, "duration_ms": stage_ms[name]})
+
+    async def fail(error: str) -> dict:
+        await _finish(
+            started_at=started_at,
+            t_run=t_run,
+            status="failure",
+            summary={"error": error},
+            errors=[error],
+            metrics=metrics,
+        )
         return {
             "status": "failure",
             "events_scanned_total": 0,
             "matches_total": 0,
-            "notifications_sent": 0,
-            "errors_json": json.dumps(["artists_list_url not set"]),
-            "artists_fetch_error": "artists_list_url not set",
+            "notifications_queued": 0,
+            "errors_json": json.dumps([error]),
+            "artists_fetch_error": error,
+            "stage_ms": stage_ms,
+            "notifications": [],
         }
-    artists, fetch_err = await fetch_artists(url)
-    if fetch_err:
-        artists_fetch_error = fetch_err
-        artists = await get_cached_artists()
-        if artists:
-            try:
-                await send_message("Artists list URL could not be fetched; using cached list. Error: " + fetch_err)
-            except Exception:
-                pass
+
+    try:
+        # 1) Artists lists, one per user; users sharing a URL share one download
+        t0 = time.perf_counter()
+        stage = "artists"
+        if artists_override is not None:
+            lists[users.OWNER] = list(artists_override)
         else:
-            await settings.set_setting("last_run_at", started_at.isoformat() + "Z")
-            await settings.set_setting("last_run_status", "failure")
-            await settings.set_setting("last_run_summary_json", json.dumps({"error": fetch_err}))
-            return {
-                "status": "failure",
-                "events_scanned_total": 0,
-                "matches_total": 0,
-                "notifications_sent": 0,
-                "errors_json": json.dumps([fetch_err]),
-                "artists_fetch_error": fetch_err,
-            }
-
-    # 2) Fetch events from all connectors
-    async def fetch_one(c):
+            recipients = await users.recipients()
+            if not recipients:
+                return await fail("artists_list_url not set")
+            by_url: Dict[str, List[users.Recipient]] = {}
+            for r in recipients:
+                by_url.setdefault(r.artists_url, []).append(r)
+                chat_ids[r.user_id] = r.chat_id
+            for url, group in by_url.items():
+                first = group[0].user_id
+                artists, fetch_err = await fetch_artists(
+                    url, max_age=event_cache.get_ttl_seconds() if use_cache else 0, user_id=first
+                )
+                if fetch_err:
+                    artists = await get_cached_artists(first)
+                    owner_affected = any(r.user_id == users.OWNER for r in group)
+                    if owner_affected:
+                        artists_fetch_error = fetch_err
+                    if not artists:
+                        errors.append(f"artists list {url}: {fetch_err}")
+                        continue
+                    if owner_affected:
+                        try:
+                            await outbox.queue_message(
+                                "Artists list URL could not be fetched; using cached list. Error: " + fetch_err
+                            )
+                        except Exception as e:
+                            logger.warning("Queueing the artists list warning failed: %s", e)
+                for r in group:
+                    lists[r.user_id] = artists
+            if not lists:
+                stage_done("artists", t0)
+                return await fail(artists_fetch_error or errors[0])
+        stage_done("artists", t0)
+
+        # 2) Fetch events from all connectors (shared with any concurrent run)
+        t0 = time.perf_counter()
+        stage = "fetch"
+        fetched = await fetch_all_events(use_cache=use_cache, on_progress=on_progress, sources=sources)
+        events_all.extend(fetched.events)
+        metrics.extend(fetched.metrics)
+        errors.extend(fetched.errors)
+        if budget.shed:
+            errors.append(f"run deadline: {budget.shed} detail request(s) skipped")
+        stage_done("fetch", t0)
+
+        events_scanned_total = len(events_all)
+        logger.info(
+            "Fetched %d events total; %d artists lists to match",
+            events_scanned_total,
+            len(lists),
+        )
+
+        # 2b) Keep every fetched event searchable (/search); cached sources were
+        # indexed when they were scraped (by the run or pre-warm that fetched them)
+        t0 = time.perf_counter()
+        stage = "index"
+        cached = set(fetched.cached_sources)
         try:
-            return await c.fetch_events()
+            await event_store.upsert_events(e for e in events_all if e.source.value not in cached)
         except Exception as e:
-            logger.warning("Connector %s failed: %s", getattr(c, "source_id", c), e)
-            errors.append(f"{getattr(c, 'source_id', 'unknown')}: {e}")
-            return []
-
-    results = await asyncio.gather(*[fetch_one(c) for c in _CONNECTORS])
-    for c, evs in zip(_CONNECTORS, results):
-        events_all.extend(evs)
-        sid = getattr(c, "source_id", "?")
-        logger.info("Source %s: %d events", sid, len(evs))
-
-    events_scanned_total = len(events_all)
-    logger.info(
-        "Fetched %d events total; %d artists to match",
-        events_scanned_total,
-        len(artists),
-    )
+            logger.warning("Indexing events failed: %s", e)
+        stage_done("index", t0)
 
-    # 3) Match
-    matches = match_events_to_artists(events_all, artists)
-    matches_total = len(matches)
-    logger.info("Match result: %d matches (before dedupe)", matches_total)
-
-    # 4) Dedupe (skip_insert when dry_run so we don't record)
-    to_notify = await filter_new_matches(matches, skip_insert=dry_run)
-
-    # 5) Notify (digest summary if many matches)
-    DIGEST_THRESHOLD = 10
-    notifications_sent = 0
-    if not dry_run:
-        if len(to_notify) > DIGEST_THRESHOLD:
-            try:
-                await send_message(f"You have {len(to_notify)} new matches. Sending details below.")
-            except Exception as e:
-                logger.warning("Failed to send digest summary: %s", e)
-        for artist, event in to_notify:
-            msg = _format_notification(artist, event)
-            try:
-                await send_message(msg)
-                notifications_sent += 1
-            except Exception as e:
-                logger.warning("Failed to send notification: %s", e)
-                errors.append(f"send: {e}")
+        # 3) Match
+        t0 = time.perf_counter()
+        stage = "match"
+        matches_by_user = await match_for_users(events_all, lists)
+        stage_done("match", t0)
+
+        # 3b) Collapse the same concert listed by several sources into one event
+        t0 = time.perf_counter()
+        stage = "resolve"
+        matches_by_user = {uid: resolve_matches(m) for uid, m in matches_by_user.items()}
+        matches_total = sum(len(m) for m in matches_by_user.values())
+        logger.info("Match result: %d matches (before dedupe)", matches_total)
+        stage_done("resolve", t0)
+
+        # 4) Dedupe and queue notifications in the outbox, in one transaction
+        # (skip_insert when dry_run so we don't record). Delivery happens in the
+        # background outbox sender, so the run does not wait on Telegram.
+        t0 = time.perf_counter()
+        stage = "dedupe"
+        new_by_user = await filter_new_matches(
+            matches_by_user,
+            skip_insert=dry_run,
+            notification_text=None if dry_run else _format_notification,
+            chat_ids=chat_ids,
+        )
+        to_notify = [m for uid in new_by_user for m in new_by_user[uid]]
+        notifications_queued = 0 if dry_run else len(to_notify)
+        stage_done("dedupe", t0)
+    except asyncio.CancelledError:
+        # Cancelled (/cancel, shutdown) in any stage: record the run as cancelled
+        if stage not in stage_ms:
+            stage_done(stage, t0)
+        await _finish(
+            started_at=started_at,
+            t_run=t_run,
+            status="cancelled",
+            summary={"error": "cancelled", "stage": stage},
+            errors=["cancelled"],
+            metrics=metrics,
+        )
+        raise
 
-    finished_at = datetime.utcnow()
     status = "partial_failure" if errors else "success"
 
-    # 6) Persist run summary
+    # 6) Persist run summary and history
     summary = {
         "events_scanned_total": events_scanned_total,
         "matches_total": matches_total,
-        "notifications_sent": notifications_sent,
+        "notifications_queued": notifications_queued,
         "errors": errors,
+        "stage_ms": stage_ms,
+        "cached_sources": fetched.cached_sources,
     }
-    await settings.set_setting("last_run_at", finished_at.isoformat() + "Z")
-    await settings.set_setting("last_run_status", status)
-    await settings.set_setting("last_run_summary_json", json.dumps(summary))
+    if budget.shed:
+        summary["requests_shed"] = budget.shed
+    # url, attempt number, ms, outcome (status code or error), hedged
+    summary["http_attempts"] = attempts
+    if sources is not None:
+        summary["sources"] = sorted(sources)
+    await _finish(
+        started_at=started_at,
+        t_run=t_run,
+        status=status,
+        summary=summary,
+        errors=errors,
+        metrics=metrics,
+    )
 
     return {
         "status": status,
         "events_scanned_total": events_scanned_total,
         "matches_total": matches_total,
-        "notifications_sent": notifications_sent,
+        "notifications_queued": notifications_queued,
         "errors_json": json.dumps(errors),
         "artists_fetch_error": artists_fetch_error,
+        "stage_ms": stage_ms,
+        "source_metrics": fetched.metrics,
+        "cached_sources": fetched.cached_sources,
+        "http_attempts": attempts,
+        "notifications": [_format_notification(artist, event) for artist, event in to_notify],
     }
 
 
+def get_scrape_mode() -> str:
+    """SCRAPE_MODE: 'inline' (default) runs the pipeline in this process; 'worker' hands it to worker.py."""
+    mode = os.environ.get("SCRAPE_MODE", "").strip().lower() or SCRAPE_MODE_INLINE
+    if mode not in (SCRAPE_MODE_INLINE, SCRAPE_MODE_WORKER):
+        logger.warning("Invalid SCRAPE_MODE=%r; using %s", mode, SCRAPE_MODE_INLINE)
+        return SCRAPE_MODE_INLINE
+    return mode
+
+
+async def prewarm() -> dict:
+    """Pre-warm here, or on a worker in SCRAPE_MODE=worker (see _prewarm)."""
+    if get_scrape_mode() == SCRAPE_MODE_WORKER:
+        return await _run_queued(job_queue.KIND_PREWARM, {}, None)
+    return await _prewarm()
+
+
+async def _prewarm() -> dict:
+    """
+    Do a scheduled run's slow parts ahead of time: download the artists list and
+    scrape every source into the event cache over the pooled client (resolving
+    DNS and opening connections on the way). A run within EVENT_CACHE_TTL_SECONDS
+    then only matches, dedupes and queues. Returns events and errors counts.
+    """
+    first_by_url: Dict[str, int] = {}
+    for r in await users.recipients():
+        first_by_url.setdefault(r.artists_url, r.user_id)
+    for url, user_id in first_by_url.items():
+        _, err = await fetch_artists(url, user_id=user_id)
+        if err:
+            logger.warning("Pre-warm: artists list %s fetch failed: %s", url, err)
+    fetched = await fetch_all_events(use_cache=False)
+    # The run that follows serves these sources from the cache and skips indexing
+    # them (see run()), so index the scrape here
+    try:
+        await event_store.upsert_events(fetched.events)
+    except Exception as e:
+        logger.warning("Pre-warm: indexing events failed: %s", e)
+    logger.info("Pre-warm: %d events cached, %d source errors", len(fetched.events), len(fetched.errors))
+    return {"events": len(fetched.events), "errors": len(fetched.errors)}
+
+
+class RunCoordinator:
+    """
+    Single-flight gate in front of run(): at most one real run and one dry run
+    are live at a time. A trigger that arrives while a real run is in flight
+    attaches to that run's result instead of starting another scrape (a dry run
+    would only report a subset of what the real run does anyway). A real run
+    started during a dry run still executes, but joins the dry run's fetch via
+    fetch_all_events(), so the sites are scraped once and notification_history
+    only ever has one writer.
+    """
+
+    def __init__(self) -> None:
+        self._real: Optional[asyncio.Task] = None
+        self._dry: Optional[asyncio.Task] = None
+        # Source subsets the live runs cover (None: all sources)
+        self._real_sources: Optional[FrozenSet[str]] = None
+        self._dry_sources: Optional[FrozenSet[str]] = None
+
+    @staticmethod
+    def _live(task: Optional[asyncio.Task]) -> bool:
+        return task is not None and not task.done()
+
+    def is_running(self) -> bool:
+        return self._live(self._real) or self._live(self._dry)
+
+    def cancel(self) -> bool:
+        """Cancel live runs and their fetch. Returns False if nothing was running."""
+        cancelled = False
+        for task in (self._real, self._dry):
+            if self._live(task):
+                task.cancel()
+                cancelled = True
+        # The fetch runs in its own task (shared between runs), so cancel it explicitly
+        return cancel_fetch() or cancelled
+
+    async def _attach(self, task: asyncio.Task, on_progress: Optional[ProgressCallback]) -> dict:
+        if on_progress is not None and _fetch_in_flight():
+            _fetch_listeners.append(on_progress)
+        result = await asyncio.shield(task)
+        return {**result, "coalesced": True}
+
+    async def trigger(
+        self,
+        send_message: Callable[[str], Awaitable[None]],
+        *,
+        dry_run: bool = False,
+        use_cache: bool = True,
+        on_progress: Optional[ProgressCallback] = None,
+        sources: Optional[Iterable[str]] = None,
+    ) -> dict:
+        """
+        Run the pipeline, or wait for the equivalent run already in flight. A
+        live run over fewer sources than requested is not joined: a real run
+        waits for it to finish, so history still has one writer at a time.
+        """
+        wanted = frozenset(sources) if sources is not None else None
+        while self._live(self._real):
+            if _covers(self._real_sources, wanted):
+                logger.info("Run already in progress; attaching (dry_run=%s)", dry_run)
+                return await self._attach(self._real, on_progress)
+            if dry_run:
+                break
+            logger.info("Run over other sources in progress; waiting for it")
+            await asyncio.wait({self._real})
+        if dry_run:
+            if self._live(self._dry) and _covers(self._dry_sources, wanted):
+                logger.info("Dry run already in progress; attaching")
+                return await self._attach(self._dry, on_progress)
+            self._dry_sources = wanted
+            self._dry = asyncio.create_task(
+                run(send_message, dry_run=True, use_cache=use_cache, on_progress=on_progress, sources=wanted)
+            )
+            return await asyncio.shield(self._dry)
+        self._real_sources = wanted
+        self._real = asyncio.create_task(
+            run(send_message, use_cache=use_cache, on_progress=on_progress, sources=wanted)
+        )
+        return await asyncio.shield(self._real)
+
+
+coordinator = RunCoordinator()
+
+
+async def trigger_run(
+    send_message: Callable[[str], Awaitable[None]],
+    *,
+    dry_run: bool = False,
+    use_cache: bool = True,
+    on_progress: Optional[ProgressCallback] = None,
+    sources: Optional[Iterable[str]] = None,
+) -> dict:
+    """
+    Entry point for bot commands and the scheduler: run() behind the coordinator,
+    or a job for worker.py in SCRAPE_MODE=worker.
+    """
+    if get_scrape_mode() == SCRAPE_MODE_WORKER:
+        payload = {
+            "dry_run": dry_run,
+            "use_cache": use_cache,
+            "sources": sorted(sources) if sources is not None else None,
+        }
+        return await _run_queued(job_queue.KIND_RUN, payload, on_progress)
+    return await coordinator.trigger(
+        send_message, dry_run=dry_run, use_cache=use_cache, on_progress=on_progress, sources=sources
+    )
+
+
+async def run_in_progress() -> bool:
+    """True while a run is live in this process or queued/running on a worker."""
+    if get_scrape_mode() == SCRAPE_MODE_WORKER:
+        return await job_queue.has_active(job_queue.KIND_RUN)
+    return coordinator.is_running()
+
+
+async def cancel_runs() -> bool:
+    """Cancel live runs (here, or on workers). Returns False if nothing was running."""
+    if get_scrape_mode() == SCRAPE_MODE_WORKER:
+        return await job_queue.cancel_active(job_queue.KIND_RUN) > 0
+    return coordinator.cancel()
+
+
+async def execute_job(
+    kind: str,
+    payload: Dict,
+    send_message: Callable[[str], Awaitable[None]],
+    on_progress: Optional[ProgressCallback] = None,
+) -> dict:
+    """Run a queued job in this process (worker.py side of _run_queued)."""
+    if kind == job_queue.KIND_PREWARM:
+        return await _prewarm()
+    if kind == job_queue.KIND_RUN:
+        return await coordinator.trigger(
+            send_message,
+            dry_run=bool(payload.get("dry_run")),
+            use_cache=payload.get("use_cache", True),
+            on_progress=on_progress,
+            sources=payload.get("sources"),
+        )
+    raise ValueError(f"Unknown job kind: {kind}")
+
+
+async def _run_queued(kind: str, payload: Dict, on_progress: Optional[ProgressCallback]) -> dict:
+    """Queue a job for worker.py and wait for it, replaying its progress to on_progress."""
+    job_id, reused = await job_queue.enqueue(kind, payload)
+    if reused:
+        logger.info("Identical %s job %d already queued; waiting for it", kind, job_id)
+    seen = 0
+    while True:
+        job = await job_queue.get(job_id)
+        if job is None:
+            raise RuntimeError(f"Job {job_id} disappeared from the queue")
+        if on_progress is not None:
+            for p in job.progress[seen:]:
+                on_progress(p)
+            seen = max(seen, len(job.progress))
+        if job.status == job_queue.STATUS_DONE:
+            result = job.result or {}
+            return {**result, "coalesced": True} if reused else result
+        if job.status == job_queue.STATUS_FAILED:
+            raise RuntimeError(job.last_error or f"Job {job_id} failed")
+        if job.status == job_queue.STATUS_CANCELLED:
+            raise asyncio.CancelledError()
+        await asyncio.sleep(JOB_POLL_SECONDS)
+
+
+def _utf16_len(text: str) -> int:
+    return len(text.encode("utf-16-le")) // 2
+
+
+def pack_messages(texts: List[str], limit: int = MESSAGE_LIMIT) -> List[Tuple[str, int]]:
+    """
+    Join consecutive texts with a blank line into as few messages as fit in
+    `limit`. Returns (message, number_of_texts_in_it); order is preserved and a
+    single oversized text is truncated rather than dropped.
+    """
+    packed: List[Tuple[str, int]] = []
+    current: List[str] = []
+    current_len = 0
+    sep_len = _utf16_len(MESSAGE_SEPARATOR)
+    for text in texts:
+        n = _utf16_len(text)
+        if n > limit:
+            text = text.encode("utf-16-le")[: (limit - 1) * 2].decode("utf-16-le", errors="ignore") + "…"
+            n = _utf16_len(text)
+        if current and current_len + sep_len + n > limit:
+            packed.append((MESSAGE_SEPARATOR.join(current), len(current)))
+            current, current_len = [], 0
+        current_len += (sep_len if current else 0) + n
+        current.append(text)
+    if current:
+        packed.append((MESSAGE_SEPARATOR.join(current), len(current)))
+    return packed
+
+
 def _format_notification(artist: str, event: Event) -> str:
     source_name = event.source.value if isinstance(event.source, Source) else str(event.source)
     date_display = event.date_normalized if event.date_normalized != "TBA" else "TBA"
@@ -158,6 +714,8 @@ def _format_notification(artist: str, event: Event) -> str:
         f"**Event:** {esc(event.title)}\n"
         f"**Venue:** {esc(event.venue)}\n"
         f"**Date:** {date_display}\n"
-        f"**Source:** {source_name}\n"
+        + (f"**Status:** {event.status}\n" if event.status else "")
+        + f"**Source:** {source_name}\n"
         f"Link: {event.url}"
+        + "".join(f"\nAlso: {u}" for u in event.extra_urls)
     )
@@ -0,0 +1,102 @@
+"""
+Adaptive per-source polling between the daily runs.
+
+Each source's change rate (storage/source_state.py) decides how often it is
+re-scraped: a daily budget of CADENCE_FETCHES_PER_DAY source fetches is split
+in proportion to the square root of each rate, which minimizes the expected
+delay before a change is noticed for a fixed number of fetches. Intervals are
+clamped between MIN_INTERVAL and MAX_INTERVAL. A tick every TICK_SECONDS runs
+the pipeline for the sources that are due (match, dedupe and outbox as usual).
+"""
+import logging
+import math
+import os
+import time
+from typing import Dict, Iterable, List, Optional
+
+from pipeline import registered_sources, run_in_progress, trigger_run
+from storage import source_state
+from storage import users
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FETCHES_PER_DAY = 48  # 0 disables adaptive polling (daily run only)
+MIN_INTERVAL = 15 * 60
+MAX_INTERVAL = 24 * 3600
+TICK_SECONDS = 60
+DAY = 86400.0
+
+
+def get_fetch_budget() -> int:
+    """CADENCE_FETCHES_PER_DAY: adaptive source fetches per day across all sources (the daily run comes on top)."""
+    raw = os.environ.get("CADENCE_FETCHES_PER_DAY", "").strip()
+    if not raw:
+        return DEFAULT_FETCHES_PER_DAY
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        logger.warning("Invalid CADENCE_FETCHES_PER_DAY=%r; using %d", raw, DEFAULT_FETCHES_PER_DAY)
+        return DEFAULT_FETCHES_PER_DAY
+
+
+def plan_intervals(rates: Dict[str, float], fetches_per_day: float) -> Dict[str, float]:
+    """
+    Polling interval (seconds) per source given change rates (changes/second)
+    and a total budget of fetches per day. Every source gets at least one
+    fetch per MAX_INTERVAL; the rest of the budget follows sqrt(rate).
+    """
+    if not rates:
+        return {}
+    min_freq, max_freq = DAY / MAX_INTERVAL, DAY / MIN_INTERVAL
+    weights = {sid: math.sqrt(max(rate, 0.0)) for sid, rate in rates.items()}
+    total_weight = sum(weights.values()) or 1.0
+    freqs = {
+        sid: min(max_freq, max(min_freq, fetches_per_day * w / total_weight))
+        for sid, w in weights.items()
+    }
+    # Raising slow sources to the floor may overshoot the budget: take it back
+    # from the sources above the floor
+    over = sum(freqs.values()) - fetches_per_day
+    above = {sid: f - min_freq for sid, f in freqs.items() if f > min_freq}
+    if over > 0 and above:
+        share = min(1.0, over / sum(above.values()))
+        for sid, extra in above.items():
+            freqs[sid] -= extra * share
+    return {sid: DAY / f for sid, f in freqs.items()}
+
+
+async def due_sources(source_ids: Iterable[str], *, now: Optional[float] = None) -> List[str]:
+    """Sources whose planned interval has elapsed since their last fetch (or never fetched)."""
+    now = time.time() if now is None else now
+    source_ids = list(source_ids)
+    states = await source_state.load_all()
+    # Sources never scraped yet are treated like the prior (about one change a day)
+    rates = {
+        sid: states[sid].change_rate if sid in states
+        else source_state.PRIOR_CHANGES / source_state.PRIOR_OBSERVED
+        for sid in source_ids
+    }
+    intervals = plan_intervals(rates, get_fetch_budget())
+    return [
+        sid for sid in source_ids
+        if sid not in states or now - states[sid].last_checked_at >= intervals[sid]
+    ]
+
+
+async def tick(send_message) -> None:
+    """Scheduler job: poll the sources that are due, unless a run is already going."""
+    if get_fetch_budget() == 0 or await run_in_progress():
+        return
+    # Without a list to match there is nothing to poll for (and a run would only
+    # record a failure every tick)
+    if not await users.recipients():
+        return
+    due = await due_sources(registered_sources())
+    if not due:
+        return
+    logger.info("Adaptive poll: %s", ", ".join(due))
+    try:
+        result = await trigger_run(send_message, use_cache=False, sources=due)
+        logger.info("Adaptive poll finished: status=%s", result.get("status", "?"))
+    except Exception as e:
+        logger.exception("Adaptive poll failed: %s", e)
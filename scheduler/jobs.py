@@ -1,28 +1,51 @@
 """
-Daily scheduled run at configured time (Europe/Amsterdam).
-Optional catch-up: run immediately on startup if last run was missed by > 6 hours.
+Daily scheduled run at configured time (Europe/Amsterdam), on one process-wide
+scheduler whose jobs are updated in place when settings change (reschedule()).
+Optional catch-up: run immediately if the last run was missed by > 6 hours.
+Database maintenance (storage/maintenance.py) runs daily at MAINTENANCE_TIME.
+Between daily runs, scheduler/cadence.py re-polls sources by their change rate.
+PREWARM_LEAD_MINUTES before the daily slot, sources are scraped into the event
+cache (pipeline.prewarm) so the run at the slot only matches, dedupes and sends.
 """
 import asyncio
 import logging
-from datetime import datetime, timedelta
+import os
+from datetime import datetime
+from typing import Optional, Tuple
 from zoneinfo import ZoneInfo
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
+from bot.sender import get_sender
+from scheduler import cadence
 from storage import settings
-from pipeline import run as pipeline_run
+from storage.maintenance import run_maintenance
+from pipeline import prewarm, trigger_run
+from storage import event_cache
 
 logger = logging.getLogger(__name__)
 
 CATCH_UP_HOURS = 6
 AMSTERDAM = ZoneInfo("Europe/Amsterdam")
+MAINTENANCE_TIME = (4, 30)  # quiet hour, well away from the default 09:00 check
+DEFAULT_PREWARM_LEAD_MINUTES = 5
+
+JOB_DAILY_RUN = "daily_run"
+JOB_PREWARM = "prewarm"
+JOB_CADENCE = "cadence"
+JOB_MAINTENANCE = "maintenance"
+
+_scheduler: Optional[AsyncIOScheduler] = None
+_bot = None
+_catch_up_task: Optional[asyncio.Task] = None
 
 
 async def _do_run(send_message) -> None:
     """Execute pipeline and send notifications."""
     try:
-        result = await pipeline_run(send_message)
+        result = await trigger_run(send_message)
         status = result.get("status", "?")
         logger.info("Scheduled run finished: status=%s", status)
     except Exception as e:
@@ -33,28 +56,41 @@ async def _do_run(send_message) -> None:
             pass
 
 
-def _get_send_message(bot, chat_id: int):
-    async def send(text: str) -> None:
-        await bot.send_message(chat_id=chat_id, text=text, parse_mode="Markdown")
-    return send
+async def _do_maintenance() -> None:
+    try:
+        await run_maintenance()
+    except Exception as e:
+        logger.exception("Database maintenance failed: %s", e)
 
 
-async def schedule_daily_run(application) -> None:
-    """
-    Schedule daily run at user-configured time (Europe/Amsterdam).
-    Requires application.bot and notification_chat_id in settings.
-    """
-    chat_id_raw = await settings.get_setting("notification_chat_id")
-    if not chat_id_raw:
-        logger.warning("No notification_chat_id set; scheduler not started")
-        return
+async def _do_prewarm() -> None:
     try:
-        chat_id = int(chat_id_raw)
+        await prewarm()
+    except Exception as e:
+        logger.exception("Pre-warm failed: %s", e)
+
+
+def get_prewarm_lead_minutes() -> int:
+    """PREWARM_LEAD_MINUTES (0 disables), capped so pre-warmed results are still cached at the slot."""
+    raw = os.environ.get("PREWARM_LEAD_MINUTES", "").strip()
+    try:
+        lead = max(0, int(raw)) if raw else DEFAULT_PREWARM_LEAD_MINUTES
     except ValueError:
-        logger.warning("Invalid notification_chat_id; scheduler not started")
-        return
+        logger.warning("Invalid PREWARM_LEAD_MINUTES=%r; using %d", raw, DEFAULT_PREWARM_LEAD_MINUTES)
+        lead = DEFAULT_PREWARM_LEAD_MINUTES
+    # Leave a minute for the scrape itself to finish inside the cache TTL
+    max_lead = max(0, int(event_cache.get_ttl_seconds() // 60) - 1)
+    if lead > max_lead:
+        logger.warning("PREWARM_LEAD_MINUTES=%d exceeds the event cache TTL; using %d", lead, max_lead)
+        lead = max_lead
+    return lead
+
 
-    time_str = await settings.get_setting_or_default("check_time_local") or "09:00"
+def _get_send_message(bot, chat_id: int):
+    return get_sender(bot, chat_id).send
+
+
+def _parse_check_time(time_str: str) -> Tuple[int, int]:
     parts = time_str.strip().split(":")
     hour, minute = 9, 0
     if len(parts) >= 2:
@@ -64,27 +100,105 @@ async def schedule_daily_run(application) -> None:
             pass
     elif len(parts) == 1 and parts[0].isdigit():
         hour = int(parts[0])
+    return hour, minute
 
-    scheduler = AsyncIOScheduler(timezone=AMSTERDAM)
-    send_message = _get_send_message(application.bot, chat_id)
 
-    async def job():
-        await _do_run(send_message)
+def get_scheduler() -> AsyncIOScheduler:
+    """The process-wide scheduler (created on first use, started by schedule_daily_run)."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = AsyncIOScheduler(timezone=AMSTERDAM)
+    return _scheduler
 
-    scheduler.add_job(job, CronTrigger(hour=hour, minute=minute))
-    scheduler.start()
-    logger.info("Scheduler started: daily at %02d:%02d Europe/Amsterdam", hour, minute)
 
-    # Catch-up: if last run was more than CATCH_UP_HOURS ago, run once now
+async def schedule_daily_run(application) -> None:
+    """
+    Start the scheduler (once) and schedule the daily run at the user-configured
+    time (Europe/Amsterdam). Safe to call again; see reschedule().
+    """
+    global _bot
+    _bot = application.bot
+    scheduler = get_scheduler()
+    scheduler.add_job(
+        _do_maintenance,
+        CronTrigger(hour=MAINTENANCE_TIME[0], minute=MAINTENANCE_TIME[1]),
+        id=JOB_MAINTENANCE,
+        replace_existing=True,
+    )
+    if not scheduler.running:
+        scheduler.start()
+    await reschedule()
+
+
+async def reschedule() -> None:
+    """
+    Re-read notification_chat_id and check_time_local and update the run jobs
+    in place, then re-evaluate catch-up. Called at startup and whenever those
+    settings change (/start, /set_time, onboarding); jobs keep fixed ids, so
+    repeated calls never duplicate them.
+    """
+    scheduler = get_scheduler()
+    if _bot is None or not scheduler.running:
+        return  # not started yet (e.g. headless); schedule_daily_run applies settings at startup
+
+    chat_id_raw = await settings.get_setting("notification_chat_id")
+    try:
+        chat_id = int(chat_id_raw) if chat_id_raw else None
+    except ValueError:
+        logger.warning("Invalid notification_chat_id; daily run not scheduled")
+        chat_id = None
+    if chat_id is None:
+        for job_id in (JOB_DAILY_RUN, JOB_PREWARM, JOB_CADENCE):
+            if scheduler.get_job(job_id):
+                scheduler.remove_job(job_id)
+        logger.warning("No notification_chat_id set; daily run not scheduled")
+        return
+
+    hour, minute = _parse_check_time(await settings.get_setting_or_default("check_time_local") or "09:00")
+    send_message = _get_send_message(_bot, chat_id)
+    scheduler.add_job(
+        _do_run, CronTrigger(hour=hour, minute=minute), args=[send_message],
+        id=JOB_DAILY_RUN, replace_existing=True,
+    )
+    lead = get_prewarm_lead_minutes()
+    if lead:
+        at = (hour * 60 + minute - lead) % (24 * 60)
+        scheduler.add_job(
+            _do_prewarm, CronTrigger(hour=at // 60, minute=at % 60),
+            id=JOB_PREWARM, replace_existing=True,
+        )
+    elif scheduler.get_job(JOB_PREWARM):
+        scheduler.remove_job(JOB_PREWARM)
+    scheduler.add_job(
+        cadence.tick, IntervalTrigger(seconds=cadence.TICK_SECONDS), args=[send_message],
+        id=JOB_CADENCE, replace_existing=True, max_instances=1,
+    )
+    logger.info(
+        "Daily run scheduled at %02d:%02d Europe/Amsterdam (pre-warm %d min before)", hour, minute, lead
+    )
+    await _maybe_catch_up(send_message)
+
+
+async def _maybe_catch_up(send_message) -> None:
+    """If the last run was more than CATCH_UP_HOURS ago, run once now."""
+    global _catch_up_task
+    if _catch_up_task is not None and not _catch_up_task.done():
+        return
     last_at = await settings.get_setting("last_run_at")
-    if last_at:
-        try:
-            last_dt = datetime.fromisoformat(last_at.replace("Z", "+00:00"))
-            if last_dt.tzinfo is None:
-                last_dt = last_dt.replace(tzinfo=ZoneInfo("UTC"))
-            now = datetime.now(ZoneInfo("UTC"))
-            if (now - last_dt).total_seconds() > CATCH_UP_HOURS * 3600:
-                logger.info("Catch-up: running now (last run was > %sh ago)", CATCH_UP_HOURS)
-                asyncio.create_task(_do_run(send_message))
-        except Exception as e:
-            logger.debug("Catch-up check skipped: %s", e)
+    if not last_at:
+        return
+    try:
+        last_dt = datetime.fromisoformat(last_at.replace("Z", "+00:00"))
+        if last_dt.tzinfo is None:
+            last_dt = last_dt.replace(tzinfo=ZoneInfo("UTC"))
+        now = datetime.now(ZoneInfo("UTC"))
+        if (now - last_dt).total_seconds() > CATCH_UP_HOURS * 3600:
+            logger.info("Catch-up: running now (last run was > %sh ago)", CATCH_UP_HOURS)
+            _catch_up_task = asyncio.create_task(_do_run(send_message))
+    except Exception as e:
+        logger.debug("Catch-up check skipped: %s", e)
+
+
+def shutdown_scheduler() -> None:
+    if _scheduler is not None and _scheduler.running:
+        _scheduler.shutdown(wait=False)
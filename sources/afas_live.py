@@ -8,14 +8,15 @@ from urllib.parse import urljoin
 from bs4 import BeautifulSoup
 
 from models import Event, Source
-from sources.base import BaseConnector, fetch_with_retries, make_client, _rate_limit
+from sources.base import AnchorSplitter, BaseConnector, fetch_with_retries, shared_client, _rate_limit
 
 AGENDA_URL = "https://www.afaslive.nl/en/agenda"
 DEFAULT_VENUE = "AFAS Live"
 MONTHS = {"january": 1, "february": 2, "march": 3, "april": 4, "may": 5, "june": 6,
           "july": 7, "august": 8, "september": 9, "october": 10, "november": 11, "december": 12}
-# "Monday 16 February 2026" or "Friday 20 February 2026"
-DATE_PATTERN = re.compile(r"(\d{1,2})\s+(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{4})", re.IGNORECASE)
+# "Monday 16 February 2026" or "Friday 20 February 2026" (the weekday is optional)
+DATE_PATTERN = re.compile(r"(?:(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),?\s+)?(\d{1,2})\s+(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{4})", re.IGNORECASE)
+ANCHOR = AnchorSplitter(DATE_PATTERN.pattern)
 
 
 def _normalize_date(date_raw: str) -> str:
@@ -42,43 +43,31 @@ class AFASLiveConnector(BaseConnector):
         return Source.AFAS_LIVE.value
 
     async def fetch_events(self) -> list[Event]:
+        await _rate_limit()
+        resp = await fetch_with_retries(shared_client(), AGENDA_URL)
         events: list[Event] = []
-        try:
-            await _rate_limit()
-            async with make_client() as client:
-                resp = await fetch_with_retries(client, AGENDA_URL)
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).warning("AFAS Live fetch failed: %s", e)
-            return events
-        try:
-            soup = BeautifulSoup(resp.text, "html.parser")
-            base = "https://www.afaslive.nl"
-            for a in soup.find_all("a", href=True):
-                href = a.get("href", "")
-                if "/en/agenda/" not in href or href.endswith("/agenda"):
-                    continue
-                text = (a.get_text() or "").strip()
-                if len(text) < 2:
-                    continue
-                url = urljoin(base, href)
-                date_normalized = _normalize_date(text)
-                # Title: first part before date-like text (e.g. "David Byrne Monday 16 February 2026" -> "David Byrne")
-                title = text
-                events.append(
-                    Event(
-                        source=Source.AFAS_LIVE,
-                        title=title,
-                        venue=DEFAULT_VENUE,
-                        date_raw=text[:50],
-                        date_normalized=date_normalized,
-                        url=url,
-                    )
+        soup = BeautifulSoup(resp.text, "html.parser")
+        base = "https://www.afaslive.nl"
+        for a in soup.find_all("a", href=True):
+            href = a.get("href", "")
+            if "/en/agenda/" not in href or href.endswith("/agenda"):
+                continue
+            url = urljoin(base, href)
+            # "David Byrne Monday 16 February 2026" -> title "David Byrne"
+            parts = ANCHOR.split(url, (a.get_text() or "").strip())
+            if len(parts.title) < 2:
+                continue
+            events.append(
+                Event(
+                    source=Source.AFAS_LIVE,
+                    title=parts.title,
+                    venue=DEFAULT_VENUE,
+                    date_raw=parts.date_raw or "TBA",
+                    date_normalized=_normalize_date(parts.date_raw),
+                    url=url,
+                    status=parts.status,
                 )
-            seen: set[str] = set()
-            unique = [e for e in events if e.url not in seen and not seen.add(e.url)]
-            return unique
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).warning("AFAS Live parse error: %s", e)
-            return []
+            )
+        seen: set[str] = set()
+        unique = [e for e in events if e.url not in seen and not seen.add(e.url)]
+        return unique
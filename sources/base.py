@@ -1,26 +1,82 @@
 """
-Base connector: fetch_events() with rate limiting and retries.
+Base connector: fetch_events() with rate limiting and retries, and
+AnchorSplitter, which turns a listing's link text into title, date, venue hint
+and status.
 """
 import asyncio
+import dataclasses
 import logging
+import re
 from abc import ABC, abstractmethod
-from typing import List
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 import httpx
 
 from models import Event
+from sources.governor import PRIORITY_LISTING, get_governor
+from sources.retry import RetryPolicy, get_default_policy, request_with_policy
 
 logger = logging.getLogger(__name__)
 
 USER_AGENT = "AmsterdamConcertTracker/1.0 (NL concert notifications; bot)"
 CONNECT_TIMEOUT = 10.0
 READ_TIMEOUT = 30.0
-RETRIES = 4
-BACKOFF_BASE = 1.0  # 1s, 2s, 4s, 8s
 RATE_LIMIT_DELAY = 1.0  # seconds between requests per connector
+# Idle pooled connections are kept this long, so a scheduled run shortly after
+# a pre-warm (or back-to-back polls) reuses resolved, TLS-established connections
+KEEPALIVE_EXPIRY = 300.0
+
+# Offline snapshots of fetched pages, one file per host (<host>.html); see set_replay_dir
+_replay_dir: Optional[Path] = None
+_record_dir: Optional[Path] = None
+
+
+def set_replay_dir(path: Optional[str]) -> None:
+    """Serve every request from <path>/<host>.html instead of the network (None to disable)."""
+    global _replay_dir, _shared_client
+    _replay_dir = Path(path) if path else None
+    _shared_client = None  # rebuilt with the new transport on next use
+
+
+def set_record_dir(path: Optional[str]) -> None:
+    """Save every successful response body to <path>/<host>.html (None to disable)."""
+    global _record_dir, _shared_client
+    _record_dir = Path(path) if path else None
+    _shared_client = None
+    if _record_dir is not None:
+        _record_dir.mkdir(parents=True, exist_ok=True)
+
+
+def _snapshot_path(directory: Path, url: httpx.URL) -> Path:
+    return directory / f"{url.host}.html"
+
+
+def _replay_response(request: httpx.Request) -> httpx.Response:
+    path = _snapshot_path(_replay_dir, request.url)
+    if not path.is_file():
+        logger.warning("Replay: no snapshot %s for %s", path, request.url)
+        return httpx.Response(404, request=request)
+    return httpx.Response(
+        200,
+        content=path.read_bytes(),
+        headers={"Content-Type": "text/html; charset=utf-8"},
+        request=request,
+    )
+
+
+async def _record_response(response: httpx.Response) -> None:
+    if _record_dir is None or not response.is_success:
+        return
+    await response.aread()
+    _snapshot_path(_record_dir, response.request.url).write_bytes(response.content)
 
 
 async def _rate_limit() -> None:
+    if _replay_dir is not None:
+        return
     await asyncio.sleep(RATE_LIMIT_DELAY)
 
 
@@ -29,31 +85,206 @@ async def fetch_with_retries(
     url: str,
     *,
     method: str = "GET",
+    priority: int = PRIORITY_LISTING,
+    policy: Optional[RetryPolicy] = None,
 ) -> httpx.Response:
-    """GET (or method) with exponential backoff retries. Raises last exception after retries."""
-    last_exc: Exception = None
-    for attempt in range(RETRIES):
-        try:
-            resp = await client.request(method, url)
-            resp.raise_for_status()
-            return resp
-        except (httpx.HTTPError, httpx.RequestError) as e:
-            last_exc = e
-            if attempt < RETRIES - 1:
-                delay = BACKOFF_BASE * (2**attempt)
-                logger.warning("Attempt %s failed for %s: %s; retry in %ss", attempt + 1, url, e, delay)
-                await asyncio.sleep(delay)
-    raise last_exc  # type: ignore
+    """
+    GET (or method), retried per `policy` (sources/retry.py; default get_default_policy()).
+    Raises the last error once the policy gives up. Each attempt waits for a slot in
+    the HTTP governor (sources/governor.py); pass priority=PRIORITY_DETAIL for
+    per-event pages, which are shed (RequestShed) once the run's deadline has passed.
+    """
+    policy = policy or get_default_policy()
+    if _replay_dir is not None:
+        # Replayed snapshots are deterministic: retrying or hedging a miss cannot help
+        policy = dataclasses.replace(policy, max_attempts=1, hedge_percentile=0)
+    host = httpx.URL(url).host
+    governor = get_governor()
+    return await request_with_policy(
+        lambda: governor.run(host, priority, url, lambda: client.request(method, url)),
+        url,
+        policy,
+        hedge=method in ("GET", "HEAD"),
+    )
 
 
 def make_client() -> httpx.AsyncClient:
+    kwargs = {}
+    if _replay_dir is not None:
+        kwargs["transport"] = httpx.MockTransport(_replay_response)
+    if _record_dir is not None:
+        kwargs["event_hooks"] = {"response": [_record_response]}
     return httpx.AsyncClient(
         follow_redirects=True,
         timeout=httpx.Timeout(CONNECT_TIMEOUT, read=READ_TIMEOUT),
+        limits=httpx.Limits(keepalive_expiry=KEEPALIVE_EXPIRY),
         headers={"User-Agent": USER_AGENT},
+        **kwargs,
     )
 
 
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def shared_client() -> httpx.AsyncClient:
+    """Process-wide pooled client used by all connectors (connections outlive a single fetch)."""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = make_client()
+    return _shared_client
+
+
+async def close_shared_client() -> None:
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
+
+
+STATUS_SOLD_OUT = "sold out"
+STATUS_CANCELLED = "cancelled"
+STATUS_MOVED = "moved"
+# Phrases in link text (English and Dutch, casefolded) -> Event.status
+STATUS_PHRASES = {
+    "sold out": STATUS_SOLD_OUT,
+    "uitverkocht": STATUS_SOLD_OUT,
+    "cancelled": STATUS_CANCELLED,
+    "canceled": STATUS_CANCELLED,
+    "afgelast": STATUS_CANCELLED,
+    "geannuleerd": STATUS_CANCELLED,
+    "moved": STATUS_MOVED,
+    "postponed": STATUS_MOVED,
+    "rescheduled": STATUS_MOVED,
+    "verplaatst": STATUS_MOVED,
+}
+_STATUS_ALTERNATION = "|".join(
+    re.escape(p).replace(r"\ ", r"\s+") for p in sorted(STATUS_PHRASES, key=len, reverse=True)
+)
+# Left over around removed parts, e.g. "Artist · " after dropping the venue
+_EDGE_SEPARATORS = " \t\n·•|–—-:,/"
+# Characters that end a segment of link text ("Artist · Sold out", "Sold out: Artist")
+_SEGMENT_BOUNDARIES = "·•|–—-:,/"
+_SEPARATOR_RUN = re.compile(r"(\s[·•|–—-])(?:\s+[·•|–—-])+(?=\s)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Split results by event URL, reused while the link text is unchanged (across runs)
+ANCHOR_CACHE_SIZE = 5000
+_anchor_cache: "OrderedDict[str, Tuple[str, AnchorParts]]" = OrderedDict()
+
+
+@dataclass(frozen=True)
+class AnchorParts:
+    title: str  # link text without the parts below ("" if nothing else was left)
+    date_raw: str  # first date found ("" if none); feed it to the connector's date parser
+    venue: Optional[str]  # canonical name of the first known venue mentioned, if any
+    status: Optional[str]  # STATUS_SOLD_OUT, STATUS_CANCELLED, STATUS_MOVED or None
+
+
+def _title(text: str, cut: List[Tuple[int, int]]) -> str:
+    """text without the cut spans, with leftover separators and spacing cleaned up."""
+    kept: List[str] = []
+    pos = 0
+    for start, end in sorted(cut):
+        kept.append(text[pos:start])
+        pos = end
+    kept.append(text[pos:])
+    return _SEPARATOR_RUN.sub(r"\1", _WHITESPACE.sub(" ", " ".join(kept))).strip(_EDGE_SEPARATORS)
+
+
+def _segment_span(text: str, m: "re.Match[str]", cut: List[Tuple[int, int]]) -> Optional[Tuple[int, int]]:
+    """
+    Span to cut for a match that stands on its own: between segment boundaries
+    (the text's start or end, a separator, a part already cut), or in brackets.
+    None when it is part of the title ("Sold Out Sessions", "The Cancelled Tour",
+    "Sum 41 Augustus Tour").
+    """
+    i, j = m.start(), m.end()
+    while i > 0 and text[i - 1].isspace():
+        i -= 1
+    while j < len(text) and text[j].isspace():
+        j += 1
+    if i > 0 and j < len(text) and text[i - 1] == "(" and text[j] == ")":
+        return (i - 1, j + 1)
+    left = i == 0 or text[i - 1] in _SEGMENT_BOUNDARIES or any(end == i for _, end in cut)
+    right = j == len(text) or text[j] in _SEGMENT_BOUNDARIES or any(start == j for start, _ in cut)
+    return m.span() if left and right else None
+
+
+class AnchorSplitter:
+    """
+    Splits raw link text such as "Fr 20 Mar Artist · Bitterzoet Sold out" into
+    its parts in one regex pass: the connector's date pattern, its known venue
+    names and the status phrases are compiled into one alternation. Parsers
+    downstream then see only the short date string, and matching sees only the
+    title. Status phrases are only taken out when they stand on their own (see
+    _segment_span), so a title that contains one keeps it; with date_segment=True
+    the same goes for dates. Results are cached by URL.
+    """
+
+    def __init__(
+        self,
+        date_pattern: Optional[str] = None,
+        venues: Optional[Dict[str, str]] = None,
+        *,
+        date_segment: bool = False,
+    ) -> None:
+        """
+        date_pattern: regex source for the site's date text; venues: spelling in text -> canonical venue.
+        date_segment: only take a date that stands on its own, for patterns loose
+        enough to match inside titles ("41 Augustus" in "Sum 41 Augustus Tour").
+        """
+        self._venues = {k.casefold(): v for k, v in (venues or {}).items()}
+        self._date_segment = date_segment
+        alternatives = []
+        if date_pattern:
+            alternatives.append(f"(?P<date>{date_pattern})")
+        if self._venues:
+            names = sorted(self._venues, key=len, reverse=True)
+            alternatives.append("(?P<venue>" + "|".join(re.escape(n) for n in names) + ")")
+        alternatives.append(f"(?P<status>{_STATUS_ALTERNATION})")
+        # Whole words only; a hyphen counts as part of a word ("The Moved-Ons")
+        self._pattern = re.compile(r"(?<![\w-])(?:" + "|".join(alternatives) + r")(?![\w-])", re.IGNORECASE)
+
+    def split(self, url: str, text: str) -> AnchorParts:
+        cached = _anchor_cache.get(url)
+        if cached is not None and cached[0] == text:
+            _anchor_cache.move_to_end(url)
+            return cached[1]
+        matches = list(self._pattern.finditer(text))
+        date_raw, venue, status = "", None, None
+        cut: List[Tuple[int, int]] = []
+        # A second venue or date stays part of the title
+        for m in matches:
+            if m.lastgroup == "venue":
+                venue = self._venues[m.group().casefold()]
+                cut.append(m.span())
+                break
+        for m in matches:
+            if m.lastgroup != "date":
+                continue
+            span = _segment_span(text, m, cut) if self._date_segment else m.span()
+            if span is not None:
+                date_raw = m.group()
+                cut.append(span)
+                break
+        title = _title(text, cut)
+        for m in matches:
+            span = _segment_span(text, m, cut) if m.lastgroup == "status" else None
+            if span is None:
+                continue
+            # A status phrase that is the whole headline ("Cancelled") is the title
+            rest = _title(text, cut + [span])
+            if rest:
+                status = STATUS_PHRASES[_WHITESPACE.sub(" ", m.group().casefold())]
+                title = rest
+            break
+        parts = AnchorParts(title=title, date_raw=date_raw, venue=venue, status=status)
+        _anchor_cache[url] = (text, parts)
+        if len(_anchor_cache) > ANCHOR_CACHE_SIZE:
+            _anchor_cache.popitem(last=False)
+        return parts
+
+
 class BaseConnector(ABC):
     """Abstract event source. Subclasses implement fetch_events()."""
 
@@ -65,5 +296,9 @@ class BaseConnector(ABC):
 
     @abstractmethod
     async def fetch_events(self) -> List[Event]:
-        """Fetch and normalize events. Return empty list on parse failure; do not raise."""
+        """
+        Fetch and normalize events. Raise when the page cannot be fetched or parsed:
+        the pipeline records the error for the source (an empty list means the
+        listing really is empty).
+        """
         ...
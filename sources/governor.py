@@ -0,0 +1,189 @@
+"""
+Central limit on outbound HTTP: every request (artists lists, listing pages,
+and any per-event detail page a connector fetches) takes a slot here first.
+
+- at most HTTP_MAX_IN_FLIGHT requests in flight overall (default 8) and
+  HTTP_MAX_PER_HOST per host (default 2)
+- when slots are short, waiting requests are served by priority class:
+  PRIORITY_ARTISTS, then PRIORITY_LISTING, then PRIORITY_DETAIL (first come,
+  first served within a class)
+- a run may set a deadline (RUN_DEADLINE_SECONDS, see run_budget). Past it,
+  PRIORITY_DETAIL requests are shed: those still waiting, and those in flight,
+  raise RequestShed, so the run finishes with what the listing pages gave.
+  Artists lists and listing pages are never shed.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+# Priority classes: lower is served first
+PRIORITY_ARTISTS = 0
+PRIORITY_LISTING = 1
+PRIORITY_DETAIL = 2
+
+DEFAULT_MAX_IN_FLIGHT = 8
+DEFAULT_MAX_PER_HOST = 2
+DEFAULT_RUN_DEADLINE_SECONDS = 300
+
+T = TypeVar("T")
+
+
+class RequestShed(Exception):
+    """A low-priority request was dropped because the run's deadline passed."""
+
+
+def _env_int(name: str, default: int, minimum: int) -> int:
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return max(minimum, int(raw))
+    except ValueError:
+        logger.warning("Invalid %s=%r; using %d", name, raw, default)
+        return default
+
+
+def get_run_deadline() -> int:
+    """RUN_DEADLINE_SECONDS: after this long, a run sheds detail requests (default 300; 0 disables)."""
+    return _env_int("RUN_DEADLINE_SECONDS", DEFAULT_RUN_DEADLINE_SECONDS, 0)
+
+
+@dataclass
+class RunBudget:
+    deadline: Optional[float]  # time.monotonic() value, None for no deadline
+    shed: int = 0  # requests shed so far
+
+    def remaining(self) -> Optional[float]:
+        return None if self.deadline is None else self.deadline - time.monotonic()
+
+
+# The current run's budget; tasks a run creates inherit it (and share the object)
+_budget: ContextVar[Optional[RunBudget]] = ContextVar("http_run_budget", default=None)
+
+
+@contextmanager
+def run_budget(seconds: Optional[float]) -> Iterator[RunBudget]:
+    """Give requests made inside the block (and in tasks started from it) a deadline `seconds` from now."""
+    budget = RunBudget(deadline=time.monotonic() + seconds if seconds else None)
+    token = _budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _budget.reset(token)
+
+
+def _time_left(priority: int, url: str) -> Optional[float]:
+    """Seconds this request may take under the run's deadline; None when not bounded."""
+    budget = _budget.get()
+    if priority < PRIORITY_DETAIL or budget is None or budget.deadline is None:
+        return None
+    left = budget.remaining()
+    if left <= 0:
+        budget.shed += 1
+        raise RequestShed(f"run deadline passed; skipped {url}")
+    return left
+
+
+class _PrioritySlots:
+    """Counting semaphore that wakes waiters lowest priority value first, FIFO within a priority."""
+
+    _order = itertools.count()
+
+    def __init__(self, capacity: int) -> None:
+        self._free = capacity
+        self._waiters: List[list] = []  # heap of [priority, order, future]
+
+    async def acquire(self, priority: int) -> None:
+        # Slots are handed straight to waiters on release, so free slots mean no one is waiting
+        if self._free > 0:
+            self._free -= 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, [priority, next(self._order), future])
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # handed a slot just as we were cancelled: pass it on
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            future = heapq.heappop(self._waiters)[2]
+            if not future.done():  # skip waiters that gave up
+                future.set_result(None)
+                return
+        self._free += 1
+
+
+class Governor:
+    def __init__(self, max_in_flight: int, max_per_host: int) -> None:
+        self.max_in_flight = max_in_flight
+        self.max_per_host = max_per_host
+        self._global = _PrioritySlots(max_in_flight)
+        self._hosts: Dict[str, _PrioritySlots] = {}
+
+    async def _acquire(self, host: _PrioritySlots, priority: int) -> None:
+        # Host first: a request queued behind a busy host must not hold a global slot
+        await host.acquire(priority)
+        try:
+            await self._global.acquire(priority)
+        except BaseException:
+            host.release()
+            raise
+
+    @asynccontextmanager
+    async def slot(self, host: str, priority: int, url: str = "") -> AsyncIterator[None]:
+        """Hold one global and one per-host slot for the block; raises RequestShed past the deadline."""
+        slots = self._hosts.get(host)
+        if slots is None:
+            slots = self._hosts[host] = _PrioritySlots(self.max_per_host)
+        wait = _time_left(priority, url or host)
+        try:
+            await asyncio.wait_for(self._acquire(slots, priority), wait)
+        except asyncio.TimeoutError:
+            _time_left(priority, url or host)  # deadline passed while queued: shed
+            raise
+        try:
+            yield
+        finally:
+            self._global.release()
+            slots.release()
+
+    async def run(self, host: str, priority: int, url: str, request: Callable[[], Awaitable[T]]) -> T:
+        """Await request() inside a slot; detail requests still in flight at the deadline are shed."""
+        async with self.slot(host, priority, url):
+            left = _time_left(priority, url)
+            try:
+                return await asyncio.wait_for(request(), left)
+            except asyncio.TimeoutError:
+                _time_left(priority, url)
+                raise
+
+
+_governor: Optional[Governor] = None
+
+
+def get_governor() -> Governor:
+    """Process-wide governor, sized from HTTP_MAX_IN_FLIGHT and HTTP_MAX_PER_HOST on first use."""
+    global _governor
+    if _governor is None:
+        _governor = Governor(
+            _env_int("HTTP_MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT, 1),
+            _env_int("HTTP_MAX_PER_HOST", DEFAULT_MAX_PER_HOST, 1),
+        )
+        logger.info(
+            "HTTP governor: %d in flight, %d per host",
+            _governor.max_in_flight,
+            _governor.max_per_host,
+        )
+    return _governor
@@ -9,12 +9,16 @@ from urllib.parse import urljoin
 from bs4 import BeautifulSoup
 
 from models import Event, Source
-from sources.base import BaseConnector, fetch_with_retries, make_client, _rate_limit
+from sources.base import AnchorSplitter, BaseConnector, fetch_with_retries, shared_client, _rate_limit
 
 CALENDAR_URL = "https://www.johancruijffarena.nl/en/calendar/"
 DEFAULT_VENUE = "Johan Cruijff ArenA"
 MONTHS = {"jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6, "jul": 7,
           "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12}
+# "20-06-2026" or "20 Jun"; only taken out when it stands on its own (the pattern
+# also fits inside titles, see sources/ticketmaster_nl.py)
+DATE_PATTERN = r"\d{1,2}[-/]\d{1,2}[-/]\d{4}|\d{1,2}\s+(?:%s)[a-z]*\.?" % "|".join(MONTHS)
+ANCHOR = AnchorSplitter(DATE_PATTERN, date_segment=True)
 
 
 def _normalize_date(date_raw: str) -> str:
@@ -46,45 +50,37 @@ class JohanCruijffArenaConnector(BaseConnector):
         return Source.JOHAN_CRUIJFF_ARENA.value
 
     async def fetch_events(self) -> list[Event]:
+        await _rate_limit()
+        resp = await fetch_with_retries(shared_client(), CALENDAR_URL)
         events: list[Event] = []
-        try:
-            await _rate_limit()
-            async with make_client() as client:
-                resp = await fetch_with_retries(client, CALENDAR_URL)
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).warning("Johan Cruijff ArenA fetch failed: %s", e)
-            return events
-        try:
-            soup = BeautifulSoup(resp.text, "html.parser")
-            base = "https://www.johancruijffarena.nl"
-            for a in soup.find_all("a", href=True):
-                href = a.get("href", "")
-                if not href or "calendar" in href or href.strip("/") == "":
-                    continue
-                if "/en/" not in href and "/nl/" not in href:
-                    continue
-                text = (a.get_text() or "").strip()
-                if len(text) < 3 or len(text) > 250:
-                    continue
-                url = urljoin(base, href)
-                if url == base or url == base + "/":
-                    continue
-                date_normalized = _normalize_date(text)
-                events.append(
-                    Event(
-                        source=Source.JOHAN_CRUIJFF_ARENA,
-                        title=text,
-                        venue=DEFAULT_VENUE,
-                        date_raw=text[:60],
-                        date_normalized=date_normalized,
-                        url=url,
-                    )
+        soup = BeautifulSoup(resp.text, "html.parser")
+        base = "https://www.johancruijffarena.nl"
+        for a in soup.find_all("a", href=True):
+            href = a.get("href", "")
+            if not href or "calendar" in href or href.strip("/") == "":
+                continue
+            if "/en/" not in href and "/nl/" not in href:
+                continue
+            text = (a.get_text() or "").strip()
+            if len(text) < 3 or len(text) > 250:
+                continue
+            url = urljoin(base, href)
+            if url == base or url == base + "/":
+                continue
+            parts = ANCHOR.split(url, text)
+            if len(parts.title) < 3:
+                continue
+            events.append(
+                Event(
+                    source=Source.JOHAN_CRUIJFF_ARENA,
+                    title=parts.title,
+                    venue=DEFAULT_VENUE,
+                    date_raw=parts.date_raw or "TBA",
+                    date_normalized=_normalize_date(parts.date_raw),
+                    url=url,
+                    status=parts.status,
                 )
-            seen: set[str] = set()
-            unique = [e for e in events if e.url not in seen and not seen.add(e.url)]
-            return unique[:300]
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).warning("Johan Cruijff ArenA parse error: %s", e)
-            return []
+            )
+        seen: set[str] = set()
+        unique = [e for e in events if e.url not in seen and not seen.add(e.url)]
+        return unique[:300]
@@ -8,7 +8,7 @@ from urllib.parse import urljoin
 from bs4 import BeautifulSoup
 
 from models import Event, Source
-from sources.base import BaseConnector, fetch_with_retries, make_client, _rate_limit
+from sources.base import AnchorSplitter, BaseConnector, fetch_with_retries, shared_client, _rate_limit
 
 AGENDA_URL = "https://www.paradiso.nl/en/landing/concertagenda-paradiso/2069817"
 DEFAULT_VENUE = "Paradiso"
@@ -16,6 +16,18 @@ DEFAULT_VENUE = "Paradiso"
 MONTHS = {"jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6, "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12}
 # Link text often "Fr 20 Mar", "Th 19 Mar" etc. — day number + month
 DATE_PATTERN = re.compile(r"(?:Mo|Tu|We|Th|Fr|Sa|Su)\s+(\d{1,2})\s+([A-Za-z]{3})", re.IGNORECASE)
+# Other stages Paradiso programs, as mentioned in link text
+SUB_VENUES = {
+    "bitterzoet": "Bitterzoet",
+    "tolhuistuin": "Tolhuistuin",
+    "cinetol": "Cinetol",
+    "zonnehuis": "Zonnehuis",
+    "vondelkerk": "Vondelkerk",
+    "de duif": "De Duif",
+    "afas live": "AFAS Live",
+}
+# Link text is "Fr 20 Mar Artist · Bitterzoet Sold out": date, title, sub-venue, status
+ANCHOR = AnchorSplitter(DATE_PATTERN.pattern, SUB_VENUES)
 
 
 def _normalize_date(date_raw: str) -> str:
@@ -43,77 +55,42 @@ def _normalize_date(date_raw: str) -> str:
         return "TBA"
 
 
-def _extract_venue_from_text(text: str) -> str:
-    """If text mentions a known sub-venue, return it; else Paradiso."""
-    t = text.lower()
-    if "bitterzoet" in t:
-        return "Bitterzoet"
-    if "tolhuistuin" in t:
-        return "Tolhuistuin"
-    if "cinetol" in t:
-        return "Cinetol"
-    if "zonnehuis" in t:
-        return "Zonnehuis"
-    if "vondelkerk" in t:
-        return "Vondelkerk"
-    if "de duif" in t:
-        return "De Duif"
-    if "afas live" in t:
-        return "AFAS Live"
-    return DEFAULT_VENUE
-
-
 class ParadisoConnector(BaseConnector):
     @property
     def source_id(self) -> str:
         return Source.PARADISO.value
 
     async def fetch_events(self) -> list[Event]:
+        await _rate_limit()
+        resp = await fetch_with_retries(shared_client(), AGENDA_URL)
         events: list[Event] = []
-        try:
-            await _rate_limit()
-            async with make_client() as client:
-                resp = await fetch_with_retries(client, AGENDA_URL)
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).warning("Paradiso fetch failed: %s", e)
-            return events
-
-        try:
-            soup = BeautifulSoup(resp.text, "html.parser")
-            base = "https://www.paradiso.nl"
-            # Find event links: /en/program/... 
-            for a in soup.find_all("a", href=True):
-                href = a.get("href", "")
-                if "/en/program/" not in href or "/landing/" in href:
-                    continue
-                url = urljoin(base, href)
-                title = (a.get_text() or "").strip()
-                if not title or len(title) < 2:
-                    continue
-                # First part of link text often "Fr 20 Mar" or similar
-                date_raw = title[:20] if len(title) > 20 else title
-                date_normalized = _normalize_date(title)
-                venue = _extract_venue_from_text(title)
-                events.append(
-                    Event(
-                        source=Source.PARADISO,
-                        title=title,
-                        venue=venue,
-                        date_raw=date_raw,
-                        date_normalized=date_normalized,
-                        url=url,
-                    )
+        soup = BeautifulSoup(resp.text, "html.parser")
+        base = "https://www.paradiso.nl"
+        # Find event links: /en/program/... 
+        for a in soup.find_all("a", href=True):
+            href = a.get("href", "")
+            if "/en/program/" not in href or "/landing/" in href:
+                continue
+            url = urljoin(base, href)
+            parts = ANCHOR.split(url, (a.get_text() or "").strip())
+            if len(parts.title) < 2:
+                continue
+            events.append(
+                Event(
+                    source=Source.PARADISO,
+                    title=parts.title,
+                    venue=parts.venue or DEFAULT_VENUE,
+                    date_raw=parts.date_raw or "TBA",
+                    date_normalized=_normalize_date(parts.date_raw),
+                    url=url,
+                    status=parts.status,
                 )
-            # Dedupe by url (same event can appear in multiple blocks)
-            seen_urls: set[str] = set()
-            unique: list[Event] = []
-            for e in events:
-                if e.url not in seen_urls:
-                    seen_urls.add(e.url)
-                    unique.append(e)
-            return unique
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).warning("Paradiso parse error: %s", e)
-            return []
+            )
+        # Dedupe by url (same event can appear in multiple blocks)
+        seen_urls: set[str] = set()
+        unique: list[Event] = []
+        for e in events:
+            if e.url not in seen_urls:
+                seen_urls.add(e.url)
+                unique.append(e)
+        return unique
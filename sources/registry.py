@@ -0,0 +1,34 @@
+"""
+Default set of source connectors, shared by main.py and the headless CLI.
+"""
+from typing import List, Optional, Sequence
+
+from sources.base import BaseConnector
+from sources.paradiso import ParadisoConnector
+from sources.melkweg import MelkwegConnector
+from sources.afas_live import AFASLiveConnector
+from sources.ziggo_dome import ZiggoDomeConnector
+from sources.ticketmaster_nl import TicketmasterNLConnector
+from sources.johan_cruijff_arena import JohanCruijffArenaConnector
+
+
+def default_connectors(only: Optional[Sequence[str]] = None) -> List[BaseConnector]:
+    """
+    All connectors, or only those whose source_id is in `only`.
+    Raises ValueError for unknown source ids.
+    """
+    connectors: List[BaseConnector] = [
+        ParadisoConnector(),
+        MelkwegConnector(),
+        AFASLiveConnector(),
+        ZiggoDomeConnector(),
+        TicketmasterNLConnector(),
+        JohanCruijffArenaConnector(),
+    ]
+    if only is None:
+        return connectors
+    wanted = {s.strip().lower() for s in only if s.strip()}
+    unknown = wanted - {c.source_id for c in connectors}
+    if unknown:
+        raise ValueError(f"Unknown source(s): {', '.join(sorted(unknown))}")
+    return [c for c in connectors if c.source_id in wanted]
@@ -0,0 +1,202 @@
+"""
+Retry policy for outbound HTTP (sources/base.py fetch_with_retries).
+
+- only failures that can succeed on a second try are retried: transport errors
+  (timeouts, refused or reset connections) and 408/425/429/5xx responses. A 404
+  or a 403 bot block fails at once
+- waits use full jitter (uniform between 0 and the exponential step), so
+  requests that failed together do not retry together
+- a Retry-After header (seconds or HTTP date) replaces the computed wait;
+  hints longer than max_retry_after end the retries
+- all attempts and waits of one request fit in total_timeout
+- optional hedging (HTTP_HEDGE_PERCENTILE, GET only): when an attempt has run
+  longer than that percentile of the host's recent latencies, a second request
+  is sent and the first answer wins
+
+Each attempt is appended to the current run's attempt log (see attempt_log),
+which pipeline.run() stores in the run summary.
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Deque, Dict, FrozenSet, Iterator, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+# Successful latencies kept per host, and how many are needed before hedging
+LATENCY_WINDOW = 50
+HEDGE_MIN_SAMPLES = 10
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Subclass (e.g. override retryable) or pass different values per connector."""
+
+    max_attempts: int = 4
+    base_delay: float = 1.0  # full-jitter waits up to 1s, 2s, 4s, ...
+    max_delay: float = 8.0
+    total_timeout: float = 90.0  # seconds for all attempts and waits of one request
+    max_retry_after: float = 30.0
+    retry_statuses: FrozenSet[int] = RETRYABLE_STATUSES
+    hedge_percentile: float = 0  # 0 disables hedging
+
+    def retryable(self, exc: Exception) -> bool:
+        if isinstance(exc, httpx.HTTPStatusError):
+            return exc.response.status_code in self.retry_statuses
+        return isinstance(exc, httpx.TransportError)
+
+    def backoff(self, attempt: int) -> float:
+        """Wait before attempt number attempt + 1 (attempt counts from 0)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+def get_default_policy() -> RetryPolicy:
+    """RetryPolicy with HTTP_HEDGE_PERCENTILE applied (default 0: no hedging)."""
+    raw = os.environ.get("HTTP_HEDGE_PERCENTILE", "").strip()
+    if not raw:
+        return RetryPolicy()
+    try:
+        percentile = min(99.9, max(0.0, float(raw)))
+    except ValueError:
+        logger.warning("Invalid HTTP_HEDGE_PERCENTILE=%r; hedging disabled", raw)
+        return RetryPolicy()
+    return RetryPolicy(hedge_percentile=percentile)
+
+
+def retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds asked for by the response's Retry-After header, if any."""
+    raw = response.headers.get("Retry-After", "").strip()
+    if not raw:
+        return None
+    if raw.isdigit():
+        return float(raw)
+    try:
+        when = parsedate_to_datetime(raw)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+_latencies: Dict[str, Deque[float]] = {}
+
+
+def _hedge_delay(host: str, percentile: float) -> Optional[float]:
+    samples = _latencies.get(host)
+    if not percentile or samples is None or len(samples) < HEDGE_MIN_SAMPLES:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))]
+
+
+def _record_latency(host: str, seconds: float) -> None:
+    _latencies.setdefault(host, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+
+
+# The current run's attempts (dicts: url, attempt, ms, outcome, hedged); tasks inherit it
+_attempts: ContextVar[Optional[List[Dict]]] = ContextVar("http_attempts", default=None)
+
+
+@contextmanager
+def attempt_log() -> Iterator[List[Dict]]:
+    """Collect every request attempt made inside the block (and in tasks started from it)."""
+    log: List[Dict] = []
+    token = _attempts.set(log)
+    try:
+        yield log
+    finally:
+        _attempts.reset(token)
+
+
+def _log_attempt(url: str, attempt: int, t0: float, outcome: object, hedged: bool) -> None:
+    log = _attempts.get()
+    if log is not None:
+        entry = {"url": url, "attempt": attempt, "ms": int((time.perf_counter() - t0) * 1000), "outcome": outcome}
+        if hedged:
+            entry["hedged"] = True
+        log.append(entry)
+
+
+async def _first_answer(send: Callable[[], Awaitable[httpx.Response]], hedge_after: Optional[float]) -> tuple:
+    """(response, hedged): send(), plus a second send() if the first is slower than hedge_after."""
+    tasks = [asyncio.ensure_future(send())]
+    try:
+        if hedge_after is not None:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if not done:
+                tasks.append(asyncio.ensure_future(send()))
+        pending = set(tasks)
+        while True:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            answered = [t for t in done if t.exception() is None]
+            if answered or not pending:
+                # The other request's error only counts when neither answered
+                return (answered or list(done))[0].result(), len(tasks) > 1
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def request_with_policy(
+    send: Callable[[], Awaitable[httpx.Response]],
+    url: str,
+    policy: RetryPolicy,
+    *,
+    hedge: bool = False,
+) -> httpx.Response:
+    """
+    Call send() until it returns a successful response or the policy gives up;
+    raises the last error. hedge: the request is safe to send twice (GET).
+    """
+    host = httpx.URL(url).host
+    give_up_at = time.monotonic() + policy.total_timeout
+    last_exc: Optional[Exception] = None
+    for attempt in range(policy.max_attempts):
+        left = give_up_at - time.monotonic()
+        hedge_after = _hedge_delay(host, policy.hedge_percentile) if hedge else None
+        t0 = time.perf_counter()
+        hedged = False
+        try:
+            resp, hedged = await asyncio.wait_for(_first_answer(send, hedge_after), left)
+            resp.raise_for_status()
+        except asyncio.TimeoutError:
+            _log_attempt(url, attempt + 1, t0, "timeout", hedged)
+            raise httpx.TimeoutException(
+                f"{url}: no response within the {policy.total_timeout:.0f}s request budget"
+            ) from last_exc
+        except Exception as e:
+            outcome = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else type(e).__name__
+            _log_attempt(url, attempt + 1, t0, outcome, hedged)
+            if not policy.retryable(e):
+                raise
+            last_exc = e
+        else:
+            _record_latency(host, time.perf_counter() - t0)
+            _log_attempt(url, attempt + 1, t0, resp.status_code, hedged)
+            return resp
+        if attempt == policy.max_attempts - 1:
+            break
+        delay = policy.backoff(attempt)
+        hint = retry_after(last_exc.response) if isinstance(last_exc, httpx.HTTPStatusError) else None
+        if hint is not None:
+            if hint > policy.max_retry_after:
+                logger.warning("%s asks to retry in %.0fs; giving up", url, hint)
+                break
+            delay = hint
+        if time.monotonic() + delay >= give_up_at:
+            break
+        logger.warning("Attempt %s failed for %s: %s; retry in %.1fs", attempt + 1, url, last_exc, delay)
+        await asyncio.sleep(delay)
+    raise last_exc  # type: ignore
@@ -9,13 +9,18 @@ from urllib.parse import urljoin
 from bs4 import BeautifulSoup
 
 from models import Event, Source
-from sources.base import BaseConnector, fetch_with_retries, make_client, _rate_limit
+from sources.base import AnchorSplitter, BaseConnector, fetch_with_retries, shared_client, _rate_limit
 
 # Concerts listing for Netherlands
 EVENTS_URL = "https://www.ticketmaster.nl/music"
 DEFAULT_VENUE = "Ticketmaster NL"
 MONTHS = {"jan": 1, "feb": 2, "mar": 3, "apr": 4, "mei": 5, "jun": 6, "jul": 7,
           "aug": 8, "sep": 9, "okt": 10, "nov": 11, "dec": 12}
+# "20-06-2026" or "20 jun". No venue list: Ticketmaster lists every venue, so any
+# venue name stays in the title. The pattern also fits inside titles ("Sum 41
+# Augustus Tour"), so only a date standing on its own is taken out
+DATE_PATTERN = r"\d{1,2}[-/]\d{1,2}[-/]\d{4}|\d{1,2}\s*(?:%s)[a-z]*\.?" % "|".join(MONTHS)
+ANCHOR = AnchorSplitter(DATE_PATTERN, date_segment=True)
 
 
 def _normalize_date(date_raw: str) -> str:
@@ -48,43 +53,35 @@ class TicketmasterNLConnector(BaseConnector):
         return Source.TICKETMASTER.value
 
     async def fetch_events(self) -> list[Event]:
+        await _rate_limit()
+        resp = await fetch_with_retries(shared_client(), EVENTS_URL)
         events: list[Event] = []
-        try:
-            await _rate_limit()
-            async with make_client() as client:
-                resp = await fetch_with_retries(client, EVENTS_URL)
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).warning("Ticketmaster NL fetch failed: %s", e)
-            return events
-        try:
-            soup = BeautifulSoup(resp.text, "html.parser")
-            base = "https://www.ticketmaster.nl"
-            for a in soup.find_all("a", href=True):
-                href = a.get("href", "")
-                if "/event/" not in href and "/music/" not in href:
-                    continue
-                if "music" == href.strip("/").split("/")[-1]:
-                    continue
-                text = (a.get_text() or "").strip()
-                if len(text) < 2:
-                    continue
-                url = urljoin(base, href)
-                date_normalized = _normalize_date(text)
-                events.append(
-                    Event(
-                        source=Source.TICKETMASTER,
-                        title=text,
-                        venue=DEFAULT_VENUE,
-                        date_raw=text[:50],
-                        date_normalized=date_normalized,
-                        url=url,
-                    )
+        soup = BeautifulSoup(resp.text, "html.parser")
+        base = "https://www.ticketmaster.nl"
+        for a in soup.find_all("a", href=True):
+            href = a.get("href", "")
+            if "/event/" not in href and "/music/" not in href:
+                continue
+            if "music" == href.strip("/").split("/")[-1]:
+                continue
+            text = (a.get_text() or "").strip()
+            if len(text) < 2:
+                continue
+            url = urljoin(base, href)
+            parts = ANCHOR.split(url, text)
+            if len(parts.title) < 2:
+                continue
+            events.append(
+                Event(
+                    source=Source.TICKETMASTER,
+                    title=parts.title,
+                    venue=DEFAULT_VENUE,
+                    date_raw=parts.date_raw or "TBA",
+                    date_normalized=_normalize_date(parts.date_raw),
+                    url=url,
+                    status=parts.status,
                 )
-            seen: set[str] = set()
-            unique = [e for e in events if e.url not in seen and not seen.add(e.url)]
-            return unique[:500]
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).warning("Ticketmaster NL parse error: %s", e)
-            return []
+            )
+        seen: set[str] = set()
+        unique = [e for e in events if e.url not in seen and not seen.add(e.url)]
+        return unique[:500]
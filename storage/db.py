@@ -27,8 +27,9 @@ CREATE TABLE IF NOT EXISTS notification_history (
     first_seen_at DATETIME NOT NULL,
     notified_at DATETIME NOT NULL
 );
-CREATE UNIQUE INDEX IF NOT EXISTS idx_notification_history_dedup
-ON notification_history(artist, venue, date_normalized);
+-- /history: concert date ranges (newest-first index is in POST_MIGRATION_SCHEMA)
+CREATE INDEX IF NOT EXISTS idx_notification_history_date
+ON notification_history(date_normalized);
 
 CREATE TABLE IF NOT EXISTS runs (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -38,10 +39,159 @@ CREATE TABLE IF NOT EXISTS runs (
     events_scanned_total INTEGER DEFAULT 0,
     matches_total INTEGER DEFAULT 0,
     notifications_sent INTEGER DEFAULT 0,
-    errors_json TEXT
+    errors_json TEXT,
+    duration_ms INTEGER
 );
+
+-- Per-stage and per-source timings for each run (scope = 'stage' | 'source')
+CREATE TABLE IF NOT EXISTS run_metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    scope TEXT NOT NULL,
+    name TEXT NOT NULL,
+    duration_ms INTEGER NOT NULL,
+    events_count INTEGER DEFAULT 0,
+    error_count INTEGER DEFAULT 0
+);
+-- /stats reads one window of runs at a time, and trimming deletes by run_id;
+-- replaces the (scope, name, run_id) index, which forced a scan of the table
+DROP INDEX IF EXISTS idx_run_metrics_name;
+CREATE INDEX IF NOT EXISTS idx_run_metrics_run
+ON run_metrics(run_id);
+
+-- Notifications waiting for delivery (storage/outbox.py); written in the same
+-- transaction as notification_history, marked delivered once Telegram acks
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    history_id INTEGER,
+    text TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at DATETIME NOT NULL,
+    delivered_at DATETIME
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_status
+ON outbox(status, id);
+
+-- Last fetched event list per connector (storage/event_cache.py)
+CREATE TABLE IF NOT EXISTS event_cache (
+    source TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    events_json TEXT NOT NULL
+);
+
+-- Every event seen by a run, matched or not (storage/events.py, /search)
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    venue TEXT NOT NULL,
+    date_raw TEXT,
+    date_normalized TEXT NOT NULL,
+    status TEXT,
+    first_seen_at DATETIME NOT NULL,
+    last_seen_at DATETIME NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_events_identity
+ON events(source, url, title, date_normalized);
+CREATE INDEX IF NOT EXISTS idx_events_date
+ON events(date_normalized);
+
+-- Per-user settings for users other than the owner (storage/users.py); the
+-- owner's live in settings
+CREATE TABLE IF NOT EXISTS user_settings (
+    user_id INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (user_id, key)
+);
+
+-- Per-source change tracking for adaptive polling (storage/source_state.py)
+CREATE TABLE IF NOT EXISTS source_state (
+    source TEXT PRIMARY KEY,
+    content_hash TEXT,
+    last_checked_at REAL NOT NULL,
+    last_changed_at REAL,
+    checks INTEGER NOT NULL DEFAULT 0,
+    changes_weighted REAL NOT NULL,
+    observed_seconds REAL NOT NULL
+);
+
+-- Pipeline jobs for worker processes (storage/job_queue.py, SCRAPE_MODE=worker)
+CREATE TABLE IF NOT EXISTS job_queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload_json TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_id TEXT,
+    lease_until REAL,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    progress_json TEXT,
+    result_json TEXT,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_job_queue_status
+ON job_queue(status, id);
+"""
+
+# Full-text index over events (external content: the text lives in events only).
+# Triggers keep it in step with the table; the update trigger fires only when
+# indexed text changes, so re-seeing an event each run costs no FTS writes.
+# Kept separate from SCHEMA because SQLite builds without FTS5 reject it.
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+    title, venue,
+    content='events', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events BEGIN
+    INSERT INTO events_fts(rowid, title, venue) VALUES (new.id, new.title, new.venue);
+END;
+CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events BEGIN
+    INSERT INTO events_fts(events_fts, rowid, title, venue) VALUES ('delete', old.id, old.title, old.venue);
+END;
+CREATE TRIGGER IF NOT EXISTS events_fts_update AFTER UPDATE OF title, venue ON events
+WHEN old.title IS NOT new.title OR old.venue IS NOT new.venue BEGIN
+    INSERT INTO events_fts(events_fts, rowid, title, venue) VALUES ('delete', old.id, old.title, old.venue);
+    INSERT INTO events_fts(rowid, title, venue) VALUES (new.id, new.title, new.venue);
+END;
 """
 
+# Columns added after the first release: (table, column, declaration).
+# CREATE TABLE IF NOT EXISTS does not touch existing tables, so add them here.
+COLUMN_MIGRATIONS = [
+    ("runs", "duration_ms", "INTEGER"),
+    # 0 = the owner (all rows from single-user versions)
+    ("notification_history", "user_id", "INTEGER NOT NULL DEFAULT 0"),
+    # NULL = the owner's notification chat
+    ("outbox", "chat_id", "INTEGER"),
+]
+
+# Schema that depends on migrated columns, applied after COLUMN_MIGRATIONS
+POST_MIGRATION_SCHEMA = """
+-- Dedupe is per user; replaces the single-user (artist, venue, date) index
+DROP INDEX IF EXISTS idx_notification_history_dedup;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_notification_history_user_dedup
+ON notification_history(user_id, artist, venue, date_normalized);
+-- /history: one user's rows newest first (keyset on notified_at, id)
+DROP INDEX IF EXISTS idx_notification_history_notified;
+CREATE INDEX IF NOT EXISTS idx_notification_history_user_notified
+ON notification_history(user_id, notified_at);
+"""
+
+
+def _apply_column_migrations(conn) -> None:
+    for table, column, decl in COLUMN_MIGRATIONS:
+        cols = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in cols:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+            logger.info("Added column %s.%s", table, column)
+
 
 def init_db(db_path: str) -> None:
     """Set database path and create schema (sync, for startup)."""
@@ -51,7 +201,17 @@ def init_db(db_path: str) -> None:
     _db_path = str(path)
     import sqlite3
     with sqlite3.connect(_db_path) as conn:
+        # Only takes effect on a new (empty) database; storage/maintenance.py converts older ones
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        # Readers never block the writer, so the bot and worker processes can share the file
+        conn.execute("PRAGMA journal_mode = WAL")
         conn.executescript(SCHEMA)
+        _apply_column_migrations(conn)
+        conn.executescript(POST_MIGRATION_SCHEMA)
+        try:
+            conn.executescript(FTS_SCHEMA)
+        except sqlite3.OperationalError as e:
+            logger.warning("Full-text search unavailable (%s); /search falls back to substring matching", e)
     logger.info("Database initialized at %s", _db_path)
 
 
@@ -62,3 +222,14 @@ def get_db_path() -> str:
 async def get_connection() -> aiosqlite.Connection:
     """Return an open aiosqlite connection (caller must close)."""
     return await aiosqlite.connect(_db_path)
+
+
+async def ping() -> bool:
+    """True if the database answers a trivial query (readiness checks)."""
+    try:
+        async with aiosqlite.connect(_db_path) as conn:
+            await conn.execute("SELECT 1")
+        return True
+    except Exception as e:
+        logger.warning("Database ping failed: %s", e)
+        return False
@@ -0,0 +1,99 @@
+"""
+Per-connector cache of the last fetched event list, with a TTL.
+
+Entries live in process memory; with EVENT_CACHE_PERSIST=1 they are also
+written to the event_cache table so a restart can reuse fresh-enough data, and
+processes sharing the database (worker.py, which enables it by default) see each
+other's scrapes: a read prefers the table's copy when it is newer.
+"""
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from models import Event
+from storage.db import get_db_path
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 600
+
+# source_id -> (fetched_at epoch seconds, events)
+_entries: Dict[str, Tuple[float, List[Event]]] = {}
+
+
+def get_ttl_seconds() -> float:
+    """EVENT_CACHE_TTL_SECONDS (0 disables the cache)."""
+    raw = os.environ.get("EVENT_CACHE_TTL_SECONDS")
+    if raw is None or raw.strip() == "":
+        return DEFAULT_TTL_SECONDS
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        logger.warning("Invalid EVENT_CACHE_TTL_SECONDS=%r; using %s", raw, DEFAULT_TTL_SECONDS)
+        return DEFAULT_TTL_SECONDS
+
+
+def _persist_enabled() -> bool:
+    return os.environ.get("EVENT_CACHE_PERSIST", "").strip().lower() in ("1", "true", "yes")
+
+
+async def get(source_id: str, *, ttl_seconds: Optional[float] = None) -> Optional[List[Event]]:
+    """Return the cached events for source_id if younger than the TTL, else None."""
+    ttl = get_ttl_seconds() if ttl_seconds is None else ttl_seconds
+    if ttl <= 0:
+        return None
+    now = time.time()
+    entry = _entries.get(source_id)
+    if _persist_enabled():
+        stored = await _load(source_id)
+        if stored is not None and (entry is None or stored[0] > entry[0]):
+            entry = _entries[source_id] = stored
+    if entry is None:
+        return None
+    fetched_at, events = entry
+    if now - fetched_at > ttl:
+        return None
+    return events
+
+
+async def put(source_id: str, events: List[Event]) -> None:
+    """Store a fresh fetch result. Empty lists are not cached (failed fetches, or an empty listing worth re-checking)."""
+    if not events:
+        return
+    entry = (time.time(), list(events))
+    _entries[source_id] = entry
+    if _persist_enabled():
+        try:
+            await _store(source_id, entry)
+        except Exception as e:
+            logger.warning("Failed to persist event cache for %s: %s", source_id, e)
+
+
+async def _load(source_id: str) -> Optional[Tuple[float, List[Event]]]:
+    async with aiosqlite.connect(get_db_path()) as conn:
+        cursor = await conn.execute(
+            "SELECT fetched_at, events_json FROM event_cache WHERE source = ?", (source_id,)
+        )
+        row = await cursor.fetchone()
+    if row is None:
+        return None
+    try:
+        events = [Event.from_dict(d) for d in json.loads(row[1])]
+    except Exception as e:
+        logger.warning("Discarding unreadable event cache for %s: %s", source_id, e)
+        return None
+    return (float(row[0]), events)
+
+
+async def _store(source_id: str, entry: Tuple[float, List[Event]]) -> None:
+    fetched_at, events = entry
+    payload = json.dumps([e.to_dict() for e in events])
+    async with aiosqlite.connect(get_db_path()) as conn:
+        await conn.execute(
+            "INSERT OR REPLACE INTO event_cache (source, fetched_at, events_json) VALUES (?, ?, ?)",
+            (source_id, fetched_at, payload),
+        )
+        await conn.commit()
@@ -0,0 +1,113 @@
+"""
+Catalog of every event seen by a run, with a full-text index for /search.
+
+upsert_events() runs after each fetch: new events are inserted and known ones
+only get last_seen_at (and any changed venue/status) updated. The events_fts
+index (storage/db.py FTS_SCHEMA) is maintained by triggers.
+"""
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from models import Event
+from storage.db import get_db_path
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+TBA = "TBA"
+
+
+@dataclass
+class SearchPage:
+    rows: List[dict]  # source, title, venue, date_normalized, url, status
+    total: int
+
+
+async def upsert_events(events: Iterable[Event]) -> int:
+    """Insert or refresh events in one transaction. Returns number of events written."""
+    now = datetime.utcnow().isoformat() + "Z"
+    rows = [
+        (e.source.value, e.url or "", e.title, e.venue or "", e.date_raw, e.date_normalized or TBA, e.status, now, now)
+        for e in events
+    ]
+    if not rows:
+        return 0
+    async with aiosqlite.connect(get_db_path()) as conn:
+        await conn.executemany(
+            """INSERT INTO events
+               (source, url, title, venue, date_raw, date_normalized, status, first_seen_at, last_seen_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(source, url, title, date_normalized) DO UPDATE SET
+                   venue = excluded.venue,
+                   date_raw = excluded.date_raw,
+                   status = excluded.status,
+                   last_seen_at = excluded.last_seen_at""",
+            rows,
+        )
+        await conn.commit()
+    return len(rows)
+
+
+def _fts_query(text: str) -> str:
+    """User text -> FTS5 query: every word must match, as a prefix; quotes neutralize operators."""
+    terms = [t.replace('"', '""') for t in text.split()]
+    return " ".join(f'"{t}"*' for t in terms if t)
+
+
+async def search(
+    text: str,
+    *,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    source: Optional[str] = None,
+    limit: int = 10,
+    offset: int = 0,
+) -> SearchPage:
+    """
+    Events whose title or venue match text, soonest first (TBA last).
+    date_from/date_to (YYYY-MM-DD, inclusive) exclude TBA events.
+    """
+    where: List[str] = []
+    params: List = []
+    if date_from or date_to:
+        where.append("e.date_normalized != ?")
+        params.append(TBA)
+    if date_from:
+        where.append("e.date_normalized >= ?")
+        params.append(date_from)
+    if date_to:
+        where.append("e.date_normalized <= ?")
+        params.append(date_to)
+    if source:
+        where.append("e.source = ?")
+        params.append(source)
+
+    async with aiosqlite.connect(get_db_path()) as conn:
+        conn.row_factory = aiosqlite.Row
+        try:
+            return await _search(conn, "e.id IN (SELECT rowid FROM events_fts WHERE events_fts MATCH ?)",
+                                 [_fts_query(text)], where, params, limit, offset)
+        except aiosqlite.OperationalError as e:
+            if "events_fts" not in str(e):
+                raise
+        # SQLite without FTS5: plain substring search over the same columns
+        like = f"%{text.strip()}%"
+        return await _search(conn, "(e.title LIKE ? OR e.venue LIKE ?)", [like, like], where, params, limit, offset)
+
+
+async def _search(conn, match_sql: str, match_params: List, where: List[str], params: List,
+                  limit: int, offset: int) -> SearchPage:
+    clause = " AND ".join([match_sql, *where])
+    all_params = [*match_params, *params]
+    cursor = await conn.execute(f"SELECT COUNT(*) FROM events e WHERE {clause}", all_params)
+    total = (await cursor.fetchone())[0]
+    cursor = await conn.execute(
+        f"""SELECT e.source, e.title, e.venue, e.date_normalized, e.url, e.status
+            FROM events e WHERE {clause}
+            ORDER BY e.date_normalized = ?, e.date_normalized, e.title
+            LIMIT ? OFFSET ?""",
+        [*all_params, TBA, limit, offset],
+    )
+    return SearchPage(rows=[dict(r) for r in await cursor.fetchall()], total=total)
@@ -0,0 +1,214 @@
+"""
+Durable job queue in SQLite for the split deployment (SCRAPE_MODE=worker).
+
+The bot enqueues pipeline jobs (see pipeline.trigger_run); one or more worker
+processes (worker.py) claim them, run them and store the result. A claim is a
+lease: the worker extends lease_until while the job runs, and a job whose
+worker died is claimed again once the lease expires, up to MAX_ATTEMPTS.
+Claiming happens inside BEGIN IMMEDIATE, so two workers never get the same job.
+
+Jobs run one at a time across all workers: nothing is claimed while another
+job holds a live lease. That keeps the single-flight guarantee of the inline
+mode (pipeline.RunCoordinator): a poll of a few sources never scrapes or
+writes notification_history alongside a full run. Extra workers are standbys
+that take over when the active one dies.
+"""
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from storage.db import get_db_path
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+
+FINISHED = (STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED)
+
+KIND_RUN = "run"
+KIND_PREWARM = "prewarm"
+
+# A job whose worker stopped extending its lease this many times is given up
+MAX_ATTEMPTS = 3
+
+
+@dataclass
+class Job:
+    id: int
+    kind: str
+    payload: Dict
+    status: str
+    attempts: int
+    cancel_requested: bool
+    progress: List[Dict]
+    result: Optional[Dict]
+    last_error: Optional[str]
+
+
+def _job(row: aiosqlite.Row) -> Job:
+    return Job(
+        id=row["id"],
+        kind=row["kind"],
+        payload=json.loads(row["payload_json"] or "{}"),
+        status=row["status"],
+        attempts=row["attempts"],
+        cancel_requested=bool(row["cancel_requested"]),
+        progress=json.loads(row["progress_json"] or "[]"),
+        result=json.loads(row["result_json"]) if row["result_json"] else None,
+        last_error=row["last_error"],
+    )
+
+
+async def enqueue(kind: str, payload: Dict) -> Tuple[int, bool]:
+    """
+    Queue a job. An identical job still pending or running is reused instead
+    (like attaching to a run in flight). Returns (job id, True if reused).
+    """
+    payload_json = json.dumps(payload, sort_keys=True)
+    async with aiosqlite.connect(get_db_path()) as conn:
+        await conn.execute("BEGIN IMMEDIATE")
+        cursor = await conn.execute(
+            """SELECT id FROM job_queue
+               WHERE status IN (?, ?) AND kind = ? AND payload_json = ? AND cancel_requested = 0
+               ORDER BY id LIMIT 1""",
+            (STATUS_PENDING, STATUS_RUNNING, kind, payload_json),
+        )
+        row = await cursor.fetchone()
+        if row is not None:
+            await conn.commit()
+            return row[0], True
+        cursor = await conn.execute(
+            "INSERT INTO job_queue (kind, payload_json, status, created_at) VALUES (?, ?, ?, ?)",
+            (kind, payload_json, STATUS_PENDING, time.time()),
+        )
+        await conn.commit()
+        return cursor.lastrowid, False
+
+
+async def claim(worker_id: str, lease_seconds: float) -> Optional[Job]:
+    """
+    Take the oldest pending job, or one whose lease expired. None if there is
+    nothing to do, or another worker holds a job under a live lease.
+    """
+    now = time.time()
+    async with aiosqlite.connect(get_db_path()) as conn:
+        conn.row_factory = aiosqlite.Row
+        await conn.execute("BEGIN IMMEDIATE")
+        # Jobs abandoned by dead workers too often are not retried forever
+        await conn.execute(
+            """UPDATE job_queue SET status = ?, finished_at = ?, last_error = 'lease expired'
+               WHERE status = ? AND lease_until < ? AND attempts >= ?""",
+            (STATUS_FAILED, now, STATUS_RUNNING, now, MAX_ATTEMPTS),
+        )
+        busy = await (await conn.execute(
+            "SELECT 1 FROM job_queue WHERE status = ? AND lease_until >= ? LIMIT 1",
+            (STATUS_RUNNING, now),
+        )).fetchone()
+        if busy is not None:
+            await conn.commit()
+            return None
+        cursor = await conn.execute(
+            """SELECT * FROM job_queue
+               WHERE status = ? OR (status = ? AND lease_until < ?)
+               ORDER BY id LIMIT 1""",
+            (STATUS_PENDING, STATUS_RUNNING, now),
+        )
+        row = await cursor.fetchone()
+        if row is None:
+            await conn.commit()
+            return None
+        if row["status"] == STATUS_RUNNING:
+            logger.warning("Job %d: lease of %s expired; reclaiming", row["id"], row["worker_id"])
+        await conn.execute(
+            """UPDATE job_queue
+               SET status = ?, worker_id = ?, attempts = attempts + 1, lease_until = ?,
+                   started_at = ?, progress_json = NULL
+               WHERE id = ?""",
+            (STATUS_RUNNING, worker_id, now + lease_seconds, now, row["id"]),
+        )
+        await conn.commit()
+    job = _job(row)
+    job.status, job.attempts, job.progress = STATUS_RUNNING, job.attempts + 1, []
+    return job
+
+
+async def heartbeat(job_id: int, worker_id: str, lease_seconds: float, progress: List[Dict]) -> bool:
+    """
+    Extend the lease and publish progress. Returns False if the job should stop:
+    cancellation was requested, or the lease was lost to another worker.
+    """
+    async with aiosqlite.connect(get_db_path()) as conn:
+        cursor = await conn.execute(
+            """UPDATE job_queue SET lease_until = ?, progress_json = ?
+               WHERE id = ? AND worker_id = ? AND status = ?""",
+            (time.time() + lease_seconds, json.dumps(progress), job_id, worker_id, STATUS_RUNNING),
+        )
+        await conn.commit()
+        if cursor.rowcount != 1:
+            return False
+        row = await (await conn.execute(
+            "SELECT cancel_requested FROM job_queue WHERE id = ?", (job_id,)
+        )).fetchone()
+    return not row[0]
+
+
+async def finish(
+    job_id: int,
+    worker_id: str,
+    status: str,
+    *,
+    result: Optional[Dict] = None,
+    error: Optional[str] = None,
+) -> None:
+    """Record the outcome (STATUS_DONE, STATUS_FAILED or STATUS_CANCELLED) of a job this worker holds."""
+    async with aiosqlite.connect(get_db_path()) as conn:
+        await conn.execute(
+            """UPDATE job_queue SET status = ?, result_json = ?, last_error = ?, finished_at = ?
+               WHERE id = ? AND worker_id = ?""",
+            (status, json.dumps(result) if result is not None else None, error, time.time(), job_id, worker_id),
+        )
+        await conn.commit()
+
+
+async def get(job_id: int) -> Optional[Job]:
+    async with aiosqlite.connect(get_db_path()) as conn:
+        conn.row_factory = aiosqlite.Row
+        cursor = await conn.execute("SELECT * FROM job_queue WHERE id = ?", (job_id,))
+        row = await cursor.fetchone()
+    return _job(row) if row else None
+
+
+async def has_active(kind: str) -> bool:
+    """True if a job of this kind is pending or running."""
+    async with aiosqlite.connect(get_db_path()) as conn:
+        cursor = await conn.execute(
+            "SELECT 1 FROM job_queue WHERE kind = ? AND status IN (?, ?) LIMIT 1",
+            (kind, STATUS_PENDING, STATUS_RUNNING),
+        )
+        return await cursor.fetchone() is not None
+
+
+async def cancel_active(kind: str) -> int:
+    """
+    Cancel pending jobs of this kind and ask workers to stop running ones.
+    Returns the number of jobs affected.
+    """
+    async with aiosqlite.connect(get_db_path()) as conn:
+        cursor = await conn.execute(
+            "UPDATE job_queue SET status = ?, finished_at = ? WHERE kind = ? AND status = ?",
+            (STATUS_CANCELLED, time.time(), kind, STATUS_PENDING),
+        )
+        n = cursor.rowcount
+        cursor = await conn.execute(
+            "UPDATE job_queue SET cancel_requested = 1 WHERE kind = ? AND status = ?",
+            (kind, STATUS_RUNNING),
+        )
+        await conn.commit()
+    return n + cursor.rowcount
@@ -0,0 +1,173 @@
+"""
+Retention and compaction, run daily by the scheduler (scheduler/jobs.py).
+
+- notification_history rows for concerts dated more than HISTORY_RETENTION_DAYS
+  ago are deleted, or moved to notification_history_archive when
+  HISTORY_ARCHIVE=1. A past concert is never listed again, so its dedupe row
+  is dead weight in every lookup.
+- TBA rows have no date to age out on; they are kept until notified more than
+  TBA_RETENTION_DAYS ago (0 keeps them forever), since dropping one while the
+  event is still listed would notify it again.
+- Past-dated rows in events (/search), delivered outbox rows and finished
+  worker jobs older than the same horizon are deleted; runs beyond the newest
+  RUNS_KEEP are trimmed with their run_metrics.
+- Free pages are returned to the OS with incremental VACUUM, then PRAGMA optimize.
+  Older databases first need one full VACUUM; when it fails (e.g. another
+  process holds the database) the report says so and the next run tries again.
+"""
+import json
+import logging
+import os
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+from storage.db import get_db_path
+from storage import job_queue
+from storage import settings
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_RETENTION_DAYS = 90
+DEFAULT_TBA_RETENTION_DAYS = 365
+DEFAULT_RUNS_KEEP = 1000
+
+REPORT_KEY = "last_maintenance_json"
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.environ.get(name, default)))
+    except ValueError:
+        logger.warning("Invalid %s; using %d", name, default)
+        return default
+
+
+async def _db_bytes(conn: aiosqlite.Connection) -> int:
+    page_count = (await (await conn.execute("PRAGMA page_count")).fetchone())[0]
+    page_size = (await (await conn.execute("PRAGMA page_size")).fetchone())[0]
+    return page_count * page_size
+
+
+async def _freelist_pages(conn: aiosqlite.Connection) -> int:
+    return (await (await conn.execute("PRAGMA freelist_count")).fetchone())[0]
+
+
+async def _sync_archive_columns(conn: aiosqlite.Connection) -> List[str]:
+    """Create the archive table, or add columns migrated into notification_history since. Returns the columns."""
+    await conn.execute(
+        "CREATE TABLE IF NOT EXISTS notification_history_archive AS "
+        "SELECT * FROM notification_history WHERE 0"
+    )
+    source = await (await conn.execute("PRAGMA table_info(notification_history)")).fetchall()
+    archived = {r[1] for r in await (await conn.execute("PRAGMA table_info(notification_history_archive)")).fetchall()}
+    for r in source:
+        if r[1] not in archived:
+            await conn.execute(f"ALTER TABLE notification_history_archive ADD COLUMN {r[1]} {r[2]}")
+    return [r[1] for r in source]
+
+
+async def run_maintenance() -> Dict:
+    """Apply retention and compact the database. Returns the report (also saved in settings)."""
+    t0 = time.perf_counter()
+    history_days = _env_int("HISTORY_RETENTION_DAYS", DEFAULT_HISTORY_RETENTION_DAYS)
+    tba_days = _env_int("TBA_RETENTION_DAYS", DEFAULT_TBA_RETENTION_DAYS)
+    runs_keep = _env_int("RUNS_KEEP", DEFAULT_RUNS_KEEP)
+    archive = os.environ.get("HISTORY_ARCHIVE", "").strip() == "1"
+
+    date_cutoff = (date.today() - timedelta(days=history_days)).isoformat()
+    # Stored timestamps are ISO strings; compare on the same format
+    time_cutoff = (datetime.utcnow() - timedelta(days=history_days)).isoformat() + "Z"
+    tba_cutoff = (datetime.utcnow() - timedelta(days=tba_days)).isoformat() + "Z"
+
+    history_where = "(date_normalized != 'TBA' AND date_normalized < ?)"
+    history_params = [date_cutoff]
+    if tba_days:
+        history_where += " OR (date_normalized = 'TBA' AND notified_at < ?)"
+        history_params.append(tba_cutoff)
+
+    deleted: Dict[str, int] = {}
+    vacuum_error = None
+    async with aiosqlite.connect(get_db_path()) as conn:
+        bytes_before = await _db_bytes(conn)
+
+        if archive:
+            columns = await _sync_archive_columns(conn)
+            cols = ", ".join(columns)
+            cursor = await conn.execute(
+                f"INSERT INTO notification_history_archive ({cols}) "
+                f"SELECT {cols} FROM notification_history WHERE {history_where}",
+                history_params,
+            )
+            deleted["history_archived"] = cursor.rowcount
+        cursor = await conn.execute(f"DELETE FROM notification_history WHERE {history_where}", history_params)
+        deleted["history"] = cursor.rowcount
+
+        cursor = await conn.execute(
+            "DELETE FROM events WHERE date_normalized != 'TBA' AND date_normalized < ?", (date_cutoff,)
+        )
+        deleted["events"] = cursor.rowcount
+        cursor = await conn.execute(
+            "DELETE FROM outbox WHERE status = 'delivered' AND delivered_at < ?", (time_cutoff,)
+        )
+        deleted["outbox"] = cursor.rowcount
+        cursor = await conn.execute(
+            "DELETE FROM job_queue WHERE status IN (?, ?, ?) AND finished_at < ?",
+            (*job_queue.FINISHED, time.time() - history_days * 86400),
+        )
+        deleted["jobs"] = cursor.rowcount
+
+        if runs_keep:
+            keep_from = await (await conn.execute(
+                "SELECT id FROM runs ORDER BY id DESC LIMIT 1 OFFSET ?", (runs_keep - 1,)
+            )).fetchone()
+            if keep_from is not None:
+                # Foreign keys are not enforced, so delete the metrics explicitly
+                cursor = await conn.execute("DELETE FROM run_metrics WHERE run_id < ?", (keep_from[0],))
+                deleted["run_metrics"] = cursor.rowcount
+                cursor = await conn.execute("DELETE FROM runs WHERE id < ?", (keep_from[0],))
+                deleted["runs"] = cursor.rowcount
+        await conn.commit()
+
+        # Databases created before auto_vacuum was enabled need one full VACUUM to switch modes
+        auto_vacuum = (await (await conn.execute("PRAGMA auto_vacuum")).fetchone())[0]
+        if auto_vacuum != 2:
+            await conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            try:
+                await conn.execute("VACUUM")
+            except aiosqlite.OperationalError as e:
+                # e.g. SQLITE_BUSY while a worker writes; auto_vacuum is still off, so this retries next run
+                vacuum_error = str(e)
+                logger.warning("Maintenance: full VACUUM failed (%s); will retry on the next run", e)
+            else:
+                logger.info("Maintenance: switched database to incremental auto_vacuum")
+            reclaimed = max(0, bytes_before - await _db_bytes(conn))
+        else:
+            page_size = (await (await conn.execute("PRAGMA page_size")).fetchone())[0]
+            free_before = await _freelist_pages(conn)
+            # Through execute() incremental_vacuum is stepped once and frees a single page;
+            # executescript runs it to completion
+            await conn.executescript("PRAGMA incremental_vacuum;")
+            reclaimed = (free_before - await _freelist_pages(conn)) * page_size
+        await conn.execute("PRAGMA optimize")
+        bytes_after = await _db_bytes(conn)
+
+    report = {
+        "at": datetime.utcnow().isoformat() + "Z",
+        "deleted": {k: v for k, v in deleted.items() if v},
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "reclaimed_bytes": reclaimed,
+        "duration_ms": int((time.perf_counter() - t0) * 1000),
+    }
+    if vacuum_error:
+        report["vacuum_error"] = vacuum_error
+    await settings.set_setting(REPORT_KEY, json.dumps(report))
+    logger.info(
+        "Maintenance: deleted %s, reclaimed %d KB in %d ms",
+        report["deleted"] or "nothing",
+        report["reclaimed_bytes"] // 1024,
+        report["duration_ms"],
+    )
+    return report
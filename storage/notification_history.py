@@ -1,48 +1,132 @@
 """
-Notification history for deduplication: (artist, venue, date_normalized).
+Notification history for deduplication: (user_id, artist, venue, date_normalized).
 """
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from storage.db import get_db_path
+from storage import outbox
+from storage.users import OWNER
 import aiosqlite
 
+# (user_id, artist, venue, date_normalized)
+Key = Tuple[int, str, str, str]
 
-async def exists(artist: str, venue: str, date_normalized: str) -> bool:
-    """Return True if this (artist, venue, date_normalized) was already notified."""
+
+async def _existing(conn: aiosqlite.Connection, keys: Set[Key]) -> Set[Key]:
+    """Keys already in history, in one indexed join however many users and matches."""
+    if not keys:
+        return set()
+    await conn.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS candidate_keys (user_id, artist, venue, date_normalized)"
+    )
+    await conn.execute("DELETE FROM candidate_keys")
+    await conn.executemany("INSERT INTO candidate_keys VALUES (?, ?, ?, ?)", keys)
+    cursor = await conn.execute(
+        """SELECT k.user_id, k.artist, k.venue, k.date_normalized
+           FROM candidate_keys k
+           JOIN notification_history h
+             ON h.user_id = k.user_id AND h.artist = k.artist
+            AND h.venue = k.venue AND h.date_normalized = k.date_normalized"""
+    )
+    return {tuple(r) for r in await cursor.fetchall()}
+
+
+async def existing_keys(keys: Iterable[Key]) -> Set[Key]:
+    """Return the subset of keys already in history (one query for the whole batch)."""
     async with aiosqlite.connect(get_db_path()) as conn:
-        cursor = await conn.execute(
-            """SELECT 1 FROM notification_history
-               WHERE artist = ? AND venue = ? AND date_normalized = ?""",
-            (artist, venue, date_normalized),
-        )
-        row = await cursor.fetchone()
-        return row is not None
-
-
-async def insert(
-    artist: str,
-    venue: str,
-    date_normalized: str,
-    event_title: Optional[str],
-    event_url: Optional[str],
-    source: Optional[str],
-) -> None:
-    """Record that we notified for this (artist, venue, date_normalized)."""
+        return await _existing(conn, set(keys))
+
+
+async def record_new(
+    entries: List[Tuple[Key, Optional[str], Optional[str], Optional[str], Optional[str], Optional[int]]],
+) -> List[int]:
+    """
+    entries: (key, event_title, event_url, source, outbox_text, chat_id). In one
+    transaction, insert each key not yet in history and, when outbox_text is set,
+    queue it in the outbox for chat_id (None: the owner's chat). Returns indexes
+    of entries that were new. A crash before commit leaves neither table changed,
+    so a match is never recorded without its notification.
+    """
     now = datetime.utcnow().isoformat() + "Z"
+    new_indexes: List[int] = []
     async with aiosqlite.connect(get_db_path()) as conn:
-        await conn.execute(
-            """INSERT INTO notification_history
-               (artist, venue, date_normalized, event_title, event_url, source, first_seen_at, notified_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-            (artist, venue, date_normalized, event_title or "", event_url or "", source or "", now, now),
-        )
+        known = await _existing(conn, {e[0] for e in entries})
+        for i, (key, title, url, source, text, chat_id) in enumerate(entries):
+            if key in known:
+                continue
+            # OR IGNORE: the same key twice in this batch, or another writer in between
+            cursor = await conn.execute(
+                """INSERT OR IGNORE INTO notification_history
+                   (user_id, artist, venue, date_normalized, event_title, event_url, source, first_seen_at, notified_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (*key, title or "", url or "", source or "", now, now),
+            )
+            if cursor.rowcount != 1:
+                continue
+            new_indexes.append(i)
+            if text is not None:
+                await outbox.insert_pending(conn, text, history_id=cursor.lastrowid, chat_id=chat_id)
         await conn.commit()
+    if any(entries[i][4] is not None for i in new_indexes):
+        outbox.notify_listeners()
+    return new_indexes
 
 
-async def clear_all() -> int:
-    """Delete all notification history. Returns number of rows deleted."""
+async def clear_all(user_id: int = OWNER) -> int:
+    """Delete one user's notification history. Returns number of rows deleted."""
     async with aiosqlite.connect(get_db_path()) as conn:
-        cursor = await conn.execute("DELETE FROM notification_history")
+        cursor = await conn.execute("DELETE FROM notification_history WHERE user_id = ?", (user_id,))
         await conn.commit()
         return cursor.rowcount
+
+
+async def page(
+    *,
+    user_id: int = OWNER,
+    artist: Optional[str] = None,
+    venue: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    before_id: Optional[int] = None,
+    limit: int = 10,
+) -> Tuple[List[Dict], bool]:
+    """
+    One user's notifications, most recently notified first. artist/venue are case-insensitive substrings;
+    date_from/date_to (YYYY-MM-DD, inclusive) filter on the concert date and
+    exclude TBA. Keyset pagination: pass the last row's id as before_id for the
+    next page (rows older than it by (notified_at, id)). Returns (rows, has_more).
+    """
+    where: List[str] = ["user_id = ?"]
+    params: List = [user_id]
+    if artist:
+        where.append("artist LIKE ?")
+        params.append(f"%{artist}%")
+    if venue:
+        where.append("venue LIKE ?")
+        params.append(f"%{venue}%")
+    if date_from or date_to:
+        where.append("date_normalized != 'TBA'")
+    if date_from:
+        where.append("date_normalized >= ?")
+        params.append(date_from)
+    if date_to:
+        where.append("date_normalized <= ?")
+        params.append(date_to)
+    if before_id is not None:
+        where.append(
+            "(notified_at, id) < (SELECT notified_at, id FROM notification_history WHERE id = ?)"
+        )
+        params.append(before_id)
+    clause = f"WHERE {' AND '.join(where)}"
+    async with aiosqlite.connect(get_db_path()) as conn:
+        conn.row_factory = aiosqlite.Row
+        cursor = await conn.execute(
+            f"""SELECT id, artist, venue, date_normalized, event_title, event_url, source, notified_at
+                FROM notification_history {clause}
+                ORDER BY notified_at DESC, id DESC
+                LIMIT ?""",
+            [*params, limit + 1],
+        )
+        rows = [dict(r) for r in await cursor.fetchall()]
+    return rows[:limit], len(rows) > limit
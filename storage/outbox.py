@@ -0,0 +1,114 @@
+"""
+Outbox of notification messages: rows are written as pending together with
+their notification_history row, and marked delivered only after Telegram
+acknowledges the send (see bot/outbox_sender.py).
+"""
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from storage.db import get_db_path
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_DELIVERED = "delivered"
+STATUS_FAILED = "failed"
+
+# Give up on a row after this many failed sends (e.g. a message Telegram always rejects)
+MAX_ATTEMPTS = 8
+
+# In-process callbacks run after new rows are committed (wakes the sender)
+_listeners: List[Callable[[], None]] = []
+
+
+def add_listener(callback: Callable[[], None]) -> None:
+    _listeners.append(callback)
+
+
+def notify_listeners() -> None:
+    for callback in _listeners:
+        try:
+            callback()
+        except Exception as e:
+            logger.warning("Outbox listener failed: %s", e)
+
+
+async def insert_pending(
+    conn: aiosqlite.Connection,
+    text: str,
+    *,
+    history_id: Optional[int] = None,
+    chat_id: Optional[int] = None,
+) -> None:
+    """Queue text for chat_id (None: the owner's chat) inside the caller's transaction (caller commits)."""
+    await conn.execute(
+        "INSERT INTO outbox (history_id, chat_id, text, status, created_at) VALUES (?, ?, ?, ?, ?)",
+        (history_id, chat_id, text, STATUS_PENDING, datetime.utcnow().isoformat() + "Z"),
+    )
+
+
+async def queue_message(text: str, *, chat_id: Optional[int] = None) -> None:
+    """Queue a standalone message (no history row), e.g. a warning from a worker process."""
+    async with aiosqlite.connect(get_db_path()) as conn:
+        await insert_pending(conn, text, chat_id=chat_id)
+        await conn.commit()
+    notify_listeners()
+
+
+async def fetch_pending(limit: int, *, include_owner: bool = True) -> List[Dict]:
+    """
+    Oldest pending rows first: dicts with id, chat_id (None: owner's chat), text, attempts.
+    include_owner=False leaves out rows for the owner's chat (e.g. while it is unknown).
+    """
+    owner_filter = "" if include_owner else " AND chat_id IS NOT NULL"
+    async with aiosqlite.connect(get_db_path()) as conn:
+        conn.row_factory = aiosqlite.Row
+        cursor = await conn.execute(
+            f"SELECT id, chat_id, text, attempts FROM outbox WHERE status = ?{owner_filter} ORDER BY id LIMIT ?",
+            (STATUS_PENDING, limit),
+        )
+        return [dict(r) for r in await cursor.fetchall()]
+
+
+async def mark_delivered(ids: List[int]) -> None:
+    now = datetime.utcnow().isoformat() + "Z"
+    async with aiosqlite.connect(get_db_path()) as conn:
+        await conn.executemany(
+            "UPDATE outbox SET status = ?, delivered_at = ?, attempts = attempts + 1 WHERE id = ?",
+            [(STATUS_DELIVERED, now, i) for i in ids],
+        )
+        await conn.commit()
+
+
+async def mark_failed(ids: List[int], error: str) -> None:
+    """Record a failed attempt; rows reaching MAX_ATTEMPTS stop being retried."""
+    async with aiosqlite.connect(get_db_path()) as conn:
+        await conn.executemany(
+            """UPDATE outbox
+               SET attempts = attempts + 1, last_error = ?,
+                   status = CASE WHEN attempts + 1 >= ? THEN ? ELSE status END
+               WHERE id = ?""",
+            [(error[:500], MAX_ATTEMPTS, STATUS_FAILED, i) for i in ids],
+        )
+        await conn.commit()
+
+
+async def count_by_status() -> Dict[str, int]:
+    """Counts of undelivered rows: {"pending": n, "failed": m} (missing keys are 0)."""
+    async with aiosqlite.connect(get_db_path()) as conn:
+        cursor = await conn.execute(
+            "SELECT status, COUNT(*) FROM outbox WHERE status IN (?, ?) GROUP BY status",
+            (STATUS_PENDING, STATUS_FAILED),
+        )
+        return {row[0]: row[1] for row in await cursor.fetchall()}
+
+
+async def count_pending(chat_id: Optional[int]) -> int:
+    """Pending rows for one chat (None: rows addressed to the owner's chat)."""
+    async with aiosqlite.connect(get_db_path()) as conn:
+        cursor = await conn.execute(
+            "SELECT COUNT(*) FROM outbox WHERE status = ? AND chat_id IS ?", (STATUS_PENDING, chat_id)
+        )
+        return (await cursor.fetchone())[0]
@@ -0,0 +1,110 @@
+"""
+Run history: one row per pipeline run plus per-stage / per-source timings.
+"""
+import json
+from typing import Dict, List
+
+from storage.db import get_db_path
+import aiosqlite
+
+SCOPE_STAGE = "stage"
+SCOPE_SOURCE = "source"
+
+# Nearest-rank percentiles over the last N runs, per (scope, name).
+# Rows are ranked by duration inside each partition, so MIN(duration) over the
+# rows at or above rank p*cnt is the p-th percentile. The window's runs drive
+# the query (CROSS JOIN keeps them the outer loop), each looking up its metrics
+# through idx_run_metrics_run, so cost follows the window, not the table.
+_LATENCY_SQL = """
+WITH window_runs AS (
+    SELECT id FROM runs ORDER BY id DESC LIMIT ? OFFSET ?
+),
+ranked AS (
+    SELECT m.scope, m.name, m.duration_ms, m.events_count, m.error_count,
+           ROW_NUMBER() OVER (PARTITION BY m.scope, m.name ORDER BY m.duration_ms) AS rn,
+           COUNT(*) OVER (PARTITION BY m.scope, m.name) AS cnt
+    FROM window_runs w
+    CROSS JOIN run_metrics m ON m.run_id = w.id
+)
+SELECT scope, name, MAX(cnt) AS runs,
+       MIN(CASE WHEN rn >= 0.50 * cnt THEN duration_ms END) AS p50_ms,
+       MIN(CASE WHEN rn >= 0.95 * cnt THEN duration_ms END) AS p95_ms,
+       AVG(events_count) AS avg_events,
+       SUM(error_count) AS errors
+FROM ranked
+GROUP BY scope, name
+ORDER BY scope DESC, name
+"""
+
+
+async def record_run(
+    *,
+    started_at: str,
+    finished_at: str,
+    status: str,
+    events_scanned_total: int,
+    matches_total: int,
+    notifications_queued: int,
+    errors: List[str],
+    duration_ms: int,
+    metrics: List[Dict],
+) -> int:
+    """
+    Insert a finished run and its metrics in one transaction. Returns the run id.
+    Each metric dict has scope, name, duration_ms and optionally events_count, error_count.
+    """
+    async with aiosqlite.connect(get_db_path()) as conn:
+        cursor = await conn.execute(
+            """INSERT INTO runs
+               (started_at, finished_at, status, events_scanned_total, matches_total,
+                notifications_sent, errors_json, duration_ms)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                started_at,
+                finished_at,
+                status,
+                events_scanned_total,
+                matches_total,
+                notifications_queued,  # stored in runs.notifications_sent
+                json.dumps(errors),
+                duration_ms,
+            ),
+        )
+        run_id = cursor.lastrowid
+        await conn.executemany(
+            """INSERT INTO run_metrics (run_id, scope, name, duration_ms, events_count, error_count)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            [
+                (
+                    run_id,
+                    m["scope"],
+                    m["name"],
+                    int(m["duration_ms"]),
+                    int(m.get("events_count", 0)),
+                    int(m.get("error_count", 0)),
+                )
+                for m in metrics
+            ],
+        )
+        await conn.commit()
+        return run_id
+
+
+async def latency_stats(last_n: int, *, offset: int = 0) -> List[Dict]:
+    """
+    p50/p95 duration per stage and per source over the last_n runs (skipping the
+    newest `offset` runs). Returns dicts: scope, name, runs, p50_ms, p95_ms, avg_events, errors.
+    """
+    async with aiosqlite.connect(get_db_path()) as conn:
+        conn.row_factory = aiosqlite.Row
+        cursor = await conn.execute(_LATENCY_SQL, (last_n, offset))
+        rows = await cursor.fetchall()
+        return [dict(r) for r in rows]
+
+
+async def count_runs() -> int:
+    async with aiosqlite.connect(get_db_path()) as conn:
+        cursor = await conn.execute("SELECT COUNT(*) FROM runs")
+        row = await cursor.fetchone()
+        return row[0] if row else 0
+
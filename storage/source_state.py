@@ -0,0 +1,99 @@
+"""
+Per-source change tracking: content hash of the last scrape and an estimate of
+how often the source changes, used by the adaptive poller (scheduler/cadence.py).
+
+The change rate is an exponentially decayed Poisson estimate: every scrape adds
+the time since the previous one to observed_seconds and 1 to changes_weighted
+if the content hash differs, both decayed with a CHANGE_HALF_LIFE half-life so
+the rate follows a source whose publishing habits shift.
+"""
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+from models import Event
+from storage.db import get_db_path
+import aiosqlite
+
+CHANGE_HALF_LIFE = 7 * 86400  # seconds
+# New sources start as if seen changing once a day
+PRIOR_CHANGES = 1.0
+PRIOR_OBSERVED = 86400.0
+
+
+@dataclass
+class SourceState:
+    source: str
+    content_hash: Optional[str]
+    last_checked_at: float
+    last_changed_at: Optional[float]
+    checks: int
+    changes_weighted: float
+    observed_seconds: float
+
+    @property
+    def change_rate(self) -> float:
+        """Estimated content changes per second."""
+        return self.changes_weighted / max(self.observed_seconds, 1.0)
+
+
+def content_hash(events: Iterable[Event]) -> str:
+    """Order-independent hash of what a source lists (title, venue, date, url)."""
+    lines = sorted(f"{e.title}\x1f{e.venue}\x1f{e.date_normalized}\x1f{e.url}" for e in events)
+    return hashlib.sha1("\n".join(lines).encode("utf-8")).hexdigest()
+
+
+async def load_all() -> Dict[str, SourceState]:
+    async with aiosqlite.connect(get_db_path()) as conn:
+        conn.row_factory = aiosqlite.Row
+        cursor = await conn.execute("SELECT * FROM source_state")
+        return {r["source"]: SourceState(**dict(r)) for r in await cursor.fetchall()}
+
+
+async def record_fetch(source: str, events: Iterable[Event], *, now: Optional[float] = None) -> bool:
+    """
+    Record a scrape attempt of source. Returns True if its content changed.
+    Every attempt stamps last_checked_at, so a failing source waits out its
+    interval like any other. A failed or empty scrape ([]) is not compared or
+    hashed: a listing that parses to nothing is far more often a broken or
+    blocked page than a real change, and hashing it would count two changes (to
+    empty and back) and make the source look busy. It counts as time observed
+    without a change.
+    """
+    events = list(events)
+    now = time.time() if now is None else now
+    digest = content_hash(events) if events else None
+    async with aiosqlite.connect(get_db_path()) as conn:
+        conn.row_factory = aiosqlite.Row
+        cursor = await conn.execute("SELECT * FROM source_state WHERE source = ?", (source,))
+        row = await cursor.fetchone()
+        if row is None:
+            # First sighting: a baseline, not a change
+            await conn.execute(
+                """INSERT INTO source_state
+                   (source, content_hash, last_checked_at, last_changed_at, checks, changes_weighted, observed_seconds)
+                   VALUES (?, ?, ?, NULL, 1, ?, ?)""",
+                (source, digest, now, PRIOR_CHANGES, PRIOR_OBSERVED),
+            )
+            await conn.commit()
+            return False
+        elapsed = max(0.0, now - row["last_checked_at"])
+        decay = 0.5 ** (elapsed / CHANGE_HALF_LIFE)
+        changed = digest is not None and row["content_hash"] is not None and row["content_hash"] != digest
+        await conn.execute(
+            """UPDATE source_state
+               SET content_hash = ?, last_checked_at = ?, last_changed_at = ?, checks = checks + 1,
+                   changes_weighted = ?, observed_seconds = ?
+               WHERE source = ?""",
+            (
+                digest or row["content_hash"],
+                now,
+                now if changed else row["last_changed_at"],
+                row["changes_weighted"] * decay + (1.0 if changed else 0.0),
+                row["observed_seconds"] * decay + elapsed,
+                source,
+            ),
+        )
+        await conn.commit()
+    return changed
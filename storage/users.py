@@ -0,0 +1,105 @@
+"""
+Users of a shared bot: the owner (user id OWNER, settings in the settings table,
+as in single-user mode) plus members listed in ALLOWED_USER_IDS, whose
+settings live in user_settings keyed by their Telegram user id.
+
+Each user has their own artists list and notification chat; the scrape and
+the schedule are shared (see pipeline.run).
+"""
+import logging
+import os
+from dataclasses import dataclass
+from typing import List, Optional, Set
+
+from storage.db import get_db_path
+from storage import settings
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+OWNER = 0
+
+ARTISTS_URL_KEY = "artists_list_url"
+CHAT_ID_KEY = "notification_chat_id"
+
+
+@dataclass(frozen=True)
+class Recipient:
+    user_id: int
+    chat_id: int
+    artists_url: str
+
+
+def allowed_user_ids() -> Set[int]:
+    """ALLOWED_USER_IDS: comma-separated Telegram user ids of members besides the owner."""
+    ids: Set[int] = set()
+    for part in os.environ.get("ALLOWED_USER_IDS", "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            ids.add(int(part))
+        except ValueError:
+            logger.warning("Ignoring invalid ALLOWED_USER_IDS entry %r", part)
+    return ids
+
+
+async def get_user_setting(user_id: int, key: str) -> Optional[str]:
+    if user_id == OWNER:
+        return await settings.get_setting(key)
+    async with aiosqlite.connect(get_db_path()) as conn:
+        cursor = await conn.execute(
+            "SELECT value FROM user_settings WHERE user_id = ? AND key = ?", (user_id, key)
+        )
+        row = await cursor.fetchone()
+        return row[0] if row else None
+
+
+async def set_user_setting(user_id: int, key: str, value: str) -> None:
+    if user_id == OWNER:
+        await settings.set_setting(key, value)
+        return
+    async with aiosqlite.connect(get_db_path()) as conn:
+        await conn.execute(
+            "INSERT OR REPLACE INTO user_settings (user_id, key, value) VALUES (?, ?, ?)",
+            (user_id, key, value),
+        )
+        await conn.commit()
+
+
+def _recipient(user_id: int, chat_raw: Optional[str], url: Optional[str]) -> Optional[Recipient]:
+    if not chat_raw or not url or not url.strip():
+        return None
+    try:
+        return Recipient(user_id=user_id, chat_id=int(chat_raw), artists_url=url.strip())
+    except ValueError:
+        return None
+
+
+async def recipients() -> List[Recipient]:
+    """Users with an artists list and a chat to notify: the owner first, then members."""
+    out: List[Recipient] = []
+    owner = _recipient(
+        OWNER, await settings.get_setting(CHAT_ID_KEY), await settings.get_setting(ARTISTS_URL_KEY)
+    )
+    if owner is not None:
+        out.append(owner)
+    members = allowed_user_ids()
+    if not members:
+        return out
+    async with aiosqlite.connect(get_db_path()) as conn:
+        cursor = await conn.execute(
+            "SELECT user_id, key, value FROM user_settings WHERE key IN (?, ?) ORDER BY user_id",
+            (CHAT_ID_KEY, ARTISTS_URL_KEY),
+        )
+        rows = await cursor.fetchall()
+    by_user: dict = {}
+    for user_id, key, value in rows:
+        by_user.setdefault(user_id, {})[key] = value
+    for user_id, values in by_user.items():
+        if user_id not in members:
+            continue  # removed from ALLOWED_USER_IDS: keep their data, stop notifying
+        r = _recipient(user_id, values.get(CHAT_ID_KEY), values.get(ARTISTS_URL_KEY))
+        if r is not None:
+            out.append(r)
+    return out
@@ -0,0 +1,117 @@
+"""
+Scraper/matcher worker for the split deployment: python worker.py
+
+With SCRAPE_MODE=worker the bot process only talks to Telegram: runs and
+pre-warms are queued in the job_queue table (storage/job_queue.py) and executed
+here. Results land where an in-process run writes them (events,
+notification_history, outbox, runs), so the bot's outbox sender delivers the
+notifications and /status reads the run as usual. Several workers may share the
+database; jobs still run one at a time (the others stand by, see
+storage/job_queue.py) under a lease the active worker renews while running.
+Workers keep the event cache in the database (EVENT_CACHE_PERSIST defaults to 1
+here), so a run reuses a pre-warm whichever worker did it.
+"""
+import asyncio
+import logging
+import os
+import signal
+import socket
+
+logging.basicConfig(
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    level=logging.INFO,
+)
+logger = logging.getLogger(__name__)
+
+IDLE_POLL_SECONDS = 2.0  # wait between claims when the queue is empty
+HEARTBEAT_SECONDS = 2.0  # lease renewal and progress publishing while a job runs
+LEASE_SECONDS = 60.0  # a job not renewed for this long is reclaimed by another worker
+
+
+async def _warn_owner(text: str) -> None:
+    """send_message for jobs: direct warnings go to the owner's chat via the outbox."""
+    from storage import outbox
+    await outbox.queue_message(text)
+
+
+async def _execute(job, worker_id: str) -> None:
+    from pipeline import coordinator, execute_job
+    from storage import job_queue
+
+    progress = []
+    task = asyncio.create_task(execute_job(job.kind, job.payload, _warn_owner, progress.append))
+    while not task.done():
+        await asyncio.wait({task}, timeout=HEARTBEAT_SECONDS)
+        if task.done():
+            break
+        if not await job_queue.heartbeat(job.id, worker_id, LEASE_SECONDS, progress):
+            logger.info("Job %d: cancelled or lease lost; stopping", job.id)
+            coordinator.cancel()
+            task.cancel()
+            await asyncio.wait({task})
+            break
+    try:
+        result = task.result()
+    except asyncio.CancelledError:
+        await job_queue.finish(job.id, worker_id, job_queue.STATUS_CANCELLED)
+        return
+    except Exception as e:
+        logger.exception("Job %d (%s) failed: %s", job.id, job.kind, e)
+        await job_queue.finish(job.id, worker_id, job_queue.STATUS_FAILED, error=str(e))
+        return
+    # Publish the last sources' progress before the result, for callers replaying it
+    await job_queue.heartbeat(job.id, worker_id, LEASE_SECONDS, progress)
+    await job_queue.finish(job.id, worker_id, job_queue.STATUS_DONE, result=result)
+    logger.info("Job %d (%s) done: status=%s", job.id, job.kind, result.get("status", "ok"))
+
+
+async def _serve(worker_id: str) -> None:
+    from storage import job_queue
+    from sources.base import close_shared_client
+    from matcher import pool as match_pool
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    logger.info("Worker %s waiting for jobs", worker_id)
+    try:
+        while not stop.is_set():
+            job = await job_queue.claim(worker_id, LEASE_SECONDS)
+            if job is None:
+                try:
+                    await asyncio.wait_for(stop.wait(), IDLE_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            logger.info("Job %d (%s) claimed, attempt %d", job.id, job.kind, job.attempts)
+            # A job in progress is finished before stopping; a hard kill leaves it to the lease
+            await _execute(job, worker_id)
+    finally:
+        await close_shared_client()
+        match_pool.shutdown()
+    logger.info("Worker %s stopped", worker_id)
+
+
+def main() -> None:
+    db_path = os.environ.get("DATABASE_PATH", "data/bot.db")
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+
+    # A pre-warm and the run it prepares may land on different workers
+    os.environ.setdefault("EVENT_CACHE_PERSIST", "1")
+
+    from storage.db import init_db
+    init_db(db_path)
+
+    from pipeline import register_connector
+    from sources.registry import default_connectors
+    for connector in default_connectors():
+        register_connector(connector)
+
+    worker_id = os.environ.get("WORKER_ID", "").strip() or f"{socket.gethostname()}:{os.getpid()}"
+    asyncio.run(_serve(worker_id))
+
+
+if __name__ == "__main__":
+    main()